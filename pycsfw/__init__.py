@@ -11,6 +11,7 @@ from .chassis import ManagedChassis
 from .interfaces import Interfaces
 from .zones import SecurityZone
 from .routes import StaticRoutes
+from .aio import AsyncCSFWClient
 
 log = logging.getLogger(__name__)
 
@@ -27,5 +28,10 @@ class CSFWClient(
     SecurityZone,
     StaticRoutes,
 ):
-    def __init__(self, ftd_ip: str, username: str, password: str, verify: str = None, timeout: int = 30, port=None):
-        BaseClient.__init__(self, ftd_ip, username, password, verify, port=port, timeout=timeout)
+    def __init__(
+        self, ftd_ip: str, username: str, password: str, verify: str = None, timeout: int = 30, port=None, **kwargs
+    ):
+        """
+        :param kwargs: Additional BaseClient options such as pool_connections, pool_maxsize and max_retries
+        """
+        BaseClient.__init__(self, ftd_ip, username, password, verify, port=port, timeout=timeout, **kwargs)
@@ -0,0 +1,359 @@
+import ssl
+import sys
+import asyncio
+import inspect
+import logging
+import requests
+from functools import lru_cache
+from requests.structures import CaseInsensitiveDict
+
+# The asyncio client needs httpx for the HTTP transport and greenlet to run the client's methods on the event loop.
+# Install the "async" extra (pip install pycsfw[async]) to get them.
+try:
+    import httpx
+    import greenlet
+except ImportError:
+    httpx = greenlet = None
+
+log = logging.getLogger(__name__)
+
+
+class AsyncCSFWClient:
+    """
+    asyncio client for the Cisco Secure Firewall Management Center. Every public CSFWClient method is exposed as a
+    coroutine (and every iter_* generator as an async generator) with the same name and arguments.
+
+    The calls run the CSFWClient methods themselves, so the models, URL builders, pagination, token handling,
+    HTTPWrapper error mapping and response cache are shared with the synchronous client, but they run on the event
+    loop rather than in threads. Each method runs in a greenlet and every HTTP request it makes is sent with an httpx
+    AsyncClient: while a request is in flight the greenlet is suspended and the event loop runs other calls. Rate
+    limiter tokens are reserved from the bucket shared with the synchronous clients of the CSFMC and waited for with
+    asyncio.sleep, pages fetched concurrently (max_workers) become tasks, and so do the devices of for_each_device.
+
+    async with AsyncCSFWClient("192.168.1.30", "admin", "mypassword", verify=False) as client:
+        await client.get_domain_uuid("Global/Customer A")
+        devices = await client.get_device_records_list()
+        ifaces = await asyncio.gather(*[client.get_ftd_physical_iface_list(device.id) for device in devices])
+    """
+
+    def __init__(
+        self,
+        ftd_ip: str,
+        username: str,
+        password: str,
+        verify: str = None,
+        timeout: int = 30,
+        port=None,
+        max_connections: int = 10,
+        transport: object = None,
+        **kwargs,
+    ) -> None:
+        """
+        :param ftd_ip: The IP of the Cisco Secure Firewall Management Center
+        :param username: The username for the CSFMC
+        :param password: The password for the CSFMC
+        :param verify: path to the CA certificate for the CA you want to use for certificate validation
+        :param timeout: TCP timeout when attempting to reach the CSFMC API
+        :param port: The port that the CSFMC API is listening on (Default = 443)
+        :param max_connections: The maximum number of connections to hold open to the CSFMC
+        :param transport: optional httpx async transport to send the requests through (e.g. httpx.MockTransport)
+        :param kwargs: Additional BaseClient options such as rate_limit, retry_policy and response_cache
+        """
+        if httpx is None or greenlet is None:
+            raise ImportError("AsyncCSFWClient needs httpx and greenlet. Install them with pip install pycsfw[async]")
+        kwargs["pool_maxsize"] = max_connections
+        self._client_args = (ftd_ip, username, password)
+        self._client_kwargs = dict(verify=verify, timeout=timeout, port=port, transport=transport, **kwargs)
+        self.client = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    async def connect(self) -> None:
+        """Create the underlying client and obtain an auth token"""
+        if self.client is None:
+            self.client = await _run_sync(_bridged_client_class(), *self._client_args, **self._client_kwargs)
+
+    async def aclose(self) -> None:
+        """Close the http connections to the CSFMC"""
+        if self.client is not None:
+            await _run_sync(self.client.close)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or self.__dict__.get("client") is None:
+            raise AttributeError(f"{type(self).__name__} has no attribute {name}. Did you call connect()?")
+        attr = getattr(self.client, name)
+        if not callable(attr):
+            return attr
+        if inspect.isgeneratorfunction(attr):
+            return self._wrap_generator(attr)
+        return self._wrap_method(attr)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | {name for name in dir(self.client) if not name.startswith("_")})
+
+    @staticmethod
+    def _wrap_method(fn):
+        async def coroutine(*args, **kwargs):
+            return await _run_sync(fn, *args, **kwargs)
+
+        coroutine.__name__ = fn.__name__
+        coroutine.__doc__ = fn.__doc__
+        return coroutine
+
+    @staticmethod
+    def _wrap_generator(fn):
+        async def async_generator(*args, **kwargs):
+            async for item in _iterate_sync(fn, *args, **kwargs):
+                yield item
+
+        async_generator.__name__ = fn.__name__
+        async_generator.__doc__ = fn.__doc__
+        return async_generator
+
+
+class AsyncSession:
+    """
+    Stands in for the requests Session of the client run by AsyncCSFWClient. The requests are sent with an httpx
+    AsyncClient on the event loop and the replies are handed back as requests Responses, so HTTPWrapper retries and
+    maps their errors exactly as it does for the synchronous client.
+    """
+
+    def __init__(self, verify: object = None, max_connections: int = 10, max_retries: int = 0, transport=None) -> None:
+        """
+        :param verify: path to a CA certificate, or False to skip certificate validation
+        :param max_connections: The maximum number of connections to hold open to the CSFMC
+        :param max_retries: Number of connection level retries to attempt
+        :param transport: optional httpx async transport to send the requests through
+        """
+        self.headers = CaseInsensitiveDict()
+        self.verify = True if verify is None else verify
+        self._limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._transport = transport
+        self._max_retries = max_retries
+        self._client = None  # Created on first use, as it must belong to the running event loop
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send the request on the event loop, suspending the calling client method until the reply arrives"""
+        return _await(self._send(method, url, **kwargs))
+
+    def close(self) -> None:
+        if self._client is not None:
+            _await(self._client.aclose())
+            self._client = None
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        data: bytes = None,
+        auth: requests.auth.HTTPBasicAuth = None,
+        timeout: float = None,
+    ) -> requests.Response:
+        """
+        :return: the reply as a requests Response
+        :raises requests.ConnectionError: if the CSFMC could not be reached (requests.Timeout if it timed out)
+        """
+        if self._client is None:
+            verify = ssl.create_default_context(cafile=self.verify) if isinstance(self.verify, str) else self.verify
+            transport = self._transport or httpx.AsyncHTTPTransport(
+                verify=verify, limits=self._limits, retries=self._max_retries
+            )
+            self._client = httpx.AsyncClient(transport=transport)
+        # Like requests, leave out the headers and params that are None
+        headers = {key: value for key, value in {**self.headers, **(headers or {})}.items() if value is not None}
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        try:
+            res = await self._client.request(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                content=data,
+                auth=(auth.username, auth.password) if auth else None,
+                timeout=timeout,
+            )
+        except httpx.ConnectTimeout as err:
+            raise requests.ConnectTimeout(str(err)) from err
+        except httpx.TimeoutException as err:
+            raise requests.Timeout(str(err)) from err
+        except httpx.TransportError as err:
+            raise requests.ConnectionError(str(err)) from err
+        response = requests.Response()
+        response.status_code = res.status_code
+        response.headers = CaseInsensitiveDict(res.headers)
+        response._content = res.content
+        response.encoding = res.encoding
+        response.reason = res.reason_phrase
+        response.url = str(res.url)
+        return response
+
+
+class AsyncBridge:
+    """
+    Mixed in ahead of CSFWClient by AsyncCSFWClient. Every place the client would block a thread (the http session,
+    the rate limiter, retry back off, the token lock and its thread pools) waits on the event loop instead.
+    """
+
+    def __init__(self, *args, transport=None, **kwargs) -> None:
+        self._transport = transport
+        super().__init__(*args, **kwargs)
+
+    def _create_session(self, pool_connections: int, pool_maxsize: int, max_retries: int) -> AsyncSession:
+        session = AsyncSession(
+            self.verify, max_connections=pool_maxsize, max_retries=max_retries, transport=self._transport
+        )
+        session.headers.update({"Content-Type": "application/json"})
+        return session
+
+    def _create_lock(self) -> object:
+        return AsyncBridgeLock()
+
+    def _sleep(self, seconds: float) -> None:
+        _await(asyncio.sleep(seconds))
+
+    def wait_for_rate_limit(self) -> None:
+        if self.rate_limiter is not None:
+            _await(self.rate_limiter.acquire_async())
+
+    def _map(self, fn, items: list, max_workers: int) -> list:
+        if max_workers > 1:
+            return _await(_gather(fn, items, max_workers))
+        return [fn(item) for item in items]
+
+
+class AsyncBridgeLock:
+    """
+    Reentrant lock for the client methods run by AsyncCSFWClient. They all share the event loop's thread, so a
+    threading lock would let every one of them in. Waiting for it suspends the method rather than the thread.
+    """
+
+    def __init__(self) -> None:
+        self._lock = asyncio.Lock()
+        self._owner = None
+        self._depth = 0
+
+    def __enter__(self):
+        current = greenlet.getcurrent()
+        if self._owner is not current:
+            _await(self._lock.acquire())
+            self._owner = current
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._depth -= 1
+        if not self._depth:
+            self._owner = None
+            self._lock.release()
+
+
+@lru_cache(maxsize=None)
+def _bridged_client_class() -> type:
+    from pycsfw import CSFWClient
+
+    return type("AsyncBridgedCSFWClient", (AsyncBridge, CSFWClient), {})
+
+
+def _await(awaitable: object) -> object:
+    """
+    Called by a client method running under _run_sync: suspend the method, have the event loop await the awaitable
+    and resume the method with its result (or exception)
+    """
+    current = greenlet.getcurrent()
+    if current.parent is None:
+        raise RuntimeError("The client of an AsyncCSFWClient can only be called through the AsyncCSFWClient")
+    return current.parent.switch(awaitable)
+
+
+async def _run_sync(fn, *args, **kwargs) -> object:
+    """
+    Run a blocking client method on the event loop. It runs in its own greenlet and whenever it needs to wait, it hands
+    the awaitable back through _await. It is awaited here, so other coroutines run meanwhile, then the method resumes.
+    """
+    bridge = greenlet.greenlet(fn)
+    result = bridge.switch(*args, **kwargs)
+    while not bridge.dead:
+        try:
+            value = await result
+        except BaseException:
+            result = bridge.throw(*sys.exc_info())
+        else:
+            result = bridge.switch(value)
+    return result
+
+
+class _Item:
+    """An item produced by a generator running under _iterate_sync, as opposed to an awaitable it is waiting on"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: object) -> None:
+        self.value = value
+
+
+async def _iterate_sync(fn, *args, **kwargs):
+    """
+    Like _run_sync for a blocking generator such as an iter_* method: yield each item as it is produced, while the
+    pages are fetched on the event loop one at a time
+    """
+
+    def produce() -> None:
+        for item in fn(*args, **kwargs):
+            greenlet.getcurrent().parent.switch(_Item(item))
+
+    bridge = greenlet.greenlet(produce)
+    try:
+        result = bridge.switch()
+        while not bridge.dead:
+            if isinstance(result, _Item):
+                yield result.value
+                result = bridge.switch()
+                continue
+            try:
+                value = await result
+            except BaseException:
+                result = bridge.throw(*sys.exc_info())
+            else:
+                result = bridge.switch(value)
+    finally:
+        if not bridge.dead:
+            bridge.throw(greenlet.GreenletExit)  # The caller stopped early. Close the generator.
+
+
+async def _gather(fn, items: list, max_workers: int) -> list:
+    """
+    Call fn on every item as concurrent tasks, no more than max_workers at once
+    :return: the results in the order of the items
+    :rtype: list
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def run(item: object) -> object:
+        async with semaphore:
+            return await _run_sync(fn, item)
+
+    # Let every call finish before raising the first error, as the thread pool would
+    results = await asyncio.gather(*[run(item) for item in items], return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
@@ -1,38 +1,81 @@
 import logging
+from typing import Iterator, Union
 from pycsfw import variables
-from pycsfw.models import FTDAccessPolicyModel, FTDAccessRuleModel
+from pycsfw.common import encode_object
+from pycsfw.models import FTDAccessPolicyModel, FTDAccessRuleModel, BulkResultModel
 
 log = logging.getLogger(__name__)
 
 
 class AccessPolicies:
     def get_access_policy_list(
-        self, name: str = None, expanded: bool = False, offset: int = 0, limit: int = 999
+        self,
+        name: str = None,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
     ) -> list[FTDAccessPolicyModel]:
         """
         :param name: Filter the results with this policy name
         :param expanded: return extra data on each record
         :param offset: select the records starting at the offset value (paging)
-        :param limit: set the maximum number of records to return (paging)
+        :param limit: the number of records to request per page. Every page is returned
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
         :return: list of FTDAccessPolicy objects (see models.py) managed by this fmc
         :rtype: list
         """
-        policy_list = self.get(
+        return self._get_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/policy/accesspolicies",
+            FTDAccessPolicyModel,
+            params={"name": name, "offset": offset, "limit": limit, "expanded": expanded},
+            max_workers=max_workers,
+            raw=raw,
+            trusted=trusted,
+        )
+
+    def iter_access_policies(
+        self,
+        name: str = None,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> Iterator[FTDAccessPolicyModel]:
+        """
+        Stream the access policies one page at a time rather than building the full list in memory
+        :param name: Filter the results with this policy name
+        :param expanded: return extra data on each record
+        :param offset: select the records starting at the offset value
+        :param limit: the number of records to request per page
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: iterator of FTDAccessPolicy objects (see models.py) managed by this fmc
+        :rtype: Iterator[FTDAccessPolicyModel]
+        """
+        yield from self._iter_list(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/policy/accesspolicies",
+            FTDAccessPolicyModel,
             params={"name": name, "offset": offset, "limit": limit, "expanded": expanded},
+            raw=raw,
+            trusted=trusted,
         )
-        if "items" in policy_list:
-            return [FTDAccessPolicyModel(**access_policy) for access_policy in policy_list["items"]]
 
-    def get_access_policy(self, object_id: str) -> FTDAccessPolicyModel:
+    def get_access_policy(self, object_id: str, raw: bool = False, trusted: bool = False) -> FTDAccessPolicyModel:
         """
         :param object_id: the id of the FTDAccessPolicy to retrieve
+        :param raw: return the plain dictionary from the API rather than a model
+        :param trusted: build the model without validation (Model.construct) as the data comes from the CSFMC
         :return: FTDAccessPolicy object (see models.py) managed by this fmc
         :rtype: FTDAccessPolicy
         """
         access_policy = self.get(f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/policy/accesspolicies/{object_id}")
-        if access_policy is not None:
-            return FTDAccessPolicyModel(**access_policy)
+        return self._build_model(FTDAccessPolicyModel, access_policy, raw=raw, trusted=trusted)
 
     def create_access_policy(self, ap_obj: FTDAccessPolicyModel) -> FTDAccessPolicyModel:
         """
@@ -42,7 +85,7 @@ class AccessPolicies:
         """
         access_policy = self.post(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/policy/accesspolicies",
-            data=ap_obj.dict(exclude_unset=True),
+            data=encode_object(ap_obj),
         )
         if access_policy is not None:
             return FTDAccessPolicyModel(**access_policy)
@@ -53,13 +96,11 @@ class AccessPolicies:
         :return: FTDAccessPolicy object (see models.py) we have modified
         :rtype: FTDAccessPolicy
         """
-        # We need to strip out all of the fields that are references as we cannot update these - 422 errors
-        ap_obj.metadata = None
-        ap_obj.rules = None
-
+        # We need to strip out all of the fields that are references as we cannot update these - 422 errors.
+        # Work on a copy so the caller's object keeps its rules.
         access_policy = self.put(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/policy/accesspolicies/{ap_obj.id}",
-            data=ap_obj.dict(exclude_unset=True),
+            data=encode_object(ap_obj.copy(update={"rules": None})),
         )
         if access_policy is not None:
             return FTDAccessPolicyModel(**access_policy)
@@ -77,35 +118,78 @@ class AccessPolicies:
             return FTDAccessPolicyModel(**deleted_access_policy)
 
     def get_access_rule_list(
-        self, ap_uuid: str, expanded: bool = False, offset: int = 0, limit: int = 999
+        self,
+        ap_uuid: str,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
     ) -> list[FTDAccessRuleModel]:
         """
         :param ap_uuid: The UUID of the FTDAccessPolicy that contains these rules. The "parent container"
         :param expanded: return extra data on each record
         :param offset: select the records starting at the offset value (paging)
-        :param limit: set the maximum number of records to return (paging)
+        :param limit: the number of records to request per page. Every page is returned
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
         :return: list of FTDAccessRules objects (see models.py) managed by this fmc
         :rtype: list
         """
-        rules_list = self.get(
+        return self._get_list(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/policy/accesspolicies/{ap_uuid}/accessrules",
+            FTDAccessRuleModel,
             params={"offset": offset, "limit": limit, "expanded": expanded},
+            max_workers=max_workers,
+            raw=raw,
+            trusted=trusted,
         )
-        if "items" in rules_list:
-            return [FTDAccessRuleModel(**access_rules) for access_rules in rules_list["items"]]
 
-    def get_access_rule(self, ap_uuid: str, rule_id: str) -> FTDAccessPolicyModel:
+    def iter_access_rules(
+        self,
+        ap_uuid: str,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> Iterator[FTDAccessRuleModel]:
+        """
+        Stream the rules of an access policy one page at a time rather than building the full list in memory
+        :param ap_uuid: The UUID of the FTDAccessPolicy that contains these rules. The "parent container"
+        :param expanded: return extra data on each record
+        :param offset: select the records starting at the offset value
+        :param limit: the number of records to request per page
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: iterator of FTDAccessRules objects (see models.py) managed by this fmc
+        :rtype: Iterator[FTDAccessRuleModel]
+        """
+        yield from self._iter_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/policy/accesspolicies/{ap_uuid}/accessrules",
+            FTDAccessRuleModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded},
+            raw=raw,
+            trusted=trusted,
+        )
+
+    def get_access_rule(
+        self, ap_uuid: str, rule_id: str, raw: bool = False, trusted: bool = False
+    ) -> FTDAccessPolicyModel:
         """
         :param ap_uuid: The UUID of the FTDAccessPolicy that contains these rules. The "parent container"
         :param rule_id: the id of the FTDAccessRule to retrieve
+        :param raw: return the plain dictionary from the API rather than a model
+        :param trusted: build the model without validation (Model.construct) as the data comes from the CSFMC
         :return: FTDAccessRule object (see models.py) managed by this fmc
         :rtype: FTDAccessRule
         """
         rule = self.get(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/policy/accesspolicies/{ap_uuid}/accessrules/{rule_id}"
         )
-        if rule is not None:
-            return FTDAccessRuleModel(**rule)
+        return self._build_model(FTDAccessRuleModel, rule, raw=raw, trusted=trusted)
 
     def create_access_rule(
         self,
@@ -130,7 +214,7 @@ class AccessPolicies:
         # params={"bulk": offset, "insertAfter": limit, "insertBefore": expanded, "section": expanded, "category": expanded},
         access_rule = self.post(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/policy/accesspolicies/{ap_uuid}/accessrules",
-            data=rule_obj.dict(exclude_unset=True),
+            data=encode_object(rule_obj),
             params={
                 "insertAfter": insert_after,
                 "insertBefore": insert_before,
@@ -141,6 +225,55 @@ class AccessPolicies:
         if access_rule is not None:
             return FTDAccessRuleModel(**access_rule)
 
+    def create_bulk_access_rules(
+        self,
+        ap_uuid: str,
+        rule_list: list,
+        section: str = None,
+        category: str = None,
+        insert_after: int = None,
+        insert_before: int = None,
+        chunk_size: int = None,
+        isolate_failures: bool = False,
+    ) -> Union[list[FTDAccessRuleModel], BulkResultModel]:
+        """
+        Create many access rules with as few posts as the CSFMC's bulk limits allow. Without a position each chunk is
+        appended to the end of the section (or category). With insert_after or insert_before the position is moved
+        on by the number of rules each post creates, so the next chunk lands right after the previous one. Either way
+        the rules keep the order they were given in.
+        :param ap_uuid: The UUID of the FTDAccessPolicy that contains these rules. The "parent container"
+        :param rule_list: list of the FTDAccessRuleModel objects to create
+        :param section: "mandatory" or "default"
+        :param category: the name of the category to add the rules to
+        :param insert_after: the index of the existing rule to insert the rules after
+        :param insert_before: the index of the existing rule to insert the rules before
+        :param chunk_size: optional maximum number of rules per request
+        :param isolate_failures: isolate invalid rules rather than raising, and return a BulkResultModel reporting
+                                 which rules were created, which already existed and why the others failed
+        :return: list of the FTDAccessRuleModel objects created, or a BulkResultModel when isolate_failures is True
+        :rtype: list[FTDAccessRuleModel] or BulkResultModel
+        :raises ValueError: if both insert_after and insert_before are given
+        """
+        if insert_after is not None and insert_before is not None:
+            raise ValueError("Give either insert_after or insert_before, not both")
+        params = {
+            "section": section,
+            "category": category,
+            "insertAfter": insert_after,
+            "insertBefore": insert_before,
+        }
+        params = {key: value for key, value in params.items() if value is not None}
+        position_param = "insertAfter" if insert_after is not None else "insertBefore"
+        return self._bulk_create(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/policy/accesspolicies/{ap_uuid}/accessrules",
+            rule_list,
+            FTDAccessRuleModel,
+            params=params,
+            chunk_size=chunk_size,
+            isolate_failures=isolate_failures,
+            position_param=position_param,
+        )
+
     def update_access_rule(self):
         pass
 
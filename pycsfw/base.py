@@ -1,9 +1,20 @@
+import time
 import logging
 import requests
-from json import loads
+import threading
 from functools import wraps
+from typing import Callable, Iterator, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qsl
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from requests.exceptions import HTTPError
+from .retry import RetryPolicy
+from .cache import ResponseCache
+from .common import encode_objects, encode_array
+from .jsonlib import loads, dumps
+from .models import BulkResultModel, BulkFailureModel
+from .ratelimit import get_rate_limiter, FMC_REQUESTS_PER_MINUTE, FMC_BURST
 from .exceptions import DuplicateObject, DuplicateStaticRoute, RateLimitExceeded, ObjectDeletionRestricted
 
 log = logging.getLogger(__name__)
@@ -42,79 +53,147 @@ class HTTPWrapper(object):
     All http requests are handled by this decorator to catch 401, 404, 422, and other errors.
     """
 
-    # TODO work out the logic to obtain a new token but watch for race condition
     def __call__(self, fn):
         @wraps(fn)
         def new_func(*args, **kwargs):
-            try:
-                res = fn(*args, **kwargs)
-                log.debug(f"Returned http status code:{res.status_code}")
-                if res.status_code == 204:
-                    # HTTP 204 No Content has no body to return. Only return the headers.
-                    return res.headers
-                elif 200 <= res.status_code <= 299:
-                    try:
-                        # Test to see if there is a valid json response.
-                        _res = res.json()
-                    except ValueError:
-                        # Not a json response (could be local file read or non json data)
-                        return res
+            client = args[0]
+            endpoint = args[1] if len(args) > 1 else kwargs.get("endpoint")
+            auth_call = client._is_auth_endpoint(endpoint)
+            policy = client.retry_policy
+            retry_safe = kwargs.get("retry_safe", False)
+            cache = client.response_cache if not auth_call else None
+            cache_key = cache_entry = None
+            if cache is not None and fn.__name__ == "get":
+                cache_key = cache.make_key(endpoint, kwargs.get("params"))
+                cache_entry = cache.get(cache_key)
+                if cache_entry is not None and cache.is_fresh(cache_entry):
+                    return cache.read(cache_entry)
+                if cache_entry is not None and cache.can_revalidate(cache_entry):
+                    kwargs["headers"] = {**(kwargs.get("headers") or {}), **cache_entry.validators()}
                 else:
-                    res.raise_for_status()
-                return res.json()  # This should be a json response
-            except HTTPError as err:
-                if res.status_code == 400:
-                    """
-                    Catch duplicate object errors and raise DuplicateObject exception.
-                    Let the consumer decide how to handle these
-                    """
-                    log.error(f"FMCHTTPWrapper called by method {fn.__name__} - {err.response.text}")
-                    err_msg = loads(err.response.text)
-                    for msg in err_msg["error"]["messages"]:
-                        if "Duplicate" in msg.get("description") or "already exists" in msg.get("description"):
-                            raise DuplicateObject(msg.get("description"))
-                        elif "same interface and gateway in another route" in msg.get("description"):
-                            raise DuplicateStaticRoute(msg.get("description"))
-                        elif "Object deletion restricted" in msg.get("description"):
-                            raise ObjectDeletionRestricted(msg.get("description"))
-                    raise
-                elif res.status_code == 401:
-                    """Catch authentication errors"""
-                    log.error(
-                        f"FMCHTTPWrapper called by {fn.__name__} - 401 Forbidden: Invalid token?: {err.response.text}"
-                    )
-                    raise
-                elif res.status_code == 403:
-                    """Catch forbidden errors"""
-                    log.error(f"FMCHTTPWrapper called by {fn.__name__} - 403 Forbidden: {err.response.text}")
-                    raise
-                elif res.status_code == 404:
-                    log.error(f"FMCHTTPWrapper called by {fn.__name__} - 404 Not Found: {err.response.text}")
-                    raise
-                elif res.status_code == 405:
-                    log.error(f"FMCHTTPWrapper called by {fn.__name__} - 405 Method Not Allowed: {err.response.text}")
-                    log.error(err.response.text)
-                    raise
-                elif res.status_code == 422:
-                    log.error(
-                        f"FMCHTTPWrapper called by {fn.__name__} - 422 Unprocessable Entity (Invalid Input):"
-                        "{err.response.text}"
-                    )
-                    log.error(err.response.text)
+                    cache_entry = None
+            attempt = 0
+            token_replayed = False
+            while True:
+                if not auth_call:
+                    client.refresh_auth_token_if_expiring()
+                sent_token = client.token.get("X-auth-access-token") if client.token else None
+                client.wait_for_rate_limit()
+                try:
+                    res = fn(*args, **kwargs)
+                except requests.ConnectionError:
+                    if policy is not None and attempt < policy.retries and policy.allows(fn.__name__, None, retry_safe):
+                        delay = policy.backoff(attempt)
+                        log.warning(
+                            f"FMCHTTPWrapper called by {fn.__name__} - Connection error. Retrying in {delay:.1f}s"
+                        )
+                        client._sleep(delay)
+                        attempt += 1
+                        continue
                     raise
-                elif res.status_code == 429:
-                    log.error(
-                        "We have been rate-limited by the Firewall Manager. (Default is 120 messages per minute from"
-                        "an individual IP address. We are pausing requests for 30 seconds..."
+                if res.status_code == 401 and not auth_call and not token_replayed:
+                    # The token expired or was revoked under us. Refresh it (once, shared by all threads) and replay.
+                    log.warning(f"FMCHTTPWrapper called by {fn.__name__} - 401 received. Refreshing the access token")
+                    client.refresh_auth_token(stale_token=sent_token)
+                    token_replayed = True
+                    continue
+                if (
+                    policy is not None
+                    and attempt < policy.retries
+                    and policy.allows(fn.__name__, res.status_code, retry_safe)
+                ):
+                    delay = policy.backoff(attempt, res.headers.get("Retry-After"))
+                    log.warning(
+                        f"FMCHTTPWrapper called by {fn.__name__} - HTTP {res.status_code} received. "
+                        f"Retrying in {delay:.1f}s (attempt {attempt + 1} of {policy.retries})"
                     )
-                    raise RateLimitExceeded("API rate limit exceeded.")
-
-                else:
-                    log.error(f"FMCHTTPWrapper called by {fn.__name__} - HTTP Error returned: {err.response.text}")
-                    raise
+                    client._sleep(delay)
+                    attempt += 1
+                    continue
+                if cache_entry is not None and res.status_code == 304:
+                    cache.touch(cache_entry)
+                    return cache.read(cache_entry)
+                data = self._handle_response(fn, res)
+                if cache_key is not None and isinstance(data, (dict, list)):
+                    cache.store(cache_key, data, res.headers)
+                elif cache is not None and fn.__name__ != "get":
+                    cache.invalidate(endpoint)
+                return data
 
         return new_func
 
+    def _handle_response(self, fn, res: requests.Response):
+        """
+        Return the decoded response of a completed API call or map the http error onto the appropriate exception
+        :param fn: The wrapped client method that made the API call
+        :param res: The http response returned by the CSFMC
+        :return: the json response, the response headers for a 204, or the raw response for non json data
+        """
+        try:
+            log.debug(f"Returned http status code:{res.status_code}")
+            if res.status_code == 204:
+                # HTTP 204 No Content has no body to return. Only return the headers.
+                return res.headers
+            elif 200 <= res.status_code <= 299:
+                try:
+                    # Decode the body once with the fastest JSON backend available
+                    return loads(res.content)
+                except ValueError:
+                    # Not a json response (could be local file read or non json data)
+                    return res
+            else:
+                res.raise_for_status()
+        except HTTPError as err:
+            if res.status_code == 400:
+                """
+                Catch duplicate object errors and raise DuplicateObject exception.
+                Let the consumer decide how to handle these
+                """
+                log.error(f"FMCHTTPWrapper called by method {fn.__name__} - {err.response.text}")
+                err_msg = loads(err.response.text)
+                for msg in err_msg["error"]["messages"]:
+                    if "Duplicate" in msg.get("description") or "already exists" in msg.get("description"):
+                        raise DuplicateObject(msg.get("description"))
+                    elif "same interface and gateway in another route" in msg.get("description"):
+                        raise DuplicateStaticRoute(msg.get("description"))
+                    elif "Object deletion restricted" in msg.get("description"):
+                        raise ObjectDeletionRestricted(msg.get("description"))
+                raise
+            elif res.status_code == 401:
+                """Catch authentication errors"""
+                log.error(
+                    f"FMCHTTPWrapper called by {fn.__name__} - 401 Forbidden: Invalid token?: {err.response.text}"
+                )
+                raise
+            elif res.status_code == 403:
+                """Catch forbidden errors"""
+                log.error(f"FMCHTTPWrapper called by {fn.__name__} - 403 Forbidden: {err.response.text}")
+                raise
+            elif res.status_code == 404:
+                log.error(f"FMCHTTPWrapper called by {fn.__name__} - 404 Not Found: {err.response.text}")
+                raise
+            elif res.status_code == 405:
+                log.error(f"FMCHTTPWrapper called by {fn.__name__} - 405 Method Not Allowed: {err.response.text}")
+                log.error(err.response.text)
+                raise
+            elif res.status_code == 422:
+                log.error(
+                    f"FMCHTTPWrapper called by {fn.__name__} - 422 Unprocessable Entity (Invalid Input):"
+                    "{err.response.text}"
+                )
+                log.error(err.response.text)
+                raise
+            elif res.status_code == 429:
+                log.error(
+                    "We have been rate-limited by the Firewall Manager. (Default is 120 messages per minute from"
+                    "an individual IP address. We are pausing requests for 30 seconds..."
+                )
+                raise RateLimitExceeded("API rate limit exceeded.")
+
+            else:
+                log.error(f"FMCHTTPWrapper called by {fn.__name__} - HTTP Error returned: {err.response.text}")
+                raise
+
 
 class BaseClient(object):
     """
@@ -124,6 +203,13 @@ class BaseClient(object):
 
     PLATFORM_PREFIX = f"/api/fmc_platform/v1"
     CONFIG_PREFIX = f"/api/fmc_config/v1"
+    TOKEN_LIFETIME = 30 * 60  # CSFMC access tokens are valid for 30 minutes
+    TOKEN_REFRESH_MARGIN = 60  # Refresh the token this many seconds before it expires
+    TOKEN_MAX_REFRESHES = 3  # A token may only be refreshed 3 times before a new one must be generated
+    MAX_PAGE_WORKERS = 8  # Upper bound on concurrent page fetches and creates. The rate limiter still paces every call.
+    BULK_MAX_ITEMS = 1000  # The CSFMC accepts at most 1000 objects in a single bulk post
+    BULK_MAX_BYTES = 2 * 1024 * 1024  # and rejects bulk request bodies larger than 2MB
+    BULK_DELETE_MAX_IDS = 100  # Bulk deletes list the ids in the query string, so keep the URL a sane length
 
     def __init__(
         self,
@@ -133,6 +219,13 @@ class BaseClient(object):
         verify: str = None,
         port: str = None,
         timeout: int = 30,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: int = 0,
+        rate_limit: int = FMC_REQUESTS_PER_MINUTE,
+        rate_limit_burst: int = FMC_BURST,
+        retry_policy: RetryPolicy = None,
+        response_cache: ResponseCache = None,
     ) -> None:
         """
         :param ip: The IP of the Cisco Secure Firewall Management Center
@@ -141,6 +234,15 @@ class BaseClient(object):
         :param verify: path to the CA certificate for the CA you want to use for certificate validation
         :param port: The port that the CSFMC API is listening on (Default = 443)
         :param timeout: TCP timeout when attempting to reach the CSFMC API
+        :param pool_connections: The number of connection pools to cache on the http session
+        :param pool_maxsize: The maximum number of keep-alive connections to hold open to the CSFMC
+        :param max_retries: Number of connection level retries (DNS, TCP connect) the http adapter will attempt
+        :param rate_limit: Maximum API calls per minute to send to this CSFMC (shared by all clients of the CSFMC).
+                           Set to None to disable client side rate limiting
+        :param rate_limit_burst: Number of API calls that may be sent back to back before pacing kicks in
+        :param retry_policy: Optional RetryPolicy used to retry 429, 5xx gateway errors and connection resets on
+                             idempotent requests (and on POSTs called with retry_safe=True)
+        :param response_cache: Optional ResponseCache used to serve and revalidate repeated GETs
         """
         self.port = str(port) if port else None
         self.base_url = f"https://{ip}:{self.port}" if port else f"https://{ip}"
@@ -149,35 +251,130 @@ class BaseClient(object):
         self.username = username
         self.password = password
         self.token = None
+        self.token_issued = None
+        self.token_refresh_count = 0
+        self._token_lock = self._create_lock()
         self.domain_uuid = None
+        self.session = self._create_session(pool_connections, pool_maxsize, max_retries)
+        self.retry_policy = retry_policy
+        self.response_cache = response_cache
+        self.rate_limiter = get_rate_limiter(self.base_url, rate_limit, rate_limit_burst) if rate_limit else None
         self.get_auth_token()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _create_session(self, pool_connections: int, pool_maxsize: int, max_retries: int) -> requests.Session:
+        """
+        Build the persistent http session used for every API call so that TCP/TLS connections to the CSFMC are
+        pooled and kept alive rather than renegotiated on each request
+        :param pool_connections: The number of connection pools to cache
+        :param pool_maxsize: The maximum number of connections to keep in each pool
+        :param max_retries: Number of connection level retries the adapter will attempt
+        :return: a requests Session with the default headers and certificate validation applied
+        :rtype: requests.Session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=max_retries)
+        session.mount("https://", adapter)
+        session.headers.update({"Content-Type": "application/json"})
+        if self.verify is not None:
+            session.verify = self.verify
+        return session
+
+    def _create_lock(self) -> object:
+        """
+        :return: the reentrant lock that lets a single caller refresh the access token while the others wait
+        """
+        return threading.RLock()
+
+    def _sleep(self, seconds: float) -> None:
+        """Pause before retrying a request"""
+        time.sleep(seconds)
+
+    def close(self) -> None:
+        """Close the http session and release any pooled connections to the CSFMC"""
+        self.session.close()
+
     def set_headers(self, headers: dict = None) -> dict:
         """
-        Used to override the headers that will be sent with every API call to the CSFMC
-        :param headers: dict of headers to send with each API call. Note that if a user supplies this variable,
-                        they will also need "Content-Type" and "X-auth-access-token" headers in this dict
-        :return: dict of headers
+        Used to override the headers that will be sent with an API call to the CSFMC. The "Content-Type" and
+        "X-auth-access-token" headers are kept on the session, so any headers supplied here are merged on top of them
+        :param headers: dict of headers to send with this API call
+        :return: dict of headers or None to only send the session headers
         :rtype: dict
         """
-        if headers is None:
-            if self.token is not None:
-                return {
-                    "Content-Type": "application/json",
-                    "X-auth-access-token": self.token.get("X-auth-access-token"),
-                }
-            else:
-                return {"Content-Type": "application/json"}
-        else:
-            return headers
+        return headers
 
     def get_auth_token(self) -> None:
-        self.token = self.parse_auth_headers(self.post(f"{self.PLATFORM_PREFIX}/auth/generatetoken", auth=True))
+        with self._token_lock:
+            self.token = self.parse_auth_headers(self.post(f"{self.PLATFORM_PREFIX}/auth/generatetoken", auth=True))
+            self.token_refresh_count = 0
+            self._set_access_token()
+
+    def refresh_auth_token(self, stale_token: str = None) -> None:
+        """
+        Refresh the access token using the refresh token. The CSFMC only allows a token to be refreshed 3 times, so
+        once that budget is spent a brand new token is generated instead. Concurrent callers share a single refresh.
+        :param stale_token: The access token the caller found to be expired. If another thread has already replaced
+                            it, the refresh is skipped and the caller simply uses the new token
+        """
+        with self._token_lock:
+            if stale_token is not None and stale_token != self.token.get("X-auth-access-token"):
+                return
+            if self.token_refresh_count >= self.TOKEN_MAX_REFRESHES:
+                log.info("Access token refresh limit reached. Generating a new access token...")
+                self.get_auth_token()
+                return
+            try:
+                headers = self.post(
+                    f"{self.PLATFORM_PREFIX}/auth/refreshtoken",
+                    headers={
+                        "X-auth-access-token": self.token.get("X-auth-access-token"),
+                        "X-auth-refresh-token": self.token.get("X-auth-refresh-token"),
+                    },
+                )
+            except HTTPError:
+                log.warning("Unable to refresh the access token. Generating a new access token...")
+                self.get_auth_token()
+                return
+            # A refresh does not return every header (DOMAINS for example) so only update what we were given
+            self.token.update({key: value for key, value in self.parse_auth_headers(headers).items() if value})
+            self.token_refresh_count += 1
+            self._set_access_token()
+
+    def refresh_auth_token_if_expiring(self) -> None:
+        """Proactively refresh the access token when it is about to expire"""
+        if self.token is None or self.token_issued is None:
+            return
+        if time.monotonic() - self.token_issued >= self.TOKEN_LIFETIME - self.TOKEN_REFRESH_MARGIN:
+            self.refresh_auth_token(stale_token=self.token.get("X-auth-access-token"))
+
+    def _set_access_token(self) -> None:
+        """Apply the current access token to the http session and restart the token's expiry clock"""
+        self.session.headers["X-auth-access-token"] = self.token.get("X-auth-access-token")
+        self.token_issued = time.monotonic()
+
+    def wait_for_rate_limit(self) -> None:
+        """Block until the shared rate limiter for this CSFMC allows another API call"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+    def _is_auth_endpoint(self, endpoint: str) -> bool:
+        """
+        :param endpoint: API endpoint being called
+        :return: True if the endpoint is used to generate or refresh tokens
+        :rtype: bool
+        """
+        return endpoint is not None and endpoint.startswith(f"{self.PLATFORM_PREFIX}/auth/")
 
     @HTTPWrapper()
     def get(self, endpoint: str, **kwargs: dict) -> dict:
         """
-        Perform an http get using the requests library
+        Perform an http get using the client's requests session
         :param endpoint: API endpoint to call. Like /api/fmc_platform/v1/domain/{domain_uuid}/devices/devicerecords
         :param headers: HTTP headers, including the auth token
         :param auth: Boolean True for passing basic auth with http req, otherwise omit or False
@@ -191,18 +388,21 @@ class BaseClient(object):
         auth = HTTPBasicAuth(self.username, self.password) if kwargs.get("auth") else None
         params = kwargs.get("params")
         my_headers = self.set_headers(headers=headers)
-        r = requests.get(self.base_url + endpoint, headers=my_headers, verify=self.verify, params=params, auth=auth)
+        r = self.session.get(
+            self.base_url + endpoint, headers=my_headers, params=params, auth=auth, timeout=self.timeout
+        )
         return r
 
     @HTTPWrapper()
     def post(self, endpoint: str, **kwargs: dict) -> dict:
         """
-        Perform an http post using the requests library
+        Perform an http post using the client's requests session
         :param endpoint: API endpoint to call. Like /api/fmc_platform/v1/domain/{domain_uuid}/devices/devicerecords
-        :param data: dict of the data we wish to put or post
+        :param data: dict of the data we wish to put or post, or the already JSON encoded bytes
         :param headers: http headers, including the auth token
         :param auth: Boolean True for passing basic auth with http req, otherwise omit or False
         :param params: The http parameters (http query) to append to the URL
+        :param retry_safe: True if this post may safely be replayed by the client's RetryPolicy
         :return: dict
         :rtype: dict
         """
@@ -215,12 +415,11 @@ class BaseClient(object):
         log.debug(f"Calling endpoint: {self.base_url + endpoint}")
         my_headers = self.set_headers(headers=headers)
         log.debug(f"Post payload: {data}")
-        r = requests.post(
+        r = self.session.post(
             self.base_url + endpoint,
             headers=my_headers,
-            json=data,
+            **self._body(data),
             auth=auth,
-            verify=self.verify,
             timeout=self.timeout,
             params=params,
         )
@@ -229,42 +428,58 @@ class BaseClient(object):
     @HTTPWrapper()
     def put(self, endpoint: str, **kwargs: dict) -> dict:
         """
-        Perform an http put using the requests library
+        Perform an http put using the client's requests session
         :param endpoint: API endpoint to call. Like /api/fmc_platform/v1/domain/{domain_uuid}/devices/devicerecords
-        :param data: dict of the data we wish to modify/put
+        :param data: dict of the data we wish to modify/put, or the already JSON encoded bytes
         :param headers: HTTP headers, including the auth token
         :param auth: Boolean True for passing basic auth with http req, otherwise omit or False
+        :param params: The http parameters (http query) to append to the URL
         :return: dict
         :rtype: dict
         """
         # kwargs:
         data = kwargs.get("data")
         headers = kwargs.get("headers")
+        params = kwargs.get("params")
 
         log.debug(f"Calling endpoint: {self.base_url + endpoint}")
         my_headers = self.set_headers(headers=headers)
         log.debug(f"Put payload: {data}")
-        r = requests.put(
+        r = self.session.put(
             self.base_url + endpoint,
             headers=my_headers,
-            json=data,
-            verify=self.verify,
+            **self._body(data),
             timeout=self.timeout,
+            params=params,
         )
         return r
 
     @HTTPWrapper()
     def delete(self, endpoint: str, **kwargs: dict) -> dict:
         """
-        Perform an http delete using the requests library
+        Perform an http delete using the client's requests session
         :param endpoint: API endpoint to call. Like /api/fmc_platform/v1/domain/{domain_uuid}/devices/devicerecords
         :param headers: http headers, including the auth token
+        :param params: The http parameters (http query) to append to the URL
         """
         headers = kwargs.get("headers")
+        params = kwargs.get("params")
         my_headers = self.set_headers(headers=headers)
-        r = requests.delete(self.base_url + endpoint, headers=my_headers, verify=self.verify, timeout=self.timeout)
+        r = self.session.delete(self.base_url + endpoint, headers=my_headers, params=params, timeout=self.timeout)
         return r
 
+    @staticmethod
+    def _body(data: object) -> dict:
+        """
+        :param data: the request body as python data or as pre-encoded JSON bytes
+        :return: the requests keyword argument to send it with. Python data is encoded with the JSON backend and
+                 pre-encoded bodies are sent as they are.
+        :rtype: dict
+        """
+        if data is None:
+            return {}
+        return {"data": data if isinstance(data, bytes) else dumps(data)}
+
     def parse_auth_headers(self, headers: dict) -> dict:
         """
         When acquiring a token the token is returned in a response header. Parse the headers and get the tokens
@@ -279,21 +494,336 @@ class BaseClient(object):
             "DOMAIN_ID": headers.get("DOMAIN_ID"),
             "DOMAIN_UUID": headers.get("DOMAIN_UUID"),
             "global": headers.get("global"),
-            "DOMAINS": loads(headers.get("DOMAINS")),
+            "DOMAINS": loads(headers.get("DOMAINS")) if headers.get("DOMAINS") else None,
         }
 
-    def _serialize_objects(self, obj_list: list) -> list[dict]:
+    def _build_model(self, model: type, data: dict, raw: bool = False, trusted: bool = False) -> object:
+        """
+        The single place every read method turns an API record into its model.
+        :param model: The pydantic model to build, or None to return the raw dictionary
+        :param data: the record returned by the CSFMC
+        :param raw: return the dictionary as it is, skipping model construction entirely
+        :param trusted: build the model with Model.construct(), skipping validation. The data comes from the CSFMC so
+                        it is already well formed, but nested fields are left as dictionaries rather than models
+        :return: the model (or dictionary), or None if there was no data
+        :rtype: object
+        """
+        if raw or model is None or data is None:
+            return data
+        if trusted:
+            return model.construct(**data)
+        return model(**data)
+
+    def _get_list(
+        self,
+        endpoint: str,
+        model: type,
+        params: dict = None,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> list:
+        """
+        Shared pagination engine used by every *_list method. Fetch every page of a list endpoint and return all of
+        the records as models. Each page is converted as it arrives so the raw pages are not all held at once.
+        :param endpoint: API endpoint of the list to fetch. e.g. /api/fmc_config/v1/domain/{domain_uuid}/object/hosts
+        :param model: The pydantic model to build from each record, or None to return the raw dictionaries
+        :param params: The http parameters (http query) of the first page (offset, limit, expanded, filter, etc)
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the raw dictionaries rather than models
+        :param trusted: build the models without validation (see _build_model)
+        :return: list of models (or dicts) in offset order
+        :rtype: list
+        """
+        if raw or model is None:
+            return list(self._iter_pages(endpoint, params, max_workers=max_workers))
+        if trusted:
+            return [model.construct(**item) for item in self._iter_pages(endpoint, params, max_workers=max_workers)]
+        return [model(**item) for item in self._iter_pages(endpoint, params, max_workers=max_workers)]
+
+    def _iter_list(
+        self, endpoint: str, model: type, params: dict = None, raw: bool = False, trusted: bool = False
+    ) -> Iterator:
+        """
+        Shared engine used by every iter_* method. Stream the records of a list endpoint as models, one page at a time
+        :param endpoint: API endpoint of the list to walk
+        :param model: The pydantic model to build from each record
+        :param params: The http parameters (http query) of the first page (offset, limit, expanded, filter, etc)
+        :param raw: yield the raw dictionaries rather than models
+        :param trusted: build the models without validation (see _build_model)
+        :return: an iterator of models (or dicts) in offset order
+        :rtype: Iterator
+        """
+        for item in self._iter_pages(endpoint, params):
+            yield self._build_model(model, item, raw=raw, trusted=trusted)
+
+    def _iter_pages(self, endpoint: str, params: dict = None, max_workers: int = 1) -> Iterator[dict]:
+        """
+        Walk a paged list endpoint and yield the raw records. Fetched serially, only a single page is held in memory
+        at any moment so arbitrarily large collections can be streamed with constant memory. With max_workers > 1 the
+        remaining pages are fetched concurrently through a bounded thread pool and still yielded in offset order.
+        :param endpoint: API endpoint of the list to walk. e.g. /api/fmc_config/v1/domain/{domain_uuid}/object/hosts
+        :param params: The http parameters (http query) of the first page (offset, limit, expanded, filter, etc)
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :return: an iterator over the records ("items") of every page
+        :rtype: Iterator[dict]
+        """
+        page = self.get(endpoint, params=params)
+        paging = page.get("paging") or {}
+        page_requests = self._get_page_requests(paging)
+        yield from page.get("items", [])
+        if page_requests is None:
+            # Without the record count each page only tells us where the next one is, so they are walked serially
+            next_request = self._next_page_request(paging)
+            while next_request:
+                page = self.get(next_request[0], params=next_request[1])
+                yield from page.get("items", [])
+                next_request = self._next_page_request(page.get("paging") or {})
+            return
+        max_workers = min(max_workers, self.MAX_PAGE_WORKERS, len(page_requests))
+        if max_workers > 1:
+            # The pages come back in the order they were requested, so the data stays in offset order
+            pages = self._map(lambda page_req: self.get(page_req[0], params=page_req[1]), page_requests, max_workers)
+            for page in pages:
+                yield from page.get("items", [])
+        else:
+            for path, page_params in page_requests:
+                page = self.get(path, params=page_params)
+                yield from page.get("items", [])
+
+    def _get_page_requests(self, paging: dict) -> Optional[list[tuple]]:
+        """
+        Build the (path, params) of every remaining page. When the CSFMC tells us the total record count we compute
+        the remaining offsets ourselves. Otherwise each page only links to the one after it, so return None and the
+        caller follows the "next" links one page at a time (see _next_page_request).
+        :param paging: The paging data returned by the CSFMC API
+        :return: a list of (path, params) tuples in offset order, or None if the pages must be walked serially
+        :rtype: list or None
+        """
+        next_urls = paging.get("next") or []
+        if not next_urls:
+            return []
+        url_p = urlparse(next_urls[0])
+        query_p = dict(parse_qsl(url_p.query))
+        limit = paging.get("limit") or int(query_p.get("limit", 0))
+        if paging.get("count") is None or not limit or "offset" not in query_p:
+            return None
+        return [
+            (url_p.path, {**query_p, "offset": offset, "limit": limit})
+            for offset in range(int(query_p["offset"]), paging["count"], limit)
+        ]
+
+    @staticmethod
+    def _next_page_request(paging: dict) -> Optional[tuple]:
+        """
+        :param paging: The paging data returned by the CSFMC API with a page
+        :return: the (path, params) of the page after it, or None if it was the last page
+        :rtype: tuple or None
+        """
+        next_urls = paging.get("next") or []
+        if not next_urls:
+            return None
+        url_p = urlparse(next_urls[0])
+        return url_p.path, dict(parse_qsl(url_p.query))
+
+    def _chunk_payload(self, payload: list, chunk_size: int = None) -> Iterator[list]:
+        """
+        Split a bulk payload into chunks the CSFMC will accept: no more than BULK_MAX_ITEMS (or chunk_size) objects
+        and no more than BULK_MAX_BYTES of encoded JSON per request. Order is preserved.
+        :param payload: list of JSON encoded objects
+        :param chunk_size: optional maximum number of objects per chunk, capped at BULK_MAX_ITEMS
+        :return: an iterator over the chunks
+        :rtype: Iterator[list]
+        """
+        max_items = min(chunk_size or self.BULK_MAX_ITEMS, self.BULK_MAX_ITEMS)
+        chunk, chunk_bytes = [], 1  # The enclosing [] less the separator the first item does not need
+        for item in payload:
+            item_bytes = len(item) + 1  # the item plus the "," separating it from the next one
+            if chunk and (len(chunk) >= max_items or chunk_bytes + item_bytes > self.BULK_MAX_BYTES):
+                yield chunk
+                chunk, chunk_bytes = [], 1
+            chunk.append(item)
+            chunk_bytes += item_bytes
+        if chunk:
+            yield chunk
+
+    def _bulk_create(
+        self,
+        endpoint: str,
+        obj_list: list,
+        model: type,
+        params: dict = None,
+        chunk_size: int = None,
+        isolate_failures: bool = False,
+        position_param: str = None,
+    ) -> Union[list, BulkResultModel]:
+        """
+        Shared engine for the create_bulk_* methods. Post the objects with bulk=true, automatically split into as
+        many requests as the CSFMC's payload limits require, and return the created objects in input order.
+
+        By default a chunk containing a duplicate or invalid object raises, as the CSFMC rejects the whole chunk. With
+        isolate_failures=True a rejected chunk is instead split in half and each half retried until the offending
+        objects are isolated, which costs O(k log n) calls for k bad objects rather than one call per object.
+        :param endpoint: API endpoint to post to. e.g. /api/fmc_config/v1/domain/{domain_uuid}/object/hosts
+        :param obj_list: list of the pydantic models we wish to create
+        :param model: The pydantic model to build from each created record
+        :param params: Additional http parameters (http query) to send with every chunk
+        :param chunk_size: optional maximum number of objects per request
+        :param isolate_failures: bisect rejected chunks and report the outcome of every object
+        :param position_param: the name of a numeric param (e.g. "insertAfter") giving the position to create the
+                               objects at. It is advanced by the number of objects each post creates, so every chunk
+                               lands after the one before and the objects keep the order they were given in.
+        :return: list of the created objects, or a BulkResultModel when isolate_failures is True
+        :rtype: list or BulkResultModel
+        """
+        params = {**(params or {}), "bulk": "true"}
+        pairs = list(zip(obj_list, encode_objects(obj_list)))
+        result = BulkResultModel()
+        offset = 0
+        for chunk in self._chunk_payload([payload for _, payload in pairs], chunk_size):
+            chunk_pairs = pairs[offset : offset + len(chunk)]
+            offset += len(chunk)
+            log.debug(f"Bulk creating {len(chunk)} objects at {endpoint}")
+            if isolate_failures:
+                self._bulk_create_isolated(endpoint, chunk_pairs, model, params, result, position_param)
+            else:
+                result.created.extend(self._bulk_post(endpoint, chunk, model, params, position_param))
+        return result if isolate_failures else result.created
+
+    def _bulk_post(self, endpoint: str, payload: list, model: type, params: dict, position_param: str = None) -> list:
+        """
+        :param endpoint: API endpoint to post to
+        :param payload: list of JSON encoded objects
+        :param model: The pydantic model to build from each created record
+        :param params: http parameters (http query) including bulk=true
+        :param position_param: the name of the position param in params to advance by the number of objects created
+        :return: list of the created objects
+        :rtype: list
+        """
+        new_objs = self.post(endpoint, params=params, data=encode_array(payload))
+        created = [model(**new_obj) for new_obj in (new_objs or {}).get("items", [])]
+        if position_param and params.get(position_param) is not None:
+            params[position_param] = int(params[position_param]) + len(created)
+        return created
+
+    def _bulk_create_isolated(
+        self,
+        endpoint: str,
+        pairs: list[tuple],
+        model: type,
+        params: dict,
+        result: BulkResultModel,
+        position_param: str = None,
+    ) -> None:
+        """
+        Post a chunk and, if the CSFMC rejects it, bisect it until each rejected object is on its own
+        :param endpoint: API endpoint to post to
+        :param pairs: list of (model, JSON encoded object) tuples of the objects to create
+        :param model: The pydantic model to build from each created record
+        :param params: http parameters (http query) including bulk=true
+        :param result: the BulkResultModel to record each object's outcome in
+        :param position_param: the name of the position param in params to advance by the number of objects created
+        """
+        try:
+            result.created.extend(
+                self._bulk_post(endpoint, [payload for _, payload in pairs], model, params, position_param)
+            )
+            return
+        except (DuplicateObject, DuplicateStaticRoute) as err:
+            if len(pairs) == 1:
+                log.warning(f"Bulk create skipped a duplicate object: {err.msg}")
+                result.duplicates.append(pairs[0][0])
+                return
+        except HTTPError as err:
+            if err.response is None or err.response.status_code not in (400, 422):
+                raise
+            if len(pairs) == 1:
+                result.failed.append(BulkFailureModel(item=pairs[0][0], error=err.response.text))
+                return
+        middle = len(pairs) // 2
+        log.info(f"Bulk create of {len(pairs)} objects was rejected. Retrying as {middle} and {len(pairs) - middle}...")
+        self._bulk_create_isolated(endpoint, pairs[:middle], model, params, result, position_param)
+        self._bulk_create_isolated(endpoint, pairs[middle:], model, params, result, position_param)
+
+    def _bulk_update(self, endpoint: str, obj_list: list, model: type, chunk_size: int = None) -> list:
+        """
+        Shared engine for the update_bulk_* methods. Put the modified objects with bulk=true, split into as many
+        requests as the CSFMC's payload limits require.
+        :param endpoint: API endpoint to put to. e.g. /api/fmc_config/v1/domain/{domain_uuid}/object/hosts
+        :param obj_list: list of the modified pydantic models, each with its id
+        :param model: The pydantic model to build from each updated record
+        :param chunk_size: optional maximum number of objects per request
+        :return: list of the updated objects
+        :rtype: list
+        """
+        updated = []
+        for chunk in self._chunk_payload(encode_objects(obj_list), chunk_size):
+            log.debug(f"Bulk updating {len(chunk)} objects at {endpoint}")
+            updated_objs = self.put(endpoint, params={"bulk": "true"}, data=encode_array(chunk))
+            updated.extend(model(**updated_obj) for updated_obj in (updated_objs or {}).get("items", []))
+        return updated
+
+    def _bulk_delete(self, endpoint: str, obj_ids: list, model: type, chunk_size: int = None) -> list:
+        """
+        Shared engine for the delete_bulk_* methods. Delete the objects with bulk=true and an ids filter, at most
+        BULK_DELETE_MAX_IDS (or chunk_size) ids per request.
+        :param endpoint: API endpoint of the collection. e.g. /api/fmc_config/v1/domain/{domain_uuid}/object/hosts
+        :param obj_ids: list of the ids of the objects to delete
+        :param model: The pydantic model to build from each deleted record
+        :param chunk_size: optional maximum number of ids per request
+        :return: list of the deleted objects
+        :rtype: list
+        """
+        chunk_size = min(chunk_size or self.BULK_DELETE_MAX_IDS, self.BULK_DELETE_MAX_IDS)
+        deleted = []
+        for i in range(0, len(obj_ids), chunk_size):
+            chunk = obj_ids[i : i + chunk_size]
+            log.debug(f"Bulk deleting {len(chunk)} objects at {endpoint}")
+            deleted_objs = self.delete(endpoint, params={"bulk": "true", "filter": f"ids:{','.join(chunk)}"})
+            deleted.extend(model(**deleted_obj) for deleted_obj in (deleted_objs or {}).get("items", []))
+        return deleted
+
+    def _create_each(self, endpoint: str, obj_list: list, model: type, max_workers: int = 1) -> list:
+        """
+        Create objects one post at a time for the resources the CSFMC has no bulk mode for (static routes,
+        subinterfaces, security zones). With max_workers > 1 the posts are sent concurrently through a bounded thread
+        pool, paced by the rate limiter, and the results are still returned in input order.
+        :param endpoint: API endpoint to post to
+        :param obj_list: list of the pydantic models we wish to create
+        :param model: The pydantic model to build from each created record
+        :param max_workers: send the posts concurrently using up to this many threads
+        :return: list of the created objects
+        :rtype: list
+        """
+        return self._map_concurrently(
+            lambda item: model(**self.post(endpoint, data=item)), encode_objects(obj_list), max_workers
+        )
+
+    def _map_concurrently(self, fn: Callable, items: list, max_workers: int = 1) -> list:
+        """
+        Call fn on every item, concurrently through a bounded thread pool when max_workers > 1. Every API call is still
+        paced by the rate limiter.
+        :param fn: the function to call with each item
+        :param items: the items to call it with
+        :param max_workers: run the calls concurrently using up to this many threads
+        :return: the results in the order of the items
+        :rtype: list
+        """
+        return self._map(fn, items, min(max_workers, self.MAX_PAGE_WORKERS, len(items)))
+
+    def _map(self, fn: Callable, items: list, max_workers: int) -> list:
         """
-        Given an object, strip out the ephemeral fields that cause 422 issues and return a dict version of the class
-        :param obj_list: list of objects to serialize
-        :return: list of dictionaries with problematic fields stripped out
+        The one place the client runs calls concurrently, so an asyncio transport can swap the threads for tasks
+        :param fn: the function to call with each item
+        :param items: the items to call it with
+        :param max_workers: the number of calls to run at once, already bounded by the caller
+        :return: the results in the order of the items
         :rtype: list
         """
-        serializable_objs = []
-        for i, net_obj in enumerate(obj_list):
-            obj_list[i].metadata = None
-            serializable_objs.append(obj_list[i].dict(exclude_unset=True))
-        return serializable_objs
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(fn, items))
+        return [fn(item) for item in items]
 
     def get_domain_uuid(self, domain_name: str) -> str:
         """
@@ -0,0 +1,121 @@
+import time
+import logging
+import threading
+from copy import deepcopy
+from collections import OrderedDict
+
+log = logging.getLogger(__name__)
+
+
+class CacheEntry:
+    """A cached GET response along with the validators the CSFMC returned for it"""
+
+    __slots__ = ("data", "etag", "last_modified", "stored")
+
+    def __init__(self, data, etag: str = None, last_modified: str = None) -> None:
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored = time.monotonic()
+
+    def validators(self) -> dict:
+        """
+        :return: the conditional request headers that let the CSFMC answer 304 Not Modified for this entry
+        :rtype: dict
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Optional, thread safe LRU cache of GET responses keyed by endpoint and query parameters. Entries younger than the
+    ttl are served without an API call. Older entries that carry an ETag or Last-Modified validator are revalidated
+    with a conditional GET, and a 304 reply refreshes the entry without re-downloading it. Mutations made through the
+    client (post, put and delete) invalidate the cached entries of the resource and of its parent collection.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60) -> None:
+        """
+        :param maxsize: the maximum number of responses to keep. The least recently used entry is evicted first
+        :param ttl: the number of seconds a response is served from the cache before it must be revalidated
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint: str, params: dict = None) -> tuple:
+        """
+        :param endpoint: API endpoint being called
+        :param params: The http parameters (http query) of the call. None values are not sent, so they are ignored
+        :return: a hashable cache key
+        :rtype: tuple
+        """
+        return endpoint, tuple(sorted((key, str(value)) for key, value in (params or {}).items() if value is not None))
+
+    def get(self, key: tuple) -> CacheEntry:
+        """
+        :param key: a key built with make_key
+        :return: the cached entry or None
+        :rtype: CacheEntry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.monotonic() - entry.stored < self.ttl
+
+    def can_revalidate(self, entry: CacheEntry) -> bool:
+        return bool(entry.etag or entry.last_modified)
+
+    def read(self, entry: CacheEntry):
+        """Return a copy of the cached data so callers cannot modify the cached response"""
+        return deepcopy(entry.data)
+
+    def store(self, key: tuple, data, headers: dict = None) -> None:
+        """
+        :param key: a key built with make_key
+        :param data: the decoded json response
+        :param headers: the response headers, used to capture the ETag and Last-Modified validators
+        """
+        headers = headers or {}
+        entry = CacheEntry(deepcopy(data), headers.get("ETag"), headers.get("Last-Modified"))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def touch(self, entry: CacheEntry) -> None:
+        """The CSFMC confirmed the entry is unchanged (304), so restart its ttl"""
+        entry.stored = time.monotonic()
+
+    def invalidate(self, endpoint: str) -> None:
+        """
+        Drop every entry for the given resource, anything beneath it, and its parent collection
+        :param endpoint: the API endpoint that was modified
+        """
+        parent = endpoint.rsplit("/", 1)[0]
+        with self._lock:
+            stale = [
+                key
+                for key in self._entries
+                if key[0] == endpoint or key[0] == parent or key[0].startswith(f"{endpoint}/")
+            ]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            log.debug(f"Invalidated {len(stale)} cached responses for {endpoint}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -1,18 +1,126 @@
 import logging
+import ipaddress
+from functools import lru_cache
+from pydantic import BaseModel
+from .jsonlib import dumps
 
 log = logging.getLogger(__name__)
 
+# Fields the CSFMC returns but rejects (or ignores) when they are sent back to it
+EPHEMERAL_FIELDS = frozenset({"metadata", "links", "paging"})
+
+
+@lru_cache(maxsize=None)
+def _serialization_plan(model_cls: type) -> tuple:
+    """
+    Work out once per model class which of its fields to send and whether any of them hold nested models
+    :param model_cls: a pydantic model class
+    :return: (the non ephemeral field names in declaration order, True if any field holds a nested model)
+    :rtype: tuple
+    """
+    fields = tuple(field for field in model_cls.__fields__ if field not in EPHEMERAL_FIELDS)
+    nested = any(
+        isinstance(field.type_, type) and issubclass(field.type_, BaseModel) for field in model_cls.__fields__.values()
+    )
+    return fields, nested
+
+
+def _holds_model(value: object) -> bool:
+    """
+    :return: True if the value is, or is a dict or list containing, a pydantic model (e.g. an untyped dict field
+             holding {"objects": [NetworkObjectModel(...)]}) that needs pydantic's recursive conversion
+    """
+    if isinstance(value, BaseModel):
+        return True
+    if isinstance(value, dict):
+        return any(_holds_model(item) for item in value.values())
+    if isinstance(value, (list, tuple, set)):
+        return any(_holds_model(item) for item in value)
+    return False
+
+
+def serialize_object(obj: BaseModel) -> dict:
+    """
+    Return the fields of a model that were set, without the ephemeral fields that cause 422 errors. The caller's
+    object is never modified.
+    :param obj: A pydantic dataclass object that we wish to serialize
+    :return: A dictionary representation of the object
+    :rtype: dict
+    """
+    fields, nested = _serialization_plan(type(obj))
+    if nested:
+        return obj.dict(exclude_unset=True, exclude=EPHEMERAL_FIELDS)
+    # Flat models (hosts, networks, rules...) can skip pydantic's recursive walk unless a model was put in an untyped
+    # dict or list field
+    fields_set = obj.__fields_set__
+    values = obj.__dict__
+    serialized = {field: values[field] for field in fields if field in fields_set}
+    if any(_holds_model(value) for value in serialized.values()):
+        return obj.dict(exclude_unset=True, exclude=EPHEMERAL_FIELDS)
+    return serialized
+
+
+def serialize_objects(obj_list: list) -> list[dict]:
+    """
+    :param obj_list: list of pydantic objects to serialize
+    :return: list of dictionaries with the ephemeral fields stripped out
+    :rtype: list
+    """
+    return [serialize_object(obj) for obj in obj_list]
+
+
+def encode_object(obj: BaseModel) -> bytes:
+    """
+    :param obj: A pydantic dataclass object that we wish to send to the CSFMC
+    :return: the JSON encoded request body
+    :rtype: bytes
+    """
+    return dumps(serialize_object(obj))
+
+
+def encode_objects(obj_list: list) -> list[bytes]:
+    """
+    Encode each object separately so bulk payloads can be sized and split without encoding anything twice
+    :param obj_list: list of pydantic objects
+    :return: list of the JSON encoded objects
+    :rtype: list[bytes]
+    """
+    return [encode_object(obj) for obj in obj_list]
+
+
+def encode_array(encoded_objs: list[bytes]) -> bytes:
+    """
+    :param encoded_objs: list of JSON encoded objects
+    :return: a JSON array of the objects
+    :rtype: bytes
+    """
+    return b"[" + b",".join(encoded_objs) + b"]"
+
+
+def parse_network_value(value: str) -> list:
+    """
+    Parse the value of a host, network or range object into the IP networks it covers
+    :param value: e.g. "192.168.1.1", "192.168.1.0/24", "2001:db8::/32" or "192.168.1.10-192.168.1.20"
+    :return: list of IPv4Network/IPv6Network. A range is summarized into the fewest prefixes that cover it. FQDNs and
+             values that can not be parsed return an empty list.
+    :rtype: list
+    """
+    if not value:
+        return []
+    try:
+        if "-" in value:
+            first, last = (ipaddress.ip_address(address.strip()) for address in value.split("-", 1))
+            return list(ipaddress.summarize_address_range(first, last))
+        return [ipaddress.ip_network(value.strip(), strict=False)]
+    except (ValueError, TypeError):
+        return []
+
 
 class SerializeObjects:
     @staticmethod
     def _serialize_objects(obj_list: list) -> list:
-        serializable_objs = []
-        for i, net_obj in enumerate(obj_list):
-            obj_list[i].metadata = None
-            serializable_objs.append(obj_list[i].dict(exclude_unset=True))
-        return serializable_objs
+        return serialize_objects(obj_list)
 
     @staticmethod
     def _serialize_object(obj: object) -> object:
-        obj.metadata = None
-        return obj.dict(exclude_unset=True)
+        return serialize_object(obj)
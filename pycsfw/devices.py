@@ -1,5 +1,7 @@
 import logging
-from pycsfw.models import FTDDeviceModel
+from typing import Callable, Iterator
+from pycsfw.common import encode_object
+from pycsfw.models import FTDDeviceModel, DeviceResultModel
 
 log = logging.getLogger(__name__)
 
@@ -7,30 +9,68 @@ log = logging.getLogger(__name__)
 class Devices:
     """This class is for manipulating sensors (devices) managed by an FMC."""
 
-    def get_device_records_list(self, expanded: bool = False, offset: int = 0, limit: int = 999):
+    def get_device_records_list(
+        self,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> list[FTDDeviceModel]:
         """
         :param expanded: return extra data on each record
         :param offset: select the records starting at the offset value (paging)
-        :param limit: set the maximum number of records to return (paging)
+        :param limit: the number of records to request per page. Every page is returned
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
         :return: list of FTDDevice objects (see models.py) managed by this fmc
         :rtype: list
         """
-        return [
-            FTDDeviceModel(**device)
-            for device in self.get(
-                f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords",
-                params={"offset": offset, "limit": limit, "expanded": expanded},
-            )["items"]
-        ]
+        return self._get_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords",
+            FTDDeviceModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded},
+            max_workers=max_workers,
+            raw=raw,
+            trusted=trusted,
+        )
+
+    def iter_device_records(
+        self, expanded: bool = False, offset: int = 0, limit: int = 999, raw: bool = False, trusted: bool = False
+    ) -> Iterator[FTDDeviceModel]:
+        """
+        Stream the devices one page at a time rather than building the full list in memory
+        :param expanded: return extra data on each record
+        :param offset: select the records starting at the offset value
+        :param limit: the number of records to request per page
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: iterator of FTDDevice objects (see models.py) managed by this fmc
+        :rtype: Iterator[FTDDeviceModel]
+        """
+        yield from self._iter_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords",
+            FTDDeviceModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded},
+            raw=raw,
+            trusted=trusted,
+        )
 
-    def get_device_record(self, object_id: str) -> FTDDeviceModel:
+    def get_device_record(self, object_id: str, raw: bool = False, trusted: bool = False) -> FTDDeviceModel:
         """
         :param object_id: the id of the device to retrieve
+        :param raw: return the plain dictionary from the API rather than a model
+        :param trusted: build the model without validation (Model.construct) as the data comes from the CSFMC
         :return: FTDDevice object (see models.py) managed by this fmc
         :rtype: FTDDevice
         """
-        return FTDDeviceModel(
-            **self.get(f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{object_id}")
+        return self._build_model(
+            FTDDeviceModel,
+            self.get(f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{object_id}"),
+            raw=raw,
+            trusted=trusted,
         )
 
     def create_device_record(self, ftd_device: str) -> FTDDeviceModel:
@@ -42,7 +82,7 @@ class Devices:
         return FTDDeviceModel(
             **self.post(
                 f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords",
-                data=ftd_device.dict(exclude_unset=True),
+                data=encode_object(ftd_device),
             )
         )
 
@@ -52,11 +92,10 @@ class Devices:
         :return: FTDDevice object (see models.py) modified on this fmc
         :rtype: FTDDevice
         """
-        ftd_device.metadata = None
         return FTDDeviceModel(
             **self.put(
                 f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{ftd_device.id}",
-                data=ftd_device.dict(exclude_unset=True),
+                data=encode_object(ftd_device),
             )
         )
 
@@ -71,3 +110,28 @@ class Devices:
         )
         if deleted_device is not None:
             return FTDDeviceModel(**deleted_device)
+
+    def for_each_device(self, fn: Callable, devices: list = None, max_workers: int = 4) -> list[DeviceResultModel]:
+        """
+        Run an operation against every managed device concurrently. A failure on one device is recorded in that
+        device's result rather than aborting the whole batch. Every API call still goes through the shared rate limiter.
+        e.g. client.for_each_device(lambda device: client.get_ftd_physical_iface_list(device.id), max_workers=8)
+        :param fn: callable that accepts an FTDDeviceModel and returns the per-device result
+        :param devices: the devices to run against. Defaults to every device record managed by this fmc
+        :param max_workers: the maximum number of devices to work on at the same time
+        :return: list of DeviceResultModel (see models.py) in the same order as the devices
+        :rtype: list[DeviceResultModel]
+        """
+        if devices is None:
+            devices = self.get_device_records_list()
+        if not devices:
+            return []
+
+        def run(device: FTDDeviceModel) -> DeviceResultModel:
+            try:
+                return DeviceResultModel(device=device, result=fn(device))
+            except Exception as err:
+                log.error(f"Operation {getattr(fn, '__name__', fn)} failed on device {device.name}: {err}")
+                return DeviceResultModel(device=device, error=err)
+
+        return self._map(run, devices, max(1, min(max_workers, len(devices))))
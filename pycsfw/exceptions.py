@@ -29,3 +29,11 @@ class ObjectDeletionRestricted(Exception):
 
     def __init__(self, msg="ObjectDeletionRestricted Error"):
         self.msg = msg
+
+
+class DependencyCycle(Exception):
+    """Raised when objects depend on each other in a cycle (e.g. network groups that contain each other)"""
+
+    def __init__(self, msg="DependencyCycle Error", nodes: list = None):
+        self.msg = msg
+        self.nodes = nodes or []
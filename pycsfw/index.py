@@ -0,0 +1,567 @@
+import logging
+import ipaddress
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable, Iterator, Union
+from .common import parse_network_value
+
+log = logging.getLogger(__name__)
+
+
+class NetworkObjectIndex:
+    """
+    In memory index of host, network and network group objects supporting O(1) lookups by id, name and value.
+    Build it once with NetworkObjects.build_network_object_index() and the client keeps it current as objects are
+    created, updated and deleted through it, so group members can be resolved without an API call per member.
+    """
+
+    def __init__(self, objects: Iterable = ()) -> None:
+        """
+        :param objects: HostObjectModel, NetworkObjectModel or NetworkGroupModel objects to index
+        """
+        self._by_id = {}
+        self._by_name = {}  # name -> {type: obj}
+        self._by_value = {}  # value -> {id: obj}
+        for obj in objects:
+            self.add(obj)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self._by_id.values()))
+
+    def __contains__(self, obj_id: str) -> bool:
+        return obj_id in self._by_id
+
+    def add(self, obj: object) -> None:
+        """
+        Add or replace an object in the index
+        :param obj: a HostObjectModel, NetworkObjectModel or NetworkGroupModel with an id
+        """
+        if not obj.id:
+            log.debug(f"Not indexing {obj.name}: it has no id")
+            return
+        if obj.id in self._by_id:
+            self.remove(obj.id)
+        self._by_id[obj.id] = obj
+        if obj.name:
+            self._by_name.setdefault(obj.name, {})[obj.type.lower()] = obj
+        value = getattr(obj, "value", None)
+        if value:
+            self._by_value.setdefault(value, {})[obj.id] = obj
+
+    def remove(self, obj_id: str) -> object:
+        """
+        :param obj_id: the id of the object to drop from the index
+        :return: the object that was removed, if it was indexed
+        """
+        obj = self._by_id.pop(obj_id, None)
+        if obj is None:
+            return None
+        named = self._by_name.get(obj.name, {})
+        if named.get(obj.type.lower()) is obj:
+            del named[obj.type.lower()]
+            if not named:
+                self._by_name.pop(obj.name, None)
+        value = getattr(obj, "value", None)
+        if value:
+            valued = self._by_value.get(value, {})
+            valued.pop(obj_id, None)
+            if not valued:
+                self._by_value.pop(value, None)
+        return obj
+
+    def get_by_id(self, obj_id: str) -> object:
+        return self._by_id.get(obj_id)
+
+    def get_by_name(self, name: str, obj_type: str = None) -> object:
+        """
+        :param name: the name of the object
+        :param obj_type: optionally restrict the match to "Host", "Network" or "NetworkGroup"
+        :return: the matching object or None
+        """
+        named = self._by_name.get(name)
+        if not named:
+            return None
+        if obj_type:
+            return named.get(obj_type.lower())
+        return next(iter(named.values()))
+
+    def get_by_value(self, value: str, obj_type: str = None) -> list:
+        """
+        :param value: the address or network of the object. e.g. "192.168.1.0/24"
+        :param obj_type: optionally restrict the matches to "Host" or "Network"
+        :return: every object with that value (several objects may share one)
+        :rtype: list
+        """
+        matches = list(self._by_value.get(value, {}).values())
+        if obj_type:
+            matches = [obj for obj in matches if obj.type.lower() == obj_type.lower()]
+        return matches
+
+    def resolve(self, obj: object) -> object:
+        """
+        Find the indexed object a reference points at, by id, then by name and type, then by value
+        :param obj: a (possibly partial) object reference such as INetworkAddress(name="web", type="Host")
+        :return: the indexed object or None
+        """
+        if getattr(obj, "id", None) and obj.id in self._by_id:
+            return self._by_id[obj.id]
+        obj_type = getattr(obj, "type", None)
+        if getattr(obj, "name", None):
+            found = self.get_by_name(obj.name, obj_type)
+            if found is not None:
+                return found
+        if getattr(obj, "value", None):
+            found = self.get_by_value(obj.value, obj_type)
+            if found:
+                return found[0]
+        return None
+
+
+class PrefixTable:
+    """
+    Items keyed by the IP prefixes they cover. Prefixes are kept in a hash table and a sorted key list per IP version
+    and prefix length, so a query costs a lookup or a binary search per prefix length in use: O(log n) for any
+    practical table. Used by IPPrefixIndex and RouteTable.
+    """
+
+    def __init__(self) -> None:
+        self._tables = {4: {}, 6: {}}  # version -> {prefixlen: {network key: {item id: item}}}
+        self._sorted_keys = {}  # (version, prefixlen) -> sorted network keys, built on first range query
+        self._slots_by_id = {}  # item id -> the (version, prefixlen, network key) slots it was added under
+
+    def __len__(self) -> int:
+        return len(self._slots_by_id)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._slots_by_id
+
+    def add(self, item_id: str, item: object, prefixes: list) -> None:
+        """
+        Add or replace an item
+        :param item_id: the id of the item
+        :param item: the item to return from queries
+        :param prefixes: the IPv4Network/IPv6Network prefixes the item covers
+        """
+        if item_id in self._slots_by_id:
+            self.remove(item_id)
+        slots = [(net.version, net.prefixlen, self._key(net)) for net in prefixes]
+        for version, prefixlen, key in slots:
+            entries = self._tables[version].setdefault(prefixlen, {})
+            if key not in entries:
+                entries[key] = {}
+                sorted_keys = self._sorted_keys.get((version, prefixlen))
+                if sorted_keys is not None:
+                    insort(sorted_keys, key)
+            entries[key][item_id] = item
+        self._slots_by_id[item_id] = slots
+
+    def remove(self, item_id: str) -> None:
+        for version, prefixlen, key in self._slots_by_id.pop(item_id, None) or []:
+            entries = self._tables[version][prefixlen]
+            entries[key].pop(item_id, None)
+            if not entries[key]:
+                del entries[key]
+                sorted_keys = self._sorted_keys.get((version, prefixlen))
+                if sorted_keys is not None:
+                    del sorted_keys[bisect_left(sorted_keys, key)]
+
+    def prefixes(self, item_id: str) -> list:
+        """
+        :return: the IPv4Network/IPv6Network prefixes an item was added under
+        :rtype: list
+        """
+        prefixes = []
+        for version, prefixlen, key in self._slots_by_id.get(item_id, []):
+            bits = 32 if version == 4 else 128
+            prefixes.append(ipaddress.ip_network((key << (bits - prefixlen), prefixlen)))
+        return prefixes
+
+    def covering(self, address: Union[str, object]) -> Iterator[tuple]:
+        """
+        :param address: an IPv4 or IPv6 address or network
+        :return: (prefixlen, items) for every prefix covering the address, most specific first
+        :rtype: Iterator[tuple]
+        """
+        net = ipaddress.ip_network(address, strict=False)
+        bits, net_int = net.max_prefixlen, int(net.network_address)
+        tables = self._tables[net.version]
+        for prefixlen in sorted(tables, reverse=True):
+            if prefixlen > net.prefixlen:
+                continue
+            items = tables[prefixlen].get(net_int >> (bits - prefixlen))
+            if items:
+                yield prefixlen, list(items.values())
+
+    def inside(self, network: Union[str, object]) -> Iterator:
+        """
+        :param network: an IPv4 or IPv6 network
+        :return: the items with a prefix strictly inside the network
+        :rtype: Iterator
+        """
+        net = ipaddress.ip_network(network, strict=False)
+        bits = net.max_prefixlen
+        first, last = int(net.network_address), int(net.broadcast_address)
+        for prefixlen in sorted(self._tables[net.version]):
+            if prefixlen <= net.prefixlen:
+                continue
+            entries = self._tables[net.version][prefixlen]
+            sorted_keys = self._sorted_keys.get((net.version, prefixlen))
+            if sorted_keys is None:
+                sorted_keys = self._sorted_keys[(net.version, prefixlen)] = sorted(entries)
+            low, high = first >> (bits - prefixlen), last >> (bits - prefixlen)
+            for key in sorted_keys[bisect_left(sorted_keys, low) : bisect_right(sorted_keys, high)]:
+                yield from entries[key].values()
+
+    @staticmethod
+    def _key(prefix: object) -> int:
+        return int(prefix.network_address) >> (prefix.max_prefixlen - prefix.prefixlen)
+
+
+class IPPrefixIndex:
+    """
+    Index of host, network, range and network group objects by the IP prefixes they cover, answering "which objects
+    contain 10.1.2.3" or "which objects overlap 10.0.0.0/16" without parsing every value on every query. Groups are
+    indexed under every prefix of their members and literals (expanded recursively) and ranges under the prefixes that
+    summarize them. When a member is updated or removed, the groups that contain it are re-expanded.
+    """
+
+    def __init__(self, objects: Iterable = ()) -> None:
+        """
+        :param objects: HostObjectModel, NetworkObjectModel, RangeObjectModel and NetworkGroupModel objects (or a
+                        NetworkObjectIndex). Group members are resolved by id among these objects.
+        """
+        objects = list(objects)
+        self._objects = {obj.id: obj for obj in objects if obj.id}
+        self._parents = {}  # member id -> ids of the groups that list it directly
+        self._prefix_table = PrefixTable()
+        for obj in objects:
+            self._add(obj, reindex_parents=False)  # Every member is already known, so no group needs re-expanding
+
+    def __len__(self) -> int:
+        return len(self._prefix_table)
+
+    def __contains__(self, obj_id: str) -> bool:
+        return obj_id in self._prefix_table
+
+    def add(self, obj: object) -> None:
+        """
+        Add or replace an object in the index and re-expand the groups that contain it. The members of a group must
+        already be in the index.
+        :param obj: a HostObjectModel, NetworkObjectModel, RangeObjectModel or NetworkGroupModel with an id
+        """
+        self._add(obj, reindex_parents=True)
+
+    def remove(self, obj_id: str) -> object:
+        """
+        :param obj_id: the id of the object to drop from the index
+        :return: the object that was removed, if it was indexed
+        """
+        self._prefix_table.remove(obj_id)
+        obj = self._objects.pop(obj_id, None)
+        if obj is not None:
+            self._unlink_members(obj)
+            self._reindex_parents(obj_id, {obj_id})
+        return obj
+
+    def prefixes(self, obj_id: str) -> list:
+        """
+        :param obj_id: the id of an indexed object
+        :return: the IPv4Network/IPv6Network prefixes the object covers (empty for FQDNs and unknown ids)
+        :rtype: list
+        """
+        return self._prefix_table.prefixes(obj_id)
+
+    def groups_containing(self, obj_id: str) -> set:
+        """
+        :param obj_id: the id of an object
+        :return: the ids of the groups that contain the object, directly or through nested groups
+        :rtype: set
+        """
+        groups, pending = set(), [obj_id]
+        while pending:
+            for parent_id in self._parents.get(pending.pop(), ()):
+                if parent_id not in groups:
+                    groups.add(parent_id)
+                    pending.append(parent_id)
+        groups.discard(obj_id)
+        return groups
+
+    def longest_prefix(self, address: str) -> list:
+        """
+        :param address: an IPv4 or IPv6 address or network. e.g. "10.1.2.3"
+        :return: the objects with the most specific prefix covering the address (several objects may share it)
+        :rtype: list
+        """
+        for prefixlen, objs in self._prefix_table.covering(address):
+            return objs
+        return []
+
+    def containing(self, address: str) -> list:
+        """
+        :param address: an IPv4 or IPv6 address or network. e.g. "10.1.2.3" or "10.1.2.0/24"
+        :return: every object that covers the address, most specific first
+        :rtype: list
+        """
+        return self._unique(obj for prefixlen, objs in self._prefix_table.covering(address) for obj in objs)
+
+    def overlapping(self, network: str) -> list:
+        """
+        :param network: an IPv4 or IPv6 network. e.g. "10.0.0.0/16"
+        :return: every object that covers the network or has a prefix inside it
+        :rtype: list
+        """
+        return self._unique(
+            [obj for prefixlen, objs in self._prefix_table.covering(network) for obj in objs]
+            + list(self._prefix_table.inside(network))
+        )
+
+    def _add(self, obj: object, reindex_parents: bool) -> None:
+        if not obj.id:
+            log.debug(f"Not indexing {obj.name}: it has no id")
+            return
+        replaced = self._objects.get(obj.id)
+        if replaced is not None:
+            self._unlink_members(replaced)
+        self._objects[obj.id] = obj
+        self._link_members(obj)
+        self._index(obj)
+        if reindex_parents:
+            self._reindex_parents(obj.id, {obj.id})
+
+    def _index(self, obj: object) -> None:
+        prefixes = self._prefixes_of(obj, set())
+        if len(prefixes) > 1:  # Merge a group's overlapping and adjacent member prefixes
+            prefixes = [net for version in (4, 6) for net in self._collapse(prefixes, version)]
+        self._prefix_table.add(obj.id, obj, prefixes)
+
+    def _reindex_parents(self, obj_id: str, seen: set) -> None:
+        """
+        Re-expand the groups that contain an object, and the groups that contain those, after the object changed
+        """
+        for parent_id in list(self._parents.get(obj_id, ())):
+            if parent_id in seen or parent_id not in self._objects:
+                continue
+            seen.add(parent_id)
+            self._index(self._objects[parent_id])
+            self._reindex_parents(parent_id, seen)
+
+    def _link_members(self, obj: object) -> None:
+        if self._is_group(obj):
+            for member in obj.objects or []:
+                if member.id:
+                    self._parents.setdefault(member.id, set()).add(obj.id)
+
+    def _unlink_members(self, obj: object) -> None:
+        if self._is_group(obj):
+            for member in obj.objects or []:
+                self._parents.get(member.id, set()).discard(obj.id)
+
+    @staticmethod
+    def _is_group(obj: object) -> bool:
+        return (obj.type or "").lower() == "networkgroup"
+
+    def _prefixes_of(self, obj: object, seen: set) -> list:
+        """
+        :return: the prefixes an object covers, expanding group members and literals
+        """
+        if not self._is_group(obj):
+            return parse_network_value(getattr(obj, "value", None))
+        if obj.id in seen:
+            log.warning(f"Network group {obj.name} contains itself. Not expanding it again.")
+            return []
+        seen = seen | {obj.id}
+        prefixes = []
+        for member in obj.objects or []:
+            resolved = self._objects.get(member.id)
+            if resolved is None:
+                log.debug(f"Group {obj.name} member {member.name or member.id} is not in the index")
+                continue
+            prefixes += self._prefixes_of(resolved, seen)
+        for literal in obj.literals or []:
+            value = literal.get("value") if isinstance(literal, dict) else getattr(literal, "value", None)
+            prefixes += parse_network_value(value)
+        return prefixes
+
+    @staticmethod
+    def _collapse(prefixes: list, version: int) -> Iterator:
+        return ipaddress.collapse_addresses(net for net in prefixes if net.version == version)
+
+    @staticmethod
+    def _unique(objs: Iterable) -> list:
+        return list({obj.id: obj for obj in objs}.values())
+
+
+class RouteTable:
+    """
+    Index of a device's static routes by selected network (id and name), gateway (id, name or literal value) and
+    interface name. Once the selected networks are resolved to prefixes with an IPPrefixIndex it also answers longest
+    prefix match queries. Build it once with StaticRoutes.get_route_table() and the client keeps it current as routes
+    are created, updated and deleted through it.
+    """
+
+    def __init__(self, routes: Iterable = (), prefix_index: IPPrefixIndex = None) -> None:
+        """
+        :param routes: IPv4StaticRouteModel (or IPv6StaticRouteModel) objects
+        :param prefix_index: optional IPPrefixIndex used to resolve the selected networks for longest prefix matching
+        """
+        self.prefix_index = prefix_index
+        self._routes = {}
+        self._by_network = {}  # selected network id or name -> {route id: route}
+        self._by_gateway = {}  # gateway object id, name or literal value -> {route id: route}
+        self._by_interface = {}  # interface name -> {route id: route}
+        self._prefix_table = PrefixTable()
+        for route in routes:
+            self.add(route)
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self._routes.values()))
+
+    def __contains__(self, route_id: str) -> bool:
+        return route_id in self._routes
+
+    def add(self, route: object) -> None:
+        """
+        Add or replace a route in the table
+        :param route: a static route model with an id
+        """
+        if not route.id:
+            log.debug("Not indexing a static route with no id")
+            return
+        if route.id in self._routes:
+            self.remove(route.id)
+        self._routes[route.id] = route
+        for mapping, key in self._index_keys(route):
+            mapping.setdefault(key, {})[route.id] = route
+        if self.prefix_index is not None:
+            self._prefix_table.add(route.id, route, self._route_prefixes(route))
+
+    def remove(self, route_id: str) -> object:
+        """
+        :param route_id: the id of the route to drop from the table
+        :return: the route that was removed, if it was in the table
+        """
+        route = self._routes.pop(route_id, None)
+        if route is None:
+            return None
+        for mapping, key in self._index_keys(route):
+            routes = mapping.get(key, {})
+            routes.pop(route_id, None)
+            if not routes:
+                mapping.pop(key, None)
+        self._prefix_table.remove(route_id)
+        return route
+
+    def refresh(self, routes: Iterable, prefix_index: IPPrefixIndex = None) -> list[str]:
+        """
+        Bring the table in line with a fresh list of the device's routes, re-indexing only the routes that changed.
+        The objects a route selects may have changed even when the route did not, so every route is then resolved
+        again against the prefix index.
+        :param routes: every static route the device has now
+        :param prefix_index: optional IPPrefixIndex to resolve the routes with from now on
+        :return: the ids of the routes that were added, changed or removed
+        :rtype: list[str]
+        """
+        if prefix_index is not None:
+            self.prefix_index = prefix_index
+        current = {route.id: route for route in routes if route.id}
+        changed = [route_id for route_id in self._routes if route_id not in current]
+        for route_id in changed:
+            self.remove(route_id)
+        for route_id, route in current.items():
+            existing = self._routes.get(route_id)
+            if existing is None or not route.version or existing.version != route.version:
+                self.add(route)
+                changed.append(route_id)
+        if self.prefix_index is not None:
+            self.resolve(self.prefix_index)
+        return changed
+
+    def resolve(self, prefix_index: IPPrefixIndex, object_ids: Iterable = None) -> None:
+        """
+        Resolve the selected networks of the routes to prefixes for longest prefix matching
+        :param prefix_index: IPPrefixIndex holding the network objects the routes refer to
+        :param object_ids: only resolve the routes that select one of these objects (e.g. the objects that changed).
+                           Every route is resolved by default.
+        """
+        self.prefix_index = prefix_index
+        if object_ids is None:
+            routes = list(self._routes.values())
+        else:
+            routes = list({route.id: route for obj_id in object_ids for route in self.by_network(obj_id)}.values())
+        for route in routes:
+            self._prefix_table.add(route.id, route, self._route_prefixes(route))
+
+    def get(self, route_id: str) -> object:
+        return self._routes.get(route_id)
+
+    def by_network(self, network: str) -> list:
+        """
+        :param network: the id or name of a host, network or group object
+        :return: the routes that select the object
+        :rtype: list
+        """
+        return list(self._by_network.get(network, {}).values())
+
+    def by_gateway(self, gateway: str) -> list:
+        """
+        :param gateway: the id or name of the gateway host object, or the literal gateway address
+        :return: the routes through the gateway
+        :rtype: list
+        """
+        return list(self._by_gateway.get(gateway, {}).values())
+
+    def by_interface(self, interface_name: str) -> list:
+        """
+        :param interface_name: the logical name of the interface. e.g. "outside"
+        :return: the routes out of the interface
+        :rtype: list
+        """
+        return list(self._by_interface.get(interface_name, {}).values())
+
+    def longest_prefix(self, address: str) -> list:
+        """
+        Needs the table to be resolved with a prefix_index
+        :param address: an IPv4 or IPv6 address. e.g. "10.1.2.3"
+        :return: the most specific routes for the address, lowest metric first (more than one for equal cost paths)
+        :rtype: list
+        """
+        if self.prefix_index is None:
+            log.warning("The route table has no prefix_index so longest prefix matches can not be found")
+        for prefixlen, routes in self._prefix_table.covering(address):
+            return sorted(routes, key=lambda route: route.metricValue or 0)
+        return []
+
+    def _index_keys(self, route: object) -> list[tuple]:
+        """
+        :return: (mapping, key) for every index the route belongs in
+        """
+        keys = []
+        for network in route.selectedNetworks or []:
+            for field in ("id", "name"):
+                value = self._field(network, field)
+                if value:
+                    keys.append((self._by_network, value))
+        gateway = route.gateway or {}
+        for part, field in (("object", "id"), ("object", "name"), ("literal", "value")):
+            value = self._field(gateway.get(part) or {}, field)
+            if value:
+                keys.append((self._by_gateway, value))
+        if route.interfaceName:
+            keys.append((self._by_interface, route.interfaceName))
+        return keys
+
+    def _route_prefixes(self, route: object) -> list:
+        prefixes = set()
+        for network in route.selectedNetworks or []:
+            prefixes.update(self.prefix_index.prefixes(self._field(network, "id")))
+        return list(prefixes)
+
+    @staticmethod
+    def _field(obj: object, field: str) -> object:
+        """Routes built with trusted=True keep their nested fields as dictionaries"""
+        return obj.get(field) if isinstance(obj, dict) else getattr(obj, field, None)
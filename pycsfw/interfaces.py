@@ -1,4 +1,6 @@
 import logging
+from typing import Iterator
+from pycsfw.common import encode_object
 from pycsfw.models import FTDPhysicalInterfaceModel, FTDSubInterfaceModel
 
 log = logging.getLogger(__name__)
@@ -8,23 +10,62 @@ log = logging.getLogger(__name__)
 
 class Interfaces:
     def get_ftd_physical_iface_list(
-        self, container_uuid: str, expanded: bool = False, offset: int = 0, limit: int = 999
+        self,
+        container_uuid: str,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
     ) -> list[FTDPhysicalInterfaceModel]:
         """
         :param container_uuid: The UUID of the device we are working on
         :param expanded: Return additional details about the object
         :param offset: start on the nth record (useful for paging)
-        :param limit: the maximum number of objects to return (useful for paging)
+        :param limit: the number of objects to request per page. Every page is returned
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
         :return: list of FTDPhysicalInterface objects (see models.py)
         :rtype: list
         """
-        return [
-            FTDPhysicalInterfaceModel(**p_int)
-            for p_int in self.get(
-                f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{container_uuid}/physicalinterfaces",
-                params={"offset": offset, "limit": limit, "expanded": expanded},
-            )["items"]
-        ]
+        return self._get_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{container_uuid}/physicalinterfaces",
+            FTDPhysicalInterfaceModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded},
+            max_workers=max_workers,
+            raw=raw,
+            trusted=trusted,
+        )
+
+    def iter_ftd_physical_ifaces(
+        self,
+        container_uuid: str,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> Iterator[FTDPhysicalInterfaceModel]:
+        """
+        Stream the physical interfaces of a device one page at a time
+        :param container_uuid: The UUID of the device we are working on
+        :param expanded: Return additional details about the object
+        :param offset: start on the nth record
+        :param limit: the number of objects to request per page
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: iterator of FTDPhysicalInterface objects (see models.py)
+        :rtype: Iterator[FTDPhysicalInterfaceModel]
+        """
+        yield from self._iter_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{container_uuid}/physicalinterfaces",
+            FTDPhysicalInterfaceModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded},
+            raw=raw,
+            trusted=trusted,
+        )
 
     def get_ftd_physical_iface_by_name(
         self, container_uuid: str, iface_name: str, expanded: bool = False
@@ -40,18 +81,21 @@ class Interfaces:
         if found_iface:
             return found_iface[0]
 
-    def get_ftd_physical_iface(self, container_uuid: str, intf_id: str) -> FTDPhysicalInterfaceModel:
+    def get_ftd_physical_iface(
+        self, container_uuid: str, intf_id: str, raw: bool = False, trusted: bool = False
+    ) -> FTDPhysicalInterfaceModel:
         """
         :param container_uuid: The UUID of the device we are working on
         :param intf_id: The UUID of the interface we wish to retrieve
+        :param raw: return the plain dictionary from the API rather than a model
+        :param trusted: build the model without validation (Model.construct) as the data comes from the CSFMC
         :return: FTDPhysicalInterface object
         :rtype: FTDPhysicalInterface (see models.py)
         """
         iface = self.get(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{container_uuid}/physicalinterfaces/{intf_id}",
         )
-        if iface is not None:
-            return FTDPhysicalInterfaceModel(**iface)
+        return self._build_model(FTDPhysicalInterfaceModel, iface, raw=raw, trusted=trusted)
 
     def update_ftd_physical_iface(
         self, container_uuid: str, intf_obj: FTDPhysicalInterfaceModel
@@ -62,31 +106,32 @@ class Interfaces:
         :return: FTDPhysicalInterface object
         :rtype: FTDPhysicalInterface (see models.py)
         """
-        intf_obj.metadata = None
         iface = self.put(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{container_uuid}/physicalinterfaces/{intf_obj.id}",
-            data=intf_obj.dict(exclude_unset=True),
+            data=encode_object(intf_obj),
         )
         if iface is not None:
             return FTDPhysicalInterfaceModel(**iface)
         pass
 
     def get_ftd_vlan_iface_list(
-        self, container_uuid: str, expanded: bool = False, offset: int = 0, limit: int = 999
+        self, container_uuid: str, expanded: bool = False, offset: int = 0, limit: int = 999, max_workers: int = 1
     ) -> list:
         """
         :param container_uuid: The UUID of the device we are working on
         :param expanded: Return additional details about the object
         :param offset: start on the nth record (useful for paging)
-        :param limit: the maximum number of objects to return (useful for paging)
+        :param limit: the number of objects to request per page. Every page is returned
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
         :return: list of FTDVLANInterface objects (see models.py)
         :rtype: list
         """
-        vlan_ifaces = self.get(
+        return self._get_list(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{container_uuid}/vlaninterfaces",
+            None,
             params={"offset": offset, "limit": limit, "expanded": expanded},
+            max_workers=max_workers,
         )
-        return vlan_ifaces.get("items")
 
     def get_ftd_vlan_iface(self, container_uuid: str, intf_id: str) -> dict:
         """
@@ -99,35 +144,78 @@ class Interfaces:
         )
 
     def get_ftd_subiface_list(
-        self, container_uuid: str, expanded: bool = False, offset: int = 0, limit: int = 999
+        self,
+        container_uuid: str,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
     ) -> list[FTDSubInterfaceModel]:
         """
         :param container_uuid: The UUID of the device we are working on
         :param expanded: Return additional details about the object
         :param offset: start on the nth record (useful for paging)
-        :param limit: the maximum number of objects to return (useful for paging)
+        :param limit: the number of objects to request per page. Every page is returned
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
         :return: list of FTDSubInterface objects (see models.py)
         :rtype: list
         """
-        sub_ifaces = self.get(
+        return self._get_list(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{container_uuid}/subinterfaces",
+            FTDSubInterfaceModel,
             params={"offset": offset, "limit": limit, "expanded": expanded},
+            max_workers=max_workers,
+            raw=raw,
+            trusted=trusted,
         )
-        if "items" in sub_ifaces:
-            return [FTDSubInterfaceModel(**sub_int) for sub_int in sub_ifaces["items"]]
 
-    def get_ftd_subiface(self, container_uuid: str, intf_id: str) -> FTDSubInterfaceModel:
+    def iter_ftd_subifaces(
+        self,
+        container_uuid: str,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> Iterator[FTDSubInterfaceModel]:
+        """
+        Stream the sub-interfaces of a device one page at a time
+        :param container_uuid: The UUID of the device we are working on
+        :param expanded: Return additional details about the object
+        :param offset: start on the nth record
+        :param limit: the number of objects to request per page
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: iterator of FTDSubInterface objects (see models.py)
+        :rtype: Iterator[FTDSubInterfaceModel]
+        """
+        yield from self._iter_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{container_uuid}/subinterfaces",
+            FTDSubInterfaceModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded},
+            raw=raw,
+            trusted=trusted,
+        )
+
+    def get_ftd_subiface(
+        self, container_uuid: str, intf_id: str, raw: bool = False, trusted: bool = False
+    ) -> FTDSubInterfaceModel:
         """
         :param container_uuid: The UUID of the device we are working on
         :param intf_id: The UUID of the interface we wish to retrieve
+        :param raw: return the plain dictionary from the API rather than a model
+        :param trusted: build the model without validation (Model.construct) as the data comes from the CSFMC
         :return: FTDSubInterface object
         :rtype: FTDSubInterface (see models.py)
         """
         sub_iface = self.get(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{container_uuid}/subinterfaces/{intf_id}",
         )
-        if sub_iface is not None:
-            return FTDSubInterfaceModel(**sub_iface)
+        return self._build_model(FTDSubInterfaceModel, sub_iface, raw=raw, trusted=trusted)
 
     def create_ftd_subiface(self, container_uuid: str, intf_obj: FTDSubInterfaceModel) -> FTDSubInterfaceModel:
         """
@@ -138,11 +226,29 @@ class Interfaces:
         """
         iface = self.post(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{container_uuid}/subinterfaces",
-            data=intf_obj.dict(exclude_unset=True),
+            data=encode_object(intf_obj),
         )
         if iface is not None:
             return FTDSubInterfaceModel(**iface)
 
+    def create_bulk_ftd_subifaces(
+        self, container_uuid: str, intf_obj_list: list, max_workers: int = 1
+    ) -> list[FTDSubInterfaceModel]:
+        """
+        The CSFMC has no bulk mode for subinterfaces, so each one is its own post. They can be sent concurrently.
+        :param container_uuid: The UUID of the device we are working on
+        :param intf_obj_list: list of the FTDSubInterfaceModel objects that we wish to create
+        :param max_workers: send the posts concurrently using up to this many threads
+        :return: list of the FTDSubInterfaceModel objects created, in the order given
+        :rtype: list[FTDSubInterfaceModel]
+        """
+        return self._create_each(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{container_uuid}/subinterfaces",
+            intf_obj_list,
+            FTDSubInterfaceModel,
+            max_workers=max_workers,
+        )
+
     def update_ftd_subiface(self, container_uuid: str, intf_obj: FTDSubInterfaceModel) -> FTDSubInterfaceModel:
         """
         :param container_uuid: The UUID of the device we are working on
@@ -150,10 +256,9 @@ class Interfaces:
         :return: FTDSubInterface object
         :rtype: FTDSubInterface (see models.py)
         """
-        intf_obj.metadata = None
         sub_iface = self.put(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{container_uuid}/subinterfaces/{intf_obj.id}",
-            data=intf_obj.dict(exclude_unset=True),
+            data=encode_object(intf_obj),
         )
         if sub_iface is not None:
             return FTDSubInterfaceModel(**sub_iface)
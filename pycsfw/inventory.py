@@ -0,0 +1,225 @@
+import logging
+import ipaddress
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator
+from .common import parse_network_value
+from .models import HostObjectModel, NetworkObjectModel, RangeObjectModel
+
+log = logging.getLogger(__name__)
+
+MASK_64 = (1 << 64) - 1
+SPAN = 255  # The prefixlen of a range that does not summarize to a single prefix
+
+
+class NetworkObjectTable:
+    """
+    Compact, column oriented table of host and network objects for large inventories. Each object is a row spread over
+    a handful of lists and typed arrays rather than a pydantic model with its own metadata, links and overrides dicts,
+    which takes an order of magnitude less memory. The value of each object is parsed once into its network address
+    (as two unsigned 64 bit halves so IPv6 fits in an array) and prefix length. The address filters group the rows by
+    IP version and prefix length, sorted by network, on first use, so "which objects contain 10.1.2.3" is a binary
+    search per prefix length in use rather than a pass over every row. A range that is not a single prefix keeps its
+    first address and SPAN as its prefix length, and is matched against its first and last address.
+    """
+
+    COLUMNS = ("ids", "names", "type_codes", "values", "versions", "ip_versions", "net_hi", "net_lo", "prefixlens")
+    __slots__ = COLUMNS + ("_sorted",)
+
+    TYPES = ("Host", "Network", "Range", "FQDN")  # The type column holds the index into this tuple
+    TYPE_CODES = {obj_type: code for code, obj_type in enumerate(TYPES)}
+
+    def __init__(self, records: Iterable[dict] = ()) -> None:
+        """
+        :param records: raw host and network records as returned by the API (e.g. iter_host_objects(raw=True))
+        """
+        self.ids = []
+        self.names = []
+        self.type_codes = array("B")
+        self.values = []
+        self.versions = []
+        self.ip_versions = array("B")  # 4, 6 or 0 when the value could not be parsed
+        self.net_hi = array("Q")
+        self.net_lo = array("Q")
+        self.prefixlens = array("B")
+        self._sorted = None  # {(ip version, prefixlen): (sorted network keys, their row numbers)}, built on first use
+        self.extend(records)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[dict]:
+        return (self.row(i) for i in range(len(self)))
+
+    def __getitem__(self, i: int) -> dict:
+        return self.row(i)
+
+    def append(self, record: dict) -> bool:
+        """
+        :param record: a raw host or network record. e.g. {"id": "...", "name": "web", "type": "Host", "value": ...}
+        :return: False if the record was skipped because its type is not one of TYPES
+        :rtype: bool
+        """
+        type_code = self.TYPE_CODES.get(record.get("type", "Network"))
+        if type_code is None:
+            log.warning(f"Skipping {record.get('name')}: {record.get('type')} objects can not be added to the table")
+            return False
+        networks = parse_network_value(record.get("value"))
+        network = networks[0] if networks else None
+        net_int = int(network.network_address) if network else 0
+        self.ids.append(record.get("id"))
+        self.names.append(record.get("name"))
+        self.type_codes.append(type_code)
+        self.values.append(record.get("value"))
+        self.versions.append(record.get("version"))
+        self.ip_versions.append(network.version if network else 0)
+        self.net_hi.append(net_int >> 64)
+        self.net_lo.append(net_int & MASK_64)
+        self.prefixlens.append(SPAN if len(networks) > 1 else network.prefixlen if network else 0)
+        self._sorted = None
+        return True
+
+    def extend(self, records: Iterable[dict]) -> None:
+        for record in records:
+            self.append(record)
+
+    def row(self, i: int) -> dict:
+        """
+        :param i: the row number
+        :return: the id, name, type, value and version of the object in row i
+        :rtype: dict
+        """
+        return {
+            "id": self.ids[i],
+            "name": self.names[i],
+            "type": self.TYPES[self.type_codes[i]],
+            "value": self.values[i],
+            "version": self.versions[i],
+        }
+
+    def model(self, i: int) -> NetworkObjectModel:
+        """
+        :param i: the row number
+        :return: the object in row i as a HostObjectModel, RangeObjectModel or NetworkObjectModel
+        :rtype: NetworkObjectModel
+        """
+        row = self.row(i)
+        return {"Host": HostObjectModel, "Range": RangeObjectModel}.get(row["type"], NetworkObjectModel)(**row)
+
+    def network(self, i: int) -> object:
+        """
+        :param i: the row number
+        :return: the IPv4Network/IPv6Network of the object in row i, or None if its value could not be parsed or is a
+                 range that spans several prefixes
+        """
+        if not self.ip_versions[i] or self.prefixlens[i] == SPAN:
+            return None
+        net_int = (self.net_hi[i] << 64) | self.net_lo[i]
+        address = ipaddress.IPv4Address(net_int) if self.ip_versions[i] == 4 else ipaddress.IPv6Address(net_int)
+        return ipaddress.ip_network(f"{address}/{self.prefixlens[i]}")
+
+    def take(self, rows: Iterable[int]) -> "NetworkObjectTable":
+        """
+        :param rows: the row numbers to keep, e.g. the result of one of the filters below
+        :return: a new table holding only those rows
+        :rtype: NetworkObjectTable
+        """
+        table = NetworkObjectTable()
+        for i in rows:
+            for column in self.COLUMNS:
+                getattr(table, column).append(getattr(self, column)[i])
+        return table
+
+    def where_type(self, obj_type: str) -> list[int]:
+        """
+        :param obj_type: "Host", "Network", "Range" or "FQDN"
+        :return: the row numbers of the objects of that type
+        :rtype: list[int]
+        :raises ValueError: if obj_type is not one of TYPES
+        """
+        code = self.TYPE_CODES.get(obj_type)
+        if code is None:
+            raise ValueError(f"Unknown object type {obj_type}. The table holds {', '.join(self.TYPES)} objects")
+        return [i for i, type_code in enumerate(self.type_codes) if type_code == code]
+
+    def where_name(self, name: str) -> list[int]:
+        """
+        :param name: the object name
+        :return: the row numbers of the objects with that name
+        :rtype: list[int]
+        """
+        return [i for i, row_name in enumerate(self.names) if row_name == name]
+
+    def containing(self, address: str) -> list[int]:
+        """
+        :param address: an IPv4 or IPv6 address. e.g. "10.1.2.3"
+        :return: the row numbers of the objects whose network contains the address
+        :rtype: list[int]
+        """
+        ip = ipaddress.ip_address(address)
+        rows = []
+        for (version, prefixlen), (keys, key_rows, ends) in self._sorted_keys().items():
+            if version != ip.version:
+                continue
+            if prefixlen == SPAN:
+                # Every range starting at or before the address, keeping those that end at or after it
+                stop = bisect_right(keys, int(ip))
+                rows.extend(row for row, end in zip(key_rows[:stop], ends[:stop]) if end >= int(ip))
+            else:
+                key = int(ip) >> (ip.max_prefixlen - prefixlen)
+                rows.extend(key_rows[bisect_left(keys, key) : bisect_right(keys, key)])
+        return sorted(rows)
+
+    def within(self, network: str) -> list[int]:
+        """
+        :param network: an IPv4 or IPv6 network. e.g. "10.0.0.0/16"
+        :return: the row numbers of the objects that fall entirely inside the network
+        :rtype: list[int]
+        """
+        net = ipaddress.ip_network(network, strict=False)
+        first, last = int(net.network_address), int(net.broadcast_address)
+        rows = []
+        for (version, prefixlen), (keys, key_rows, ends) in self._sorted_keys().items():
+            if version != net.version:
+                continue
+            if prefixlen == SPAN:
+                # Every range starting inside the network, keeping those that also end inside it
+                start, stop = bisect_left(keys, first), bisect_right(keys, last)
+                rows.extend(row for row, end in zip(key_rows[start:stop], ends[start:stop]) if end <= last)
+            elif prefixlen >= net.prefixlen:
+                shift = net.max_prefixlen - prefixlen
+                rows.extend(key_rows[bisect_left(keys, first >> shift) : bisect_right(keys, last >> shift)])
+        return sorted(rows)
+
+
+    def _sorted_keys(self) -> dict:
+        """
+        Group the rows with a parsed value by IP version and prefix length, sorted by network key (the network address
+        shifted down to its prefix bits). Ranges that span several prefixes are grouped under SPAN and keyed by their
+        first address, with their last address alongside. Built once and reused until the next append.
+        :return: {(ip version, prefixlen): (sorted network keys, the row number of each key, the last address of each
+                 range or None)}
+        """
+        if self._sorted is None:
+            grouped = {}
+            for i, (version, hi, lo, prefixlen) in enumerate(
+                zip(self.ip_versions, self.net_hi, self.net_lo, self.prefixlens)
+            ):
+                if version:
+                    # A range is keyed by its whole first address, a network by its prefix bits
+                    shift = 0 if prefixlen == SPAN else (32 if version == 4 else 128) - prefixlen
+                    grouped.setdefault((version, prefixlen), []).append((((hi << 64) | lo) >> shift, i))
+            self._sorted = {}
+            for slot, pairs in grouped.items():
+                pairs.sort()
+                # IPv4 keys fit an unsigned 32 bit array; IPv6 keys need Python ints
+                keys = array("L", (key for key, _ in pairs)) if slot[0] == 4 else [key for key, _ in pairs]
+                rows = array("L", (i for _, i in pairs))
+                # Ranges are rare, so their last address is parsed again from the value rather than kept in a column
+                ends = (
+                    [int(parse_network_value(self.values[i])[-1].broadcast_address) for i in rows]
+                    if slot[1] == SPAN
+                    else None
+                )
+                self._sorted[slot] = (keys, rows, ends)
+        return self._sorted
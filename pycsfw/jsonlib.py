@@ -0,0 +1,43 @@
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+# The JSON backend used to decode every API response and encode every request body. The fastest library installed is
+# picked once at import time: orjson, then ujson, then the standard library. Install the "fast" extra
+# (pip install pycsfw[fast]) to get orjson.
+
+try:
+    import orjson
+
+    BACKEND = "orjson"
+
+    def loads(data: bytes) -> object:
+        return orjson.loads(data)
+
+    def dumps(obj: object) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+    try:
+        import ujson
+
+        BACKEND = "ujson"
+
+        def loads(data: bytes) -> object:
+            return ujson.loads(data)
+
+        def dumps(obj: object) -> bytes:
+            return ujson.dumps(obj, escape_forward_slashes=False).encode()
+
+    except ImportError:
+        BACKEND = "json"
+
+        def loads(data: bytes) -> object:
+            return json.loads(data)
+
+        def dumps(obj: object) -> bytes:
+            return json.dumps(obj, separators=(",", ":")).encode()
+
+
+log.debug(f"Using the {BACKEND} JSON backend")
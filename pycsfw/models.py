@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Optional
 from enum import Enum
 
 
@@ -60,6 +60,10 @@ class HostObjectModel(NetworkObjectModel):
     type: str = "Host"
 
 
+class RangeObjectModel(NetworkObjectModel):
+    type: str = "Range"  # value is "first address-last address". e.g. "192.168.1.10-192.168.1.20"
+
+
 class FTDAccessRuleModel(BaseModel):
     id: Optional[str]
     name: Optional[str]
@@ -180,6 +184,47 @@ class FTDDeviceModel(BaseModel):
     type: str = "device"
 
 
+class DeviceResultModel(BaseModel):
+    """The outcome of running an operation against one device with for_each_device"""
+
+    device: FTDDeviceModel
+    result: Optional[Any]
+    error: Optional[Any]  # The exception raised for this device, if any
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BulkFailureModel(BaseModel):
+    """An object a bulk create could not create and the reason the CSFMC gave"""
+
+    item: Any  # The model that was submitted
+    error: Optional[str]
+
+
+class BulkResultModel(BaseModel):
+    """The outcome of a bulk create run with isolate_failures=True"""
+
+    created: list = []
+    duplicates: list = []  # Submitted models that already exist on the CSFMC
+    failed: list[BulkFailureModel] = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.duplicates and not self.failed
+
+
+class SyncResultModel(BaseModel):
+    """The changes made by sync_network_objects"""
+
+    created: list = []
+    updated: list = []
+    deleted: list = []
+    unchanged: list = []
+    skipped: list = []  # Read only objects that differ from the desired state but can not be modified
+
+
 class FTDInterfaceIPv4Model(BaseModel):
     # 'ipv4': {'static': {'address': '192.168.22.1', 'netmask': '24'}},
     static: Optional[dict]
@@ -1,6 +1,18 @@
 import logging
-from .models import HostObjectModel, NetworkObjectModel, NetworkGroupModel, INetworkAddress
-from urllib.parse import urlparse, parse_qsl
+from typing import Iterator, Union
+from .common import encode_object
+from .index import NetworkObjectIndex, IPPrefixIndex
+from .inventory import NetworkObjectTable
+from .scheduler import dependency_levels
+from .models import (
+    HostObjectModel,
+    NetworkObjectModel,
+    RangeObjectModel,
+    NetworkGroupModel,
+    INetworkAddress,
+    BulkResultModel,
+    SyncResultModel,
+)
 
 log = logging.getLogger(__name__)
 
@@ -8,39 +20,86 @@ log = logging.getLogger(__name__)
 class NetworkObjects:
     """Class to call the FMC API Endpoint for Network and Host Objects and Groups"""
 
+    network_object_index = None  # Set by build_network_object_index() and kept current by the methods below
+    ip_prefix_index = None  # Set by build_ip_prefix_index() and kept current by the methods below
+    SYNC_TYPES = ("host", "network", "networkgroup")  # The object types managed by sync_network_objects
+
     def get_network_objects_list(
-        self, expanded: bool = False, offset: int = 0, limit: int = 999, filter: str = None
+        self,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        filter: str = None,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
     ) -> list[NetworkObjectModel]:
         """
         :param expanded: Return additional details about the object
         :param offset: start on the nth record (useful for paging)
-        :param limit: the maximum number of objects to return (useful for paging)
+        :param limit: the number of objects to request per page. Every page is returned
         :param filter: search for name and value  "unusedOnly:true" or "nameOrValue:[search str]"
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
         :return: list of NetworkObjectModel objects (see models.py)
         :rtype: list
         """
-        net_objs_list = self.get(
+        return self._get_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networks",
+            NetworkObjectModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded, "filter": filter},
+            max_workers=max_workers,
+            raw=raw,
+            trusted=trusted,
+        )
+
+    def iter_network_objects(
+        self,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        filter: str = None,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> Iterator[NetworkObjectModel]:
+        """
+        Stream the network objects one page at a time rather than building the full list in memory
+        :param expanded: Return additional details about the object
+        :param offset: start on the nth record
+        :param limit: the number of objects to request per page
+        :param filter: search for name and value  "unusedOnly:true" or "nameOrValue:[search str]"
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: iterator of NetworkObjectModel objects (see models.py)
+        :rtype: Iterator[NetworkObjectModel]
+        """
+        yield from self._iter_list(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networks",
+            NetworkObjectModel,
             params={"offset": offset, "limit": limit, "expanded": expanded, "filter": filter},
+            raw=raw,
+            trusted=trusted,
         )
-        if "items" in net_objs_list:
-            return_data = [NetworkObjectModel(**net_obj) for net_obj in net_objs_list["items"]]
-            if net_objs_list["paging"]["pages"] > 1:  # There could be many pages of data
-                paged_data = self._get_all_pages(net_objs_list["paging"])
-                return_data.extend([NetworkObjectModel(**net_obj) for net_obj in paged_data])
-            return return_data
 
-    def get_network_object(self, net_obj_id: str, override_target_id: str = None) -> NetworkObjectModel:
+    def get_network_object(
+        self, net_obj_id: str, override_target_id: str = None, raw: bool = False, trusted: bool = False
+    ) -> NetworkObjectModel:
         """
         :param net_obj_id: the id of the network object we are to retrieve
+        :param raw: return the plain dictionary from the API rather than a model
+        :param trusted: build the model without validation (Model.construct) as the data comes from the CSFMC
         :return: the network object
         :rtype: NetworkObjectModel
         """
-        return NetworkObjectModel(
-            **self.get(
+        return self._build_model(
+            NetworkObjectModel,
+            self.get(
                 f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networks/{net_obj_id}",
                 params={"overrideTargetId": override_target_id},
-            )
+            ),
+            raw=raw,
+            trusted=trusted,
         )
 
     def create_network_object(self, network_object: NetworkObjectModel) -> NetworkObjectModel:
@@ -49,28 +108,35 @@ class NetworkObjects:
         :return: NetworkObjectModel object
         :rtype: NetworkObjectModel
         """
-        return NetworkObjectModel(
+        new_network_obj = NetworkObjectModel(
             **self.post(
                 f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networks",
                 params={"bulk": False},
-                data=network_object.dict(exclude_unset=True),
+                data=encode_object(network_object),
             )
         )
+        self._index_objects([new_network_obj])
+        return new_network_obj
 
-    def create_bulk_network_objects(self, network_object_list: list) -> list[NetworkObjectModel]:
+    def create_bulk_network_objects(
+        self, network_object_list: list, chunk_size: int = None, isolate_failures: bool = False
+    ) -> Union[list[NetworkObjectModel], BulkResultModel]:
         """
         :network_object_list: A list of the NetworkObjectModel objects we wish to create
-        :return: a list of NetworkObjectModel
-        :rtype: list[NetworkObjectModel]
+        :param chunk_size: optional maximum number of objects per request
+        :param isolate_failures: isolate duplicate or invalid objects rather than raising, and return a BulkResultModel
+        :return: a list of NetworkObjectModel, or a BulkResultModel when isolate_failures is True
+        :rtype: list[NetworkObjectModel] or BulkResultModel
         """
-        serializable_network_objs = self._serialize_objects(network_object_list)
-        new_network_objs = self.post(
-            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networks",
-            params={"bulk": True},
-            data=serializable_network_objs,
+        return self._index_objects(
+            self._bulk_create(
+                f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networks",
+                network_object_list,
+                NetworkObjectModel,
+                chunk_size=chunk_size,
+                isolate_failures=isolate_failures,
+            )
         )
-        if "items" in new_network_objs:
-            return [NetworkObjectModel(**network_obj) for network_obj in new_network_objs["items"]]
 
     def update_network_object(self, network_object: NetworkObjectModel) -> NetworkObjectModel:
         """
@@ -78,57 +144,137 @@ class NetworkObjects:
         :return: The Modified NetworkObject
         :rtype: NetworkObjectModel
         """
-        network_object.metadata = None
-        return NetworkObjectModel(
+        updated_network_obj = NetworkObjectModel(
             **self.put(
                 f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networks/{network_object.id}",
-                data=network_object.dict(exclude_unset=True),
+                data=encode_object(network_object),
+            )
+        )
+        self._index_objects([updated_network_obj])
+        return updated_network_obj
+
+    def update_bulk_network_objects(
+        self, network_object_list: list, chunk_size: int = None
+    ) -> list[NetworkObjectModel]:
+        """
+        :network_object_list: A list of the modified NetworkObjectModel objects, each with its id
+        :param chunk_size: optional maximum number of objects per request
+        :return: a list of the modified NetworkObjectModel
+        :rtype: list[NetworkObjectModel]
+        """
+        return self._index_objects(
+            self._bulk_update(
+                f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networks",
+                network_object_list,
+                NetworkObjectModel,
+                chunk_size=chunk_size,
             )
         )
 
+    def delete_bulk_network_objects(self, net_obj_ids: list, chunk_size: int = None) -> list[NetworkObjectModel]:
+        """
+        :param net_obj_ids: list of the ids of the network objects to delete
+        :param chunk_size: optional maximum number of ids per request
+        :return: a list of the deleted NetworkObjectModel
+        :rtype: list[NetworkObjectModel]
+        """
+        deleted_network_objs = self._bulk_delete(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networks",
+            net_obj_ids,
+            NetworkObjectModel,
+            chunk_size=chunk_size,
+        )
+        self._unindex_objects(net_obj_ids)
+        return deleted_network_objs
+
     def delete_network_object(self, net_obj_id: str) -> NetworkObjectModel:
         """
         :net_obj_id: The id of the NetworkObject we wish to delete
         :return: The NetworkObject that was just deleted
         :rtype: NetworkObjectModel
         """
-        return NetworkObjectModel(
+        deleted_network_obj = NetworkObjectModel(
             **self.delete(f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networks/{net_obj_id}")
         )
+        self._unindex_objects([net_obj_id])
+        return deleted_network_obj
 
     def get_host_objects_list(
-        self, expanded: bool = False, offset: int = 0, limit: int = 999, filter: str = None
+        self,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        filter: str = None,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
     ) -> list[HostObjectModel]:
         """
         :param expanded: Return additional details about the object
         :param offset: start on the nth record (useful for paging)
-        :param limit: the maximum number of objects to return (useful for paging)
+        :param limit: the number of objects to request per page. Every page is returned
         :param filter: search for name and value  "unusedOnly:true" or "nameOrValue:[search str]"
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
         :return: list of HostObjectModel objects (see models.py)
         :rtype: list[HostObjectModel]
         """
-        host_objs = self.get(
+        return self._get_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/hosts",
+            HostObjectModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded, "filter": filter},
+            max_workers=max_workers,
+            raw=raw,
+            trusted=trusted,
+        )
+
+    def iter_host_objects(
+        self,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        filter: str = None,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> Iterator[HostObjectModel]:
+        """
+        Stream the host objects one page at a time rather than building the full list in memory
+        :param expanded: Return additional details about the object
+        :param offset: start on the nth record
+        :param limit: the number of objects to request per page
+        :param filter: search for name and value  "unusedOnly:true" or "nameOrValue:[search str]"
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: iterator of HostObjectModel objects (see models.py)
+        :rtype: Iterator[HostObjectModel]
+        """
+        yield from self._iter_list(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/hosts",
+            HostObjectModel,
             params={"offset": offset, "limit": limit, "expanded": expanded, "filter": filter},
+            raw=raw,
+            trusted=trusted,
         )
-        if "items" in host_objs:
-            return_data = [HostObjectModel(**host_object) for host_object in host_objs["items"]]
-            if host_objs["paging"]["pages"] > 1:  # There could be many pages of data
-                paged_data = self._get_all_pages(host_objs["paging"])
-                return_data.extend([HostObjectModel(**host_object) for host_object in paged_data])
-            return return_data
 
-    def get_host_object(self, host_obj_id: str, override_target_id: str = None) -> HostObjectModel:
+    def get_host_object(
+        self, host_obj_id: str, override_target_id: str = None, raw: bool = False, trusted: bool = False
+    ) -> HostObjectModel:
         """
         :param override_target_id: Retrieves the override(s) associated with the host object on given target ID.
+        :param raw: return the plain dictionary from the API rather than a model
+        :param trusted: build the model without validation (Model.construct) as the data comes from the CSFMC
         :return: host object with the given id
         :rtype: HostObjectModel
         """
-        return HostObjectModel(
-            **self.get(
+        return self._build_model(
+            HostObjectModel,
+            self.get(
                 f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/hosts/{host_obj_id}",
                 params={"overrideTargetId": override_target_id},
-            )
+            ),
+            raw=raw,
+            trusted=trusted,
         )
 
     def create_host_object(self, host_object: HostObjectModel) -> HostObjectModel:
@@ -137,29 +283,35 @@ class NetworkObjects:
         :return: HostObjectModel object
         :rtype: HostObjectModel
         """
-        host_object.metadata = None
-        return HostObjectModel(
+        new_host_obj = HostObjectModel(
             **self.post(
                 f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/hosts",
                 params={"bulk": False},
-                data=host_object.dict(exclude_unset=True),
+                data=encode_object(host_object),
             )
         )
+        self._index_objects([new_host_obj])
+        return new_host_obj
 
-    def create_bulk_host_objects(self, host_object_list: list) -> list[HostObjectModel]:
+    def create_bulk_host_objects(
+        self, host_object_list: list, chunk_size: int = None, isolate_failures: bool = False
+    ) -> Union[list[HostObjectModel], BulkResultModel]:
         """
         :network_object_list: A list of the HostObjectModel objects we wish to create
-        :return: a list of HostObjectModel
-        :rtype: list[HostObjectModel]
+        :param chunk_size: optional maximum number of objects per request
+        :param isolate_failures: isolate duplicate or invalid objects rather than raising, and return a BulkResultModel
+        :return: a list of HostObjectModel, or a BulkResultModel when isolate_failures is True
+        :rtype: list[HostObjectModel] or BulkResultModel
         """
-        serializable_host_objs = self._serialize_objects(host_object_list)
-        new_host_objs = self.post(
-            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/hosts",
-            params={"bulk": "true"},
-            data=serializable_host_objs,
+        return self._index_objects(
+            self._bulk_create(
+                f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/hosts",
+                host_object_list,
+                HostObjectModel,
+                chunk_size=chunk_size,
+                isolate_failures=isolate_failures,
+            )
         )
-        if "items" in new_host_objs:
-            return [HostObjectModel(**host_obj) for host_obj in new_host_objs["items"]]
 
     def update_host_object(self, host_object: HostObjectModel) -> HostObjectModel:
         """
@@ -167,74 +319,232 @@ class NetworkObjects:
         :return: The Modified HostObjectModel
         :rtype: HostObjectModel
         """
-        host_object.metadata = None
-        return HostObjectModel(
+        updated_host_obj = HostObjectModel(
             **self.put(
                 f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/hosts/{host_object.id}",
-                data=host_object.dict(exclude_unset=True),
+                data=encode_object(host_object),
+            )
+        )
+        self._index_objects([updated_host_obj])
+        return updated_host_obj
+
+    def update_bulk_host_objects(self, host_object_list: list, chunk_size: int = None) -> list[HostObjectModel]:
+        """
+        :host_object_list: A list of the modified HostObjectModel objects, each with its id
+        :param chunk_size: optional maximum number of objects per request
+        :return: a list of the modified HostObjectModel
+        :rtype: list[HostObjectModel]
+        """
+        return self._index_objects(
+            self._bulk_update(
+                f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/hosts",
+                host_object_list,
+                HostObjectModel,
+                chunk_size=chunk_size,
             )
         )
 
+    def delete_bulk_host_objects(self, host_obj_ids: list, chunk_size: int = None) -> list[HostObjectModel]:
+        """
+        :param host_obj_ids: list of the ids of the host objects to delete
+        :param chunk_size: optional maximum number of ids per request
+        :return: a list of the deleted HostObjectModel
+        :rtype: list[HostObjectModel]
+        """
+        deleted_host_objs = self._bulk_delete(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/hosts",
+            host_obj_ids,
+            HostObjectModel,
+            chunk_size=chunk_size,
+        )
+        self._unindex_objects(host_obj_ids)
+        return deleted_host_objs
+
     def delete_host_object(self, host_obj_id: str) -> HostObjectModel:
         """
         :host_obj_id: The id of the HostObjectModel we wish to delete
         :return: The HostObjectModel that was just deleted
         :rtype: HostObjectModel
         """
-        return HostObjectModel(
+        deleted_host_obj = HostObjectModel(
             **self.delete(f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/hosts/{host_obj_id}")
         )
+        self._unindex_objects([host_obj_id])
+        return deleted_host_obj
+
+    def get_range_objects_list(
+        self,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        filter: str = None,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> list[RangeObjectModel]:
+        """
+        :param expanded: Return additional details about the object
+        :param offset: start on the nth record (useful for paging)
+        :param limit: the number of objects to request per page. Every page is returned
+        :param filter: search for name and value  "unusedOnly:true" or "nameOrValue:[search str]"
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: list of RangeObjectModel objects (see models.py)
+        :rtype: list[RangeObjectModel]
+        """
+        return self._get_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/ranges",
+            RangeObjectModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded, "filter": filter},
+            max_workers=max_workers,
+            raw=raw,
+            trusted=trusted,
+        )
+
+    def iter_range_objects(
+        self,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        filter: str = None,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> Iterator[RangeObjectModel]:
+        """
+        Stream the range objects one page at a time rather than building the full list in memory
+        :param expanded: Return additional details about the object
+        :param offset: start on the nth record
+        :param limit: the number of objects to request per page
+        :param filter: search for name and value  "unusedOnly:true" or "nameOrValue:[search str]"
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: iterator of RangeObjectModel objects (see models.py)
+        :rtype: Iterator[RangeObjectModel]
+        """
+        yield from self._iter_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/ranges",
+            RangeObjectModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded, "filter": filter},
+            raw=raw,
+            trusted=trusted,
+        )
 
     def get_network_groups_list(
-        self, expanded: bool = False, offset: int = 0, limit: int = 999, filter: str = None
+        self,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        filter: str = None,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
     ) -> list[NetworkGroupModel]:
         """
         :param expanded: Return additional details about the object groups
         :param offset: start on the nth record (useful for paging)
-        :param limit: the maximum number of groups to return (useful for paging)
+        :param limit: the number of groups to request per page. Every page is returned
         :param filter: search for name and value  "unusedOnly:true" or "nameOrValue:[search str]"
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
         :return: list of NetworkGroupModel objects (see models.py)
         :rtype: list[NetworkGroupModel]
         """  # /api/fmc_config/v1
-        network_grps_list = self.get(
+        return self._get_list(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networkgroups",
+            NetworkGroupModel,
             params={"offset": offset, "limit": limit, "expanded": expanded, "filter": filter},
+            max_workers=max_workers,
+            raw=raw,
+            trusted=trusted,
         )
-        if "items" in network_grps_list:
-            return_data = [NetworkGroupModel(**network_grp) for network_grp in network_grps_list["items"]]
-            if network_grps_list["paging"]["pages"] > 1:  # There could be many pages of data
-                paged_data = self._get_all_pages(network_grps_list["paging"])
-                return_data.extend([NetworkGroupModel(**net_grp) for net_grp in paged_data])
-            return return_data
 
-    def get_network_group(self, network_group_id: str, override_target_id: str = None) -> NetworkGroupModel:
+    def iter_network_groups(
+        self,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        filter: str = None,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> Iterator[NetworkGroupModel]:
+        """
+        Stream the network groups one page at a time rather than building the full list in memory
+        :param expanded: Return additional details about the object
+        :param offset: start on the nth record
+        :param limit: the number of objects to request per page
+        :param filter: search for name and value  "unusedOnly:true" or "nameOrValue:[search str]"
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: iterator of NetworkGroupModel objects (see models.py)
+        :rtype: Iterator[NetworkGroupModel]
+        """
+        yield from self._iter_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networkgroups",
+            NetworkGroupModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded, "filter": filter},
+            raw=raw,
+            trusted=trusted,
+        )
+
+    def get_network_group(
+        self, network_group_id: str, override_target_id: str = None, raw: bool = False, trusted: bool = False
+    ) -> NetworkGroupModel:
         """
         :param network_group_id: the id of the network group to return
         :param override_target_id: Retrieves the override(s) associated with the host object on given target ID.
+        :param raw: return the plain dictionary from the API rather than a model
+        :param trusted: build the model without validation (Model.construct) as the data comes from the CSFMC
         :return: newtwork group with the given id
         :rtype: NetworkGroupModel
         """
-        return NetworkGroupModel(
-            **self.get(
+        return self._build_model(
+            NetworkGroupModel,
+            self.get(
                 f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networkgroups/{network_group_id}",
                 params={"overrideTargetId": override_target_id},
-            )
+            ),
+            raw=raw,
+            trusted=trusted,
         )
 
     def create_network_group(self, network_grp: NetworkGroupModel) -> NetworkGroupModel:
         """
+        When a network object index has been built, members given only by name (or value) are resolved against it
+        rather than looked up through the API.
         :network_grp: The NetworkGroupModel object we wish to create
         :return: NetworkGroupModel object
         :rtype: NetworkGroupModel
         """
-        # For network groups we only need the object ID and type. Minimize those objects to bare essentials.
-        if network_grp.objects:
-            network_grp.objects = self._minimize_objects(network_grp.objects)
-
-        return NetworkGroupModel(
+        new_network_grp = NetworkGroupModel(
             **self.post(
                 f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networkgroups",
-                data=network_grp.dict(exclude_unset=True),
+                data=encode_object(self._minimize_group(network_grp)),
+            )
+        )
+        self._index_objects([new_network_grp])
+        return new_network_grp
+
+    def create_bulk_network_groups(
+        self, network_grp_list: list, chunk_size: int = None, isolate_failures: bool = False
+    ) -> Union[list[NetworkGroupModel], BulkResultModel]:
+        """
+        Groups may only reference objects that already exist, so nested groups must be created in a later call than
+        the groups they contain.
+        :network_grp_list: A list of the NetworkGroupModel objects we wish to create
+        :param chunk_size: optional maximum number of objects per request
+        :param isolate_failures: isolate duplicate or invalid groups rather than raising, and return a BulkResultModel
+        :return: a list of NetworkGroupModel, or a BulkResultModel when isolate_failures is True
+        :rtype: list[NetworkGroupModel] or BulkResultModel
+        """
+        return self._index_objects(
+            self._bulk_create(
+                f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networkgroups",
+                [self._minimize_group(network_grp) for network_grp in network_grp_list],
+                NetworkGroupModel,
+                chunk_size=chunk_size,
+                isolate_failures=isolate_failures,
             )
         )
 
@@ -244,15 +554,14 @@ class NetworkObjects:
         :return: NetworkGroupModel object
         :rtype: NetworkGroupModel
         """
-        # For network groups we only need the object ID and type. Minimize those objects to bare essentials.
-        network_grp.objects = self._minimize_objects(network_grp.objects)
-
-        return NetworkGroupModel(
+        updated_network_grp = NetworkGroupModel(
             **self.put(
                 f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networkgroups/{network_grp.id}",
-                data=network_grp.dict(exclude_unset=True),
+                data=encode_object(self._minimize_group(network_grp)),
             )
         )
+        self._index_objects([updated_network_grp])
+        return updated_network_grp
 
     def delete_network_group(self, network_group_id: str) -> NetworkGroupModel:
         """
@@ -260,35 +569,337 @@ class NetworkObjects:
         :return: NetworkGroupModel of the group we deleted
         :rtype: NetworkGroupModel
         """
-        return NetworkGroupModel(
+        deleted_network_grp = NetworkGroupModel(
             **self.delete(
                 f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/networkgroups/{network_group_id}",
             )
         )
+        self._unindex_objects([network_group_id])
+        return deleted_network_grp
+
+    def build_network_object_index(self, max_workers: int = 1) -> NetworkObjectIndex:
+        """
+        Sweep every host, network, range and network group once and index them by id, name and value. The index is
+        kept on the client and updated by our own create, update and delete calls, so it stays current without
+        re-fetching.
+        :param max_workers: fetch the pages of each object type concurrently using up to this many threads
+        :return: the NetworkObjectIndex (also stored as self.network_object_index)
+        :rtype: NetworkObjectIndex
+        """
+        index = NetworkObjectIndex()
+        object_lists = (
+            self.get_host_objects_list,
+            self.get_network_objects_list,
+            self.get_range_objects_list,
+            self.get_network_groups_list,
+        )
+        for get_objects_list in object_lists:
+            for obj in get_objects_list(expanded=True, max_workers=max_workers):
+                index.add(obj)
+        self.network_object_index = index
+        return index
 
-    def _get_all_pages(self, paging: dict) -> list:
+    def build_ip_prefix_index(self, max_workers: int = 1) -> IPPrefixIndex:
         """
-        Given returned dataset paging information, extract the remaining pages of data from the API
-        :param paging: The paging data returned by the CSFMC API
-        :return: a list of network objects (Could be HostObjectModel, NetworkObjectModel, NetworkGroupModel
+        Index every host, network, range and network group by the IP prefixes it covers (groups through their members
+        and literals) for containment, longest-prefix and overlap queries. Also refreshes self.network_object_index.
+        Like the object index, it is kept on the client and updated by our own create, update and delete calls.
+        :param max_workers: fetch the pages of each object type concurrently using up to this many threads
+        :return: IPPrefixIndex of the objects (also stored as self.ip_prefix_index)
+        :rtype: IPPrefixIndex
+        """
+        self.ip_prefix_index = IPPrefixIndex(self.build_network_object_index(max_workers=max_workers))
+        return self.ip_prefix_index
+
+    def get_network_inventory(self, filter: str = None, limit: int = 999) -> NetworkObjectTable:
+        """
+        Stream every host and network object into a compact NetworkObjectTable. The raw records are consumed one page
+        at a time and never turned into models, so inventories of hundreds of thousands of objects fit in memory.
+        :param filter: search for name and value  "unusedOnly:true" or "nameOrValue:[search str]"
+        :param limit: the number of objects to request per page
+        :return: NetworkObjectTable of the host and network objects
+        :rtype: NetworkObjectTable
+        """
+        table = NetworkObjectTable()
+        for iter_objects in (self.iter_host_objects, self.iter_network_objects):
+            table.extend(iter_objects(expanded=True, limit=limit, filter=filter, raw=True))
+        return table
+
+    def sync_network_objects(self, desired: list, prune: bool = False, max_workers: int = 1) -> SyncResultModel:
+        """
+        Make the host, network and network group objects on the CSFMC match a desired state with as few API calls as
+        possible. The current state is fetched once and diffed by type and name on value, description, members and
+        literals (only the fields set on the desired objects are compared). New hosts and networks are created in
+        bulk before the groups that reference them, changed objects are updated, and with prune=True the objects that
+        are not in the desired state are deleted, groups before their members. Read only objects are never modified.
+        :param desired: list of HostObjectModel, NetworkObjectModel and NetworkGroupModel objects. Group members may
+                        be given by name and type rather than id
+        :param prune: delete the host, network and group objects that are not in the desired state
+        :param max_workers: fetch the pages of the current state concurrently using up to this many threads
+        :return: SyncResultModel listing what was created, updated, deleted, unchanged and skipped
+        :rtype: SyncResultModel
+        :raises DependencyCycle: if the desired groups contain each other in a cycle. Nothing is changed.
+        :raises ValueError: if two groups share a name or id
+        """
+        desired = list(desired)
+        self._group_levels([obj for obj in desired if obj.type.lower() == "networkgroup"])  # Fail before any change
+        index = self.build_network_object_index(max_workers=max_workers)
+        current = {self._sync_key(obj): obj for obj in index}
+        result = SyncResultModel()
+        creates, updates, desired_keys = {}, {}, set()
+        for want in desired:
+            key = self._sync_key(want)
+            if key[0] not in self.SYNC_TYPES:
+                log.warning(f"sync_network_objects does not manage {want.type} objects. Skipping {want.name}...")
+                continue
+            desired_keys.add(key)
+            have = current.get(key)
+            if have is None:
+                creates.setdefault(key[0], []).append(want)
+                continue
+            changes = self._sync_changes(want, have)
+            if not changes:
+                result.unchanged.append(have)
+            elif self._is_read_only(have):
+                log.warning(f"{have.name} is read only and can not be updated. Skipping...")
+                result.skipped.append(have)
+            else:
+                updates.setdefault(key[0], []).append(have.copy(update=changes))
+
+        # Members before the groups that contain them
+        result.created.extend(self.create_bulk_host_objects(creates.get("host", [])))
+        result.created.extend(self.create_bulk_network_objects(creates.get("network", [])))
+        result.created.extend(self.create_network_groups(creates.get("networkgroup", [])))
+
+        result.updated.extend(self.update_bulk_host_objects(updates.get("host", [])))
+        result.updated.extend(self.update_bulk_network_objects(updates.get("network", [])))
+        result.updated.extend(self.update_network_group(network_grp) for network_grp in updates.get("networkgroup", []))
+
+        if prune:
+            # Groups before the members they contain
+            stale = [obj for key, obj in current.items() if key not in desired_keys and not self._is_read_only(obj)]
+            stale_by_type = {
+                obj_type: [obj for obj in stale if obj.type.lower() == obj_type] for obj_type in self.SYNC_TYPES
+            }
+            result.deleted.extend(self.delete_network_groups(stale_by_type["networkgroup"], max_workers=max_workers))
+            result.deleted.extend(self.delete_bulk_host_objects([obj.id for obj in stale_by_type["host"]]))
+            result.deleted.extend(self.delete_bulk_network_objects([obj.id for obj in stale_by_type["network"]]))
+        return result
+
+    def create_network_groups(
+        self, network_grp_list: list, bulk: bool = True, max_workers: int = 1
+    ) -> list[NetworkGroupModel]:
+        """
+        Create network groups that may contain one another. The groups are ordered into dependency levels so that
+        every group is created after the groups it contains, and each level is created with one bulk call (or in
+        parallel). Members that are new groups may be given by name; they are filled in as each level is created.
+        :param network_grp_list: list of the NetworkGroupModel objects to create
+        :param bulk: create each level with bulk posts, otherwise with one post per group
+        :param max_workers: when not using bulk posts, create each level using up to this many threads
+        :return: list of the NetworkGroupModel objects created, ordered by level
+        :rtype: list[NetworkGroupModel]
+        :raises DependencyCycle: if the groups contain each other in a cycle. Nothing is created.
+        :raises ValueError: if two groups share a name or id
+        """
+        created = []
+        created_by_name = {}
+        for level in self._group_levels(network_grp_list):
+            level = [self._with_created_members(network_grp, created_by_name) for network_grp in level]
+            if bulk:
+                new_network_grps = self.create_bulk_network_groups(level)
+            else:
+                new_network_grps = self._map_concurrently(self.create_network_group, level, max_workers)
+            created_by_name.update({network_grp.name: network_grp for network_grp in new_network_grps})
+            created.extend(new_network_grps)
+        return created
+
+    def delete_network_groups(self, network_grp_list: list, max_workers: int = 1) -> list[NetworkGroupModel]:
+        """
+        Delete network groups that may contain one another. Each group is deleted before the groups it contains, so
+        the CSFMC never refuses a delete with ObjectDeletionRestricted, and each level is deleted in parallel.
+        :param network_grp_list: list of the NetworkGroupModel objects to delete, with their objects (expanded=True)
+        :param max_workers: delete each level using up to this many threads
+        :return: list of the NetworkGroupModel objects deleted
+        :rtype: list[NetworkGroupModel]
+        :raises DependencyCycle: if the groups contain each other in a cycle. Nothing is deleted.
+        :raises ValueError: if two groups share a name or id
+        """
+        deleted = []
+        for level in reversed(self._group_levels(network_grp_list)):
+            network_grp_ids = [network_grp.id for network_grp in level]
+            deleted.extend(self._map_concurrently(self.delete_network_group, network_grp_ids, max_workers))
+        return deleted
+
+    @staticmethod
+    def _with_created_members(network_grp: NetworkGroupModel, created_by_name: dict) -> NetworkGroupModel:
+        """
+        :param network_grp: a NetworkGroupModel that may contain new groups given only by name
+        :param created_by_name: the groups created so far, by name
+        :return: a copy of the group with those members replaced by the created groups
+        :rtype: NetworkGroupModel
+        """
+        if not network_grp.objects:
+            return network_grp
+        objects = [
+            created_by_name.get(obj.name, obj) if not obj.id and NetworkObjects._is_group_ref(obj) else obj
+            for obj in network_grp.objects
+        ]
+        return network_grp.copy(update={"objects": objects})
+
+    @staticmethod
+    def _is_group_ref(obj: object) -> bool:
+        """
+        :param obj: a group member. Members given without a type are assumed to be groups
+        :return: True if the member refers to a network group, whatever the case of its type
+        :rtype: bool
+        """
+        return (obj.type or "networkgroup").lower() == "networkgroup"
+
+    def _group_levels(self, network_grp_list: list) -> list[list[NetworkGroupModel]]:
+        """
+        :param network_grp_list: list of NetworkGroupModel objects
+        :return: the groups ordered into levels, each group only containing groups from earlier levels
+        :rtype: list[list[NetworkGroupModel]]
+        :raises DependencyCycle: if the groups contain each other in a cycle
+        :raises ValueError: if two groups share a name or id
+        """
+        return dependency_levels(
+            network_grp_list,
+            lambda network_grp: (network_grp.id, network_grp.name),
+            lambda network_grp: [
+                ref
+                for obj in network_grp.objects or []
+                if self._is_group_ref(obj)
+                for ref in (obj.id, obj.name)
+                if ref
+            ],
+        )
+
+    def _sync_changes(self, want: object, have: object) -> dict:
+        """
+        :param want: the desired HostObjectModel, NetworkObjectModel or NetworkGroupModel
+        :param have: the matching object currently on the CSFMC
+        :return: the fields set on the desired object whose values differ from the current object
+        :rtype: dict
+        """
+        changes = {}
+        fields_set = want.__fields_set__
+        for field in ("value", "description"):
+            if field in fields_set and getattr(want, field) != getattr(have, field, None):
+                changes[field] = getattr(want, field)
+        if "objects" in fields_set and self._member_keys(want.objects) != self._member_keys(have.objects):
+            changes["objects"] = want.objects
+        if "literals" in fields_set and self._literal_keys(want.literals) != self._literal_keys(have.literals):
+            changes["literals"] = want.literals
+        return changes
+
+    def _member_keys(self, obj_list: list) -> set:
+        """
+        :param obj_list: the objects of a network group, given by id or by name and type
+        :return: the ids of the members, or "type:name" for members that do not exist yet
+        :rtype: set
+        """
+        keys = set()
+        for obj in obj_list or []:
+            found = self.network_object_index.resolve(obj)
+            keys.add(found.id if found is not None else f"{obj.type}:{obj.name}".lower())
+        return keys
+
+    @staticmethod
+    def _literal_keys(literals: list) -> set:
+        """
+        :param literals: the literals of a network group. e.g. [{"type": "Host", "value": "192.168.1.1"}]
+        :return: the (type, value) of each literal
+        :rtype: set
+        """
+        return {(literal.get("type", "").lower(), literal.get("value")) for literal in literals or []}
+
+    @staticmethod
+    def _sync_key(obj: object) -> tuple:
+        return obj.type.lower(), obj.name
+
+    @staticmethod
+    def _is_read_only(obj: object) -> bool:
+        """
+        :param obj: a HostObjectModel, NetworkObjectModel or NetworkGroupModel returned by the CSFMC
+        :return: True if the CSFMC marks the object read only (system defined objects for example)
+        :rtype: bool
+        """
+        read_only = (obj.metadata or {}).get("readOnly")
+        return read_only.get("state", False) if isinstance(read_only, dict) else bool(read_only)
+
+    def _index_objects(self, objs: Union[list, BulkResultModel]) -> Union[list, BulkResultModel]:
+        """
+        Add newly created or modified objects to the network object and IP prefix indexes, if they have been built
+        :param objs: list of HostObjectModel, NetworkObjectModel or NetworkGroupModel objects, or a BulkResultModel
+        :return: the same list of objects (or BulkResultModel)
+        :rtype: list or BulkResultModel
+        """
+        created = objs.created if isinstance(objs, BulkResultModel) else objs
+        for index in (self.network_object_index, self.ip_prefix_index):
+            if index is not None:
+                for obj in created:
+                    index.add(obj)
+        self._resolve_route_tables([obj.id for obj in created])
+        return objs
+
+    def _unindex_objects(self, obj_ids: list) -> None:
+        """
+        Remove deleted objects from the network object and IP prefix indexes, if they have been built
+        :param obj_ids: the ids of the objects that were deleted
+        """
+        for index in (self.network_object_index, self.ip_prefix_index):
+            if index is not None:
+                for obj_id in obj_ids:
+                    index.remove(obj_id)
+        self._resolve_route_tables(obj_ids)
+
+    def _resolve_route_tables(self, obj_ids: list) -> None:
+        """
+        Resolve the routes of the cached route tables (see StaticRoutes.get_route_table) that select a changed object,
+        or a group containing it, against the IP prefix index again
+        :param obj_ids: the ids of the objects that were created, modified or deleted
+        """
+        if self.ip_prefix_index is None:
+            return
+        changed = set(obj_ids)
+        for obj_id in obj_ids:
+            changed.update(self.ip_prefix_index.groups_containing(obj_id))
+        for route_table in (getattr(self, "route_tables", None) or {}).values():
+            if route_table.prefix_index is self.ip_prefix_index:
+                route_table.resolve(self.ip_prefix_index, changed)
+
+    def _resolve_members(self, obj_list: list) -> list:
+        """
+        Fill in the id of group members that were given by name or value using the network object index
+        :param obj_list: List of network, host, or network group objects (or partial references to them)
+        :return: the list of members, resolved where possible
         :rtype: list
         """
-        return_data = []
-        for api_call in paging["next"]:
-            url_p = urlparse(api_call)
-            query_p = dict(parse_qsl(url_p.query))
-            net_objs = self.get(
-                f"{url_p.path}",
-                params={
-                    "offset": query_p.get("offset"),
-                    "limit": query_p.get("limit"),
-                    "expanded": query_p.get("expanded"),
-                    "filter": query_p.get("filter"),
-                },
-            )
-            if "items" in net_objs:
-                return_data.extend(net_objs["items"])
-        return return_data
+        if self.network_object_index is None or not obj_list:
+            return obj_list
+        resolved = []
+        for obj in obj_list:
+            if not obj.id:
+                found = self.network_object_index.resolve(obj)
+                if found is None:
+                    log.warning(f"Unable to resolve group member {obj.name} from the network object index")
+                else:
+                    obj = found
+            resolved.append(obj)
+        return resolved
+
+    def _minimize_group(self, network_grp: NetworkGroupModel) -> NetworkGroupModel:
+        """
+        For network groups we only need the object ID and type. Return a copy of the group with its objects minimized
+        to those bare essentials (resolving them first if needed), leaving the caller's group untouched.
+        :param network_grp: The NetworkGroupModel we wish to send to the CSFMC
+        :return: a copy of the group ready to serialize
+        :rtype: NetworkGroupModel
+        """
+        if not network_grp.objects:
+            return network_grp
+        return network_grp.copy(update={"objects": self._minimize_objects(self._resolve_members(network_grp.objects))})
 
     def _minimize_objects(self, obj_list: list) -> list[INetworkAddress]:
         """
@@ -0,0 +1,92 @@
+import time
+import asyncio
+import logging
+import threading
+
+log = logging.getLogger(__name__)
+
+# The CSFMC allows 120 API calls per minute from a single source IP address
+FMC_REQUESTS_PER_MINUTE = 120
+FMC_BURST = 10
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket used to pace API calls before they leave the client so that we stay under the CSFMC
+    rate limit rather than reacting to 429 errors. The bucket holds up to `burst` tokens and refills at a rate that
+    keeps the total number of calls in any 60 second window at or below `requests_per_minute`.
+    """
+
+    def __init__(self, requests_per_minute: int = FMC_REQUESTS_PER_MINUTE, burst: int = FMC_BURST) -> None:
+        """
+        :param requests_per_minute: the maximum number of API calls allowed in any 60 second window
+        :param burst: the number of API calls that may be sent back to back before pacing kicks in
+        """
+        self.requests_per_minute = requests_per_minute
+        self.burst = min(burst, requests_per_minute - 1)
+        self.rate = (requests_per_minute - self.burst) / 60.0  # tokens added per second
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take a token from the bucket, sleeping until one is available. Callers reserve their token under the lock and
+        sleep outside of it, so waiting threads are released in the order they arrived.
+        :return: the number of seconds we waited for a token
+        :rtype: float
+        """
+        wait = self._reserve()
+        if wait:
+            log.debug(f"Rate limiter pausing for {wait:.2f} seconds")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """
+        Take a token from the bucket like acquire(), but wait for it with asyncio.sleep so the event loop keeps running.
+        The token is reserved before waiting, so coroutines and threads drawing from the same bucket never share one.
+        :return: the number of seconds we waited for a token
+        :rtype: float
+        """
+        wait = self._reserve()
+        if wait:
+            log.debug(f"Rate limiter pausing for {wait:.2f} seconds")
+            await asyncio.sleep(wait)
+        return wait
+
+    def _reserve(self) -> float:
+        """
+        :return: the number of seconds the caller must wait before using the token it just took
+        :rtype: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(float(self.burst), self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+def get_rate_limiter(
+    host: str, requests_per_minute: int = FMC_REQUESTS_PER_MINUTE, burst: int = FMC_BURST
+) -> TokenBucket:
+    """
+    The CSFMC rate limit is applied per source IP, so every client talking to the same CSFMC must draw from the same
+    bucket. Return the shared bucket for the given host, creating it on first use.
+    :param host: The CSFMC base url (scheme, address and port) the bucket applies to
+    :param requests_per_minute: the maximum number of API calls allowed in any 60 second window
+    :param burst: the number of API calls that may be sent back to back before pacing kicks in
+    :return: The TokenBucket shared by all clients of this CSFMC
+    :rtype: TokenBucket
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = TokenBucket(requests_per_minute, burst)
+        elif limiter.requests_per_minute != requests_per_minute or limiter.burst != min(burst, requests_per_minute - 1):
+            log.warning(f"A rate limiter for {host} already exists. Reusing it with its original settings.")
+        return limiter
@@ -0,0 +1,85 @@
+import random
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+log = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """
+    Opt-in retry policy applied by HTTPWrapper to transient failures (rate limiting, gateway errors and connection
+    resets). Delays grow exponentially and are randomized ("full jitter") so that several workers hitting the same
+    CSFMC do not retry in lockstep. A Retry-After header returned by the CSFMC is always honored.
+    """
+
+    RETRY_STATUSES = (429, 502, 503, 504)
+    IDEMPOTENT_METHODS = ("get", "put", "delete")
+
+    def __init__(
+        self,
+        retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        statuses: tuple = RETRY_STATUSES,
+    ) -> None:
+        """
+        :param retries: the maximum number of times a request is retried
+        :param backoff_base: the delay in seconds before the first retry; doubled on every further attempt
+        :param backoff_max: the upper bound in seconds of any single delay
+        :param statuses: the http status codes that should be retried
+        """
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.statuses = statuses
+
+    def allows(self, method: str, status_code: int = None, retry_safe: bool = False) -> bool:
+        """
+        A 429 means the CSFMC rejected the request before processing it, so it is safe to retry for any verb. Other
+        failures are only retried for idempotent verbs or when the caller has flagged the request as safe to replay.
+        :param method: The http verb of the request. e.g. "get"
+        :param status_code: The http status code returned, or None if the connection failed
+        :param retry_safe: True if the caller has flagged a non idempotent request (POST) as safe to replay
+        :return: True if the request may be retried under this policy
+        :rtype: bool
+        """
+        if status_code is not None and status_code not in self.statuses:
+            return False
+        return status_code == 429 or method.lower() in self.IDEMPOTENT_METHODS or retry_safe
+
+    def backoff(self, attempt: int, retry_after: str = None) -> float:
+        """
+        :param attempt: The number of retries already made for this request (0 for the first retry)
+        :param retry_after: The value of the Retry-After header returned by the CSFMC, if any
+        :return: the number of seconds to wait before retrying
+        :rtype: float
+        """
+        jitter = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+        server_delay = self._parse_retry_after(retry_after)
+        if server_delay is not None:
+            # Never retry sooner than we were told to, but still spread the workers out a little
+            return server_delay + random.uniform(0, self.backoff_base)
+        return jitter
+
+    @staticmethod
+    def _parse_retry_after(retry_after: str) -> float:
+        """
+        :param retry_after: A Retry-After header value, either delta seconds or an http date
+        :return: the number of seconds to wait or None if the header is missing or malformed
+        :rtype: float
+        """
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            log.debug(f"Ignoring malformed Retry-After header: {retry_after}")
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -1,10 +1,12 @@
 import logging
-from pycsfw.models import IPv4StaticRouteModel, NetworkObjectModel, INetworkAddress, StaticRouteModel
+from typing import Iterator, Union
+from pycsfw.common import encode_object
+from pycsfw.index import IPPrefixIndex, RouteTable
+from pycsfw.models import IPv4StaticRouteModel, IPv6StaticRouteModel, StaticRouteModel
 
 log = logging.getLogger(__name__)
 
 
-# TODO: IPv6StaticRoutes
 # TODO: make gateways use the dataclass model
 class StaticRoutes:
     """
@@ -12,62 +14,132 @@ class StaticRoutes:
     search functions based on network and gatway
     """
 
-    def _serialize_object(self, obj: object) -> dict:
-        """
-        Tnere are derrived attributes that should not be presented to the API. Remove them and return a python
-        dictionary representation of the object
-        :param obj: A pydantic dataclass object that we wish to serialize
-        :return: A dictionary representation of the pydantic dataclass object
-        :rtype: dict
-        """
-        obj.metadata = None
-        return obj.dict(exclude_unset=True)
+    route_tables = None  # device uuid -> RouteTable. Filled by get_route_table() and kept current by the methods below
 
     def get_ipv4_static_routes_list(
-        self, device_uuid: str, expanded: bool = True, offset: int = 0, limit: int = 999
+        self,
+        device_uuid: str,
+        expanded: bool = True,
+        offset: int = 0,
+        limit: int = 999,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
     ) -> list[IPv4StaticRouteModel]:
         """
         :param device_uuid: The UUID of the device we are working on
+        :param expanded: Return additional details about the route
+        :param offset: start on the nth record (useful for paging)
+        :param limit: the number of routes to request per page. Every page is returned
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
         :return: list of IPv4StaticRouteModel
         :rtype: list
         """
-        ipv4_static_routes = self.get(
-            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{device_uuid}/routing/ipv4staticroutes",
-            params={"offset": offset, "limit": limit, "expanded": expanded},
+        return self._get_static_routes_list(
+            device_uuid, IPv4StaticRouteModel, expanded, offset, limit, max_workers, raw=raw, trusted=trusted
+        )
+
+    def iter_ipv4_static_routes(
+        self,
+        device_uuid: str,
+        expanded: bool = True,
+        offset: int = 0,
+        limit: int = 999,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> Iterator[IPv4StaticRouteModel]:
+        """
+        Stream the ipv4 static routes of a device one page at a time
+        :param device_uuid: The UUID of the device we are working on
+        :param expanded: Return additional details about the route
+        :param offset: start on the nth record
+        :param limit: the number of routes to request per page
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: iterator of IPv4StaticRouteModel
+        :rtype: Iterator[IPv4StaticRouteModel]
+        """
+        yield from self._iter_static_routes(
+            device_uuid, IPv4StaticRouteModel, expanded, offset, limit, raw=raw, trusted=trusted
         )
-        if "items" in ipv4_static_routes:
-            return [IPv4StaticRouteModel(**static_route) for static_route in ipv4_static_routes["items"]]
 
-    def get_ipv4_static_route(self, device_uuid: str, route_obj_id: str) -> IPv4StaticRouteModel:
+    def get_ipv4_static_route(
+        self, device_uuid: str, route_obj_id: str, raw: bool = False, trusted: bool = False
+    ) -> IPv4StaticRouteModel:
         """
         :param device_uuid: The UUID of the device we are working on
         :param route_obj_id: The UUID of the route object to retrieve
+        :param raw: return the plain dictionary from the API rather than a model
+        :param trusted: build the model without validation (Model.construct) as the data comes from the CSFMC
         :return: IPv4StaticRouteModel object
         :rtype: IPv4StaticRouteModel
         """
-        return IPv4StaticRouteModel(
-            **self.get(
-                f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{device_uuid}/routing/ipv4staticroutes/{route_obj_id}",
-            )
-        )
+        return self._get_static_route(device_uuid, IPv4StaticRouteModel, route_obj_id, raw=raw, trusted=trusted)
 
-    def search_ipv4_static_routes(self, network_host_objs: list = None) -> IPv4StaticRouteModel:
+    def search_ipv4_static_routes(
+        self, device_uuid: str, network_host_objs: list, prefix_index: IPPrefixIndex = None, refresh: bool = False
+    ) -> dict[str, list[IPv4StaticRouteModel]]:
         """
-        Given a network object or host object look for a matching static route
-        :param network_objs: a list of NetworkObjectModel objects
-        :param host_objs: a list of HostObjectModel objects
-        :return: If found, return the IPv4StaticRouteModel object that matches the given hosts or networks
-        :rtype: IPv4StaticRouteModel
+        Given network and host objects look for the static routes that match them. The routes of the device are
+        fetched once and cached (see get_route_table), so any number of objects cost one sweep of the routes.
+        :param device_uuid: The UUID of the device we are working on
+        :param network_host_objs: a list of NetworkObjectModel and HostObjectModel objects
+        :param prefix_index: optional IPPrefixIndex (see build_ip_prefix_index). With it, an object that no route
+                             selects directly is matched to the most specific routes covering its value
+        :param refresh: re-fetch the routes of the device and re-index the ones that were changed elsewhere
+        :return: the matching IPv4StaticRouteModel objects keyed by the id (or name, if it has no id) of each object
+        :rtype: dict[str, list[IPv4StaticRouteModel]]
+        """
+        route_table = self.get_route_table(device_uuid, refresh=refresh, prefix_index=prefix_index)
+        matches = {}
+        for obj in network_host_objs:
+            routes = {route.id: route for key in (obj.id, obj.name) if key for route in route_table.by_network(key)}
+            if not routes and prefix_index is not None and getattr(obj, "value", None):
+                routes = {route.id: route for route in route_table.longest_prefix(obj.value)}
+            matches[obj.id or obj.name] = list(routes.values())
+        return matches
+
+    def get_route_table(
+        self, device_uuid: str, refresh: bool = False, prefix_index: IPPrefixIndex = None, max_workers: int = 1
+    ) -> RouteTable:
+        """
+        Fetch the static routes of a device once and index them by selected network, gateway and interface. The table
+        is cached per device and kept current by our own create, update and delete calls.
+        :param device_uuid: The UUID of the device we are working on
+        :param refresh: re-fetch the routes, re-index the ones that were changed outside of this client and resolve
+                        every route again
+        :param prefix_index: IPPrefixIndex (see build_ip_prefix_index) to resolve the selected networks so the table
+                             can do longest prefix matches
+        :param max_workers: fetch the pages of routes concurrently using up to this many threads
+        :return: the RouteTable of the device
+        :rtype: RouteTable
         """
+        if self.route_tables is None:
+            self.route_tables = {}
+        route_table = self.route_tables.get(device_uuid)
+        if route_table is None:
+            routes = self.get_ipv4_static_routes_list(device_uuid, max_workers=max_workers)
+            route_table = self.route_tables[device_uuid] = RouteTable(routes, prefix_index=prefix_index)
+            return route_table
+        if refresh:
+            routes = self.get_ipv4_static_routes_list(device_uuid, max_workers=max_workers)
+            route_table.refresh(routes, prefix_index=prefix_index)
+        elif prefix_index is not None:
+            route_table.resolve(prefix_index)
+        return route_table
 
-    def search_static_routes(self, network_name: str, static_routes: list) -> list[StaticRouteModel]:
+    def search_static_routes(self, network_name: str, static_routes: Union[list, RouteTable]) -> list[StaticRouteModel]:
         """
         Find a matching route for a given network or host
         filter: name of the host or network object
-        static_routes: list of StaticRouteModel objects
+        static_routes: list of StaticRouteModel objects, or a RouteTable (see get_route_table) for an indexed lookup
         :return: a list of static routes that match the given host or network
         :rtype: list
         """
+        if isinstance(static_routes, RouteTable):
+            return static_routes.by_network(network_name)
         matches = []
         for static_route in static_routes:
             if static_route.selectedNetworks:  # Tried this with a list/dict comprehension but this is more readable
@@ -82,15 +154,27 @@ class StaticRoutes:
         :param ipv4_route: The ipv4_route object we want to create
         :return: IPv4StaticRouteModel object
         :rtype: IPv4StaticRouteModel
+        :raises TypeError: if ipv4_route is not an IPv4StaticRouteModel
         """
-        serialized_obj = self._serialize_object(ipv4_route)
+        new_route = self._create_static_route(device_uuid, IPv4StaticRouteModel, ipv4_route)
+        self._track_routes(device_uuid, [new_route])
+        return new_route
 
-        return IPv4StaticRouteModel(
-            **self.post(
-                f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{device_uuid}/routing/ipv4staticroutes",
-                data=serialized_obj,
-            )
-        )
+    def create_bulk_ipv4_static_routes(
+        self, device_uuid: str, ipv4_route_list: list, max_workers: int = 1
+    ) -> list[IPv4StaticRouteModel]:
+        """
+        The CSFMC has no bulk mode for static routes, so each route is its own post. They can be sent concurrently.
+        :param device_uuid: The UUID of the device we are working on
+        :param ipv4_route_list: list of the IPv4StaticRouteModel objects we want to create
+        :param max_workers: send the posts concurrently using up to this many threads
+        :return: list of the IPv4StaticRouteModel objects created, in the order given
+        :rtype: list[IPv4StaticRouteModel]
+        :raises TypeError: if any of the routes is not an IPv4StaticRouteModel
+        """
+        new_routes = self._create_bulk_static_routes(device_uuid, IPv4StaticRouteModel, ipv4_route_list, max_workers)
+        self._track_routes(device_uuid, new_routes)
+        return new_routes
 
     def update_ipv4_static_route(self, device_uuid: str, ipv4_route: IPv4StaticRouteModel) -> IPv4StaticRouteModel:
         """
@@ -98,17 +182,11 @@ class StaticRoutes:
         :param ipv4_route: The ipv4_route object we want to update
         :return: IPv4StaticRouteModel object
         :rtype: IPv4StaticRouteModel
+        :raises TypeError: if ipv4_route is not an IPv4StaticRouteModel
         """
-        serialized_obj = self._serialize_object(ipv4_route)
-        return IPv4StaticRouteModel(
-            **self.put(
-                (
-                    f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{device_uuid}/routing/"
-                    f"ipv4staticroutes/{ipv4_route.id}"
-                ),
-                data=serialized_obj,
-            )
-        )
+        updated_route = self._update_static_route(device_uuid, IPv4StaticRouteModel, ipv4_route)
+        self._track_routes(device_uuid, [updated_route])
+        return updated_route
 
     def delete_ipv4_static_route(self, device_uuid: str, route_obj_id: str) -> IPv4StaticRouteModel:
         """
@@ -117,8 +195,214 @@ class StaticRoutes:
         :return: IPv4StaticRouteModel object that we deleted
         :rtype: IPv4StaticRouteModel
         """
-        return IPv4StaticRouteModel(
-            **self.delete(
-                f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{device_uuid}/routing/ipv4staticroutes/{route_obj_id}",
-            )
+        deleted_route = self._delete_static_route(device_uuid, IPv4StaticRouteModel, route_obj_id)
+        self._untrack_route(device_uuid, route_obj_id)
+        return deleted_route
+
+    def get_ipv6_static_routes_list(
+        self,
+        device_uuid: str,
+        expanded: bool = True,
+        offset: int = 0,
+        limit: int = 999,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> list[IPv6StaticRouteModel]:
+        """
+        :param device_uuid: The UUID of the device we are working on
+        :param expanded: Return additional details about the route
+        :param offset: start on the nth record (useful for paging)
+        :param limit: the number of routes to request per page. Every page is returned
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: list of IPv6StaticRouteModel
+        :rtype: list
+        """
+        return self._get_static_routes_list(
+            device_uuid, IPv6StaticRouteModel, expanded, offset, limit, max_workers, raw=raw, trusted=trusted
         )
+
+    def iter_ipv6_static_routes(
+        self,
+        device_uuid: str,
+        expanded: bool = True,
+        offset: int = 0,
+        limit: int = 999,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> Iterator[IPv6StaticRouteModel]:
+        """
+        Stream the ipv6 static routes of a device one page at a time
+        :param device_uuid: The UUID of the device we are working on
+        :param expanded: Return additional details about the route
+        :param offset: start on the nth record
+        :param limit: the number of routes to request per page
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: iterator of IPv6StaticRouteModel
+        :rtype: Iterator[IPv6StaticRouteModel]
+        """
+        yield from self._iter_static_routes(
+            device_uuid, IPv6StaticRouteModel, expanded, offset, limit, raw=raw, trusted=trusted
+        )
+
+    def get_ipv6_static_route(
+        self, device_uuid: str, route_obj_id: str, raw: bool = False, trusted: bool = False
+    ) -> IPv6StaticRouteModel:
+        """
+        :param device_uuid: The UUID of the device we are working on
+        :param route_obj_id: The UUID of the route object to retrieve
+        :param raw: return the plain dictionary from the API rather than a model
+        :param trusted: build the model without validation (Model.construct) as the data comes from the CSFMC
+        :return: IPv6StaticRouteModel object
+        :rtype: IPv6StaticRouteModel
+        """
+        return self._get_static_route(device_uuid, IPv6StaticRouteModel, route_obj_id, raw=raw, trusted=trusted)
+
+    def create_ipv6_static_route(self, device_uuid: str, ipv6_route: IPv6StaticRouteModel) -> IPv6StaticRouteModel:
+        """
+        :param device_uuid: The UUID of the device we are working on
+        :param ipv6_route: The ipv6_route object we want to create
+        :return: IPv6StaticRouteModel object
+        :rtype: IPv6StaticRouteModel
+        :raises TypeError: if ipv6_route is not an IPv6StaticRouteModel
+        """
+        return self._create_static_route(device_uuid, IPv6StaticRouteModel, ipv6_route)
+
+    def create_bulk_ipv6_static_routes(
+        self, device_uuid: str, ipv6_route_list: list, max_workers: int = 1
+    ) -> list[IPv6StaticRouteModel]:
+        """
+        The CSFMC has no bulk mode for static routes, so each route is its own post. They can be sent concurrently.
+        :param device_uuid: The UUID of the device we are working on
+        :param ipv6_route_list: list of the IPv6StaticRouteModel objects we want to create
+        :param max_workers: send the posts concurrently using up to this many threads
+        :return: list of the IPv6StaticRouteModel objects created, in the order given
+        :rtype: list[IPv6StaticRouteModel]
+        :raises TypeError: if any of the routes is not an IPv6StaticRouteModel
+        """
+        return self._create_bulk_static_routes(device_uuid, IPv6StaticRouteModel, ipv6_route_list, max_workers)
+
+    def update_ipv6_static_route(self, device_uuid: str, ipv6_route: IPv6StaticRouteModel) -> IPv6StaticRouteModel:
+        """
+        :param device_uuid: The UUID of the device we are working on
+        :param ipv6_route: The ipv6_route object we want to update
+        :return: IPv6StaticRouteModel object
+        :rtype: IPv6StaticRouteModel
+        :raises TypeError: if ipv6_route is not an IPv6StaticRouteModel
+        """
+        return self._update_static_route(device_uuid, IPv6StaticRouteModel, ipv6_route)
+
+    def delete_ipv6_static_route(self, device_uuid: str, route_obj_id: str) -> IPv6StaticRouteModel:
+        """
+        :param device_uuid: The UUID of the device we are working on
+        :param route_obj_id: The UUID of the route object to delete
+        :return: IPv6StaticRouteModel object that we deleted
+        :rtype: IPv6StaticRouteModel
+        """
+        return self._delete_static_route(device_uuid, IPv6StaticRouteModel, route_obj_id)
+
+    def _static_routes_endpoint(self, device_uuid: str, model: type) -> str:
+        """
+        :param model: IPv4StaticRouteModel or IPv6StaticRouteModel
+        :return: the ipv4staticroutes or ipv6staticroutes endpoint of the device
+        """
+        route_type = "ipv6staticroutes" if issubclass(model, IPv6StaticRouteModel) else "ipv4staticroutes"
+        return (
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/devices/devicerecords/{device_uuid}/routing/{route_type}"
+        )
+
+    def _get_static_routes_list(
+        self,
+        device_uuid: str,
+        model: type,
+        expanded: bool,
+        offset: int,
+        limit: int,
+        max_workers: int,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> list[StaticRouteModel]:
+        return self._get_list(
+            self._static_routes_endpoint(device_uuid, model),
+            model,
+            params={"offset": offset, "limit": limit, "expanded": expanded},
+            max_workers=max_workers,
+            raw=raw,
+            trusted=trusted,
+        )
+
+    def _iter_static_routes(
+        self,
+        device_uuid: str,
+        model: type,
+        expanded: bool,
+        offset: int,
+        limit: int,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> Iterator[StaticRouteModel]:
+        yield from self._iter_list(
+            self._static_routes_endpoint(device_uuid, model),
+            model,
+            params={"offset": offset, "limit": limit, "expanded": expanded},
+            raw=raw,
+            trusted=trusted,
+        )
+
+    def _get_static_route(
+        self, device_uuid: str, model: type, route_obj_id: str, raw: bool = False, trusted: bool = False
+    ) -> StaticRouteModel:
+        return self._build_model(
+            model,
+            self.get(f"{self._static_routes_endpoint(device_uuid, model)}/{route_obj_id}"),
+            raw=raw,
+            trusted=trusted,
+        )
+
+    def _create_static_route(self, device_uuid: str, model: type, route: StaticRouteModel) -> StaticRouteModel:
+        self._check_route_types(model, [route])
+        return model(**self.post(self._static_routes_endpoint(device_uuid, model), data=encode_object(route)))
+
+    def _create_bulk_static_routes(
+        self, device_uuid: str, model: type, route_list: list, max_workers: int = 1
+    ) -> list[StaticRouteModel]:
+        self._check_route_types(model, route_list)
+        return self._create_each(
+            self._static_routes_endpoint(device_uuid, model), route_list, model, max_workers=max_workers
+        )
+
+    def _update_static_route(self, device_uuid: str, model: type, route: StaticRouteModel) -> StaticRouteModel:
+        self._check_route_types(model, [route])
+        return model(
+            **self.put(f"{self._static_routes_endpoint(device_uuid, model)}/{route.id}", data=encode_object(route))
+        )
+
+    def _delete_static_route(self, device_uuid: str, model: type, route_obj_id: str) -> StaticRouteModel:
+        return model(**self.delete(f"{self._static_routes_endpoint(device_uuid, model)}/{route_obj_id}"))
+
+    @staticmethod
+    def _check_route_types(model: type, routes: list) -> None:
+        """
+        The endpoint is chosen by the method called, so a route of the other IP version would be posted to the wrong one
+        :param model: IPv4StaticRouteModel or IPv6StaticRouteModel
+        :param routes: the routes passed to the method
+        :raises TypeError: if any of the routes is not an instance of model
+        """
+        for route in routes:
+            if not isinstance(route, model):
+                raise TypeError(f"Expected {model.__name__} but got {type(route).__name__}")
+
+    def _track_routes(self, device_uuid: str, routes: list) -> None:
+        """Add created or updated routes to the device's cached RouteTable, if there is one"""
+        route_table = (self.route_tables or {}).get(device_uuid)
+        if route_table is not None:
+            for route in routes:
+                route_table.add(route)
+
+    def _untrack_route(self, device_uuid: str, route_id: str) -> None:
+        route_table = (self.route_tables or {}).get(device_uuid)
+        if route_table is not None:
+            route_table.remove(route_id)
@@ -0,0 +1,53 @@
+import logging
+from typing import Callable, Iterable
+from .exceptions import DependencyCycle
+
+log = logging.getLogger(__name__)
+
+
+def dependency_levels(
+    nodes: list, identify: Callable[[object], Iterable], depends_on: Callable[[object], Iterable]
+) -> list[list]:
+    """
+    Order objects that depend on one another (e.g. network groups that contain other groups) into levels, where each
+    object only depends on objects in earlier levels. Every object in a level can then be created at once, in bulk or
+    in parallel, and deleting the levels in reverse order never removes an object that is still referenced.
+    Dependencies on objects that are not in nodes are ignored as they are assumed to exist already.
+    :param nodes: the objects to order
+    :param identify: returns the identifiers (id, name) other objects may use to refer to a node
+    :param depends_on: returns the identifiers of the objects a node refers to
+    :return: list of levels, each a list of nodes in the order they were given
+    :rtype: list[list]
+    :raises DependencyCycle: if some of the nodes depend on each other in a cycle
+    :raises ValueError: if two nodes share an identifier, as their dependencies could not be told apart
+    """
+    owners = {}
+    for i, node in enumerate(nodes):
+        for identifier in identify(node):
+            if identifier and owners.setdefault(identifier, i) != i:
+                raise ValueError(f"{identifier} identifies more than one object")
+    dependents = [[] for _ in nodes]
+    waiting_on = []
+    for i, node in enumerate(nodes):
+        dependencies = {owners[ref] for ref in depends_on(node) if ref in owners}
+        for dependency in dependencies:
+            dependents[dependency].append(i)
+        waiting_on.append(len(dependencies))
+
+    levels = []
+    level = [i for i, count in enumerate(waiting_on) if count == 0]
+    while level:
+        levels.append([nodes[i] for i in level])
+        next_level = []
+        for i in level:
+            for dependent in dependents[i]:
+                waiting_on[dependent] -= 1
+                if waiting_on[dependent] == 0:
+                    next_level.append(dependent)
+        level = sorted(next_level)
+
+    if sum(len(level) for level in levels) < len(nodes):
+        cycle = [nodes[i] for i, count in enumerate(waiting_on) if count]
+        raise DependencyCycle(f"{len(cycle)} objects are part of, or depend on, a dependency cycle", nodes=cycle)
+    log.debug(f"Ordered {len(nodes)} objects into {len(levels)} dependency levels")
+    return levels
@@ -6,34 +6,47 @@ log = logging.getLogger(__name__)
 
 
 class System:
-    def get_csfmc_domain_list(self, expanded: bool = False, offset: int = 0, limit: int = 999) -> list[DomainModel]:
+    def get_csfmc_domain_list(
+        self,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
+    ) -> list[DomainModel]:
         """
         :param expanded: Return additional details about the object
         :param offset: start on the nth record (useful for paging)
-        :param limit: the maximum number of objectsdomain_uuid: str, container_uuid: str to return (useful for paging)
+        :param limit: the number of objects to request per page. Every page is returned
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
         :return: list of FMCDomain objects (see models.py)
         :rtype: list
         """
-        domains = self.get(
-            f"{self.PLATFORM_PREFIX}/info/domain", params={"offset": offset, "limit": limit, "expanded": expanded}
+        return self._get_list(
+            f"{self.PLATFORM_PREFIX}/info/domain",
+            DomainModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded},
+            max_workers=max_workers,
+            raw=raw,
+            trusted=trusted,
         )
-        if "items" in domains:
-            return [DomainModel(**domain) for domain in domains["items"]]
 
-    def get_csfmc_domain(self, object_id):
+    def get_csfmc_domain(self, object_id, raw=False, trusted=False):
         domain = self.get(f"{self.PLATFORM_PREFIX}/api/fmc_platform/v1/info/domain/{self.domain_uuid}/{object_id}")
-        if domain is not None:
-            return DomainModel(**domain)
+        return self._build_model(DomainModel, domain, raw=raw, trusted=trusted)
 
-    def get_csfmc_version_list(self, expanded=True, offset=0, limit=999):
-        fmc_versions = self.get(
+    def get_csfmc_version_list(self, expanded=True, offset=0, limit=999, raw=False, trusted=False):
+        return self._get_list(
             f"{self.PLATFORM_PREFIX}/info/serverversion",
+            FMCServerVersionModel,
             params={"offset": offset, "limit": limit, "expanded": expanded},
+            raw=raw,
+            trusted=trusted,
         )
-        if "items" in fmc_versions:
-            return [FMCServerVersionModel(**version) for version in fmc_versions["items"]]
 
-    def get_csfmc_version(self, object_id):
+    def get_csfmc_version(self, object_id, raw=False, trusted=False):
         fmc_version = self.get(f"{self.PLATFORM_PREFIX}/api/fmc_platform/v1/info/serverversion/{object_id}")
-        if fmc_version is not None:
-            return FMCServerVersionModel(**fmc_version)
+        return self._build_model(FMCServerVersionModel, fmc_version, raw=raw, trusted=trusted)
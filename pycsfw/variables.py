@@ -1,4 +1,5 @@
 import logging
+from typing import Iterator
 from pycsfw.models import VariableSetModel
 
 log = logging.getLogger(__name__)
@@ -6,29 +7,65 @@ log = logging.getLogger(__name__)
 
 class VariableSets:
     def get_fmc_variable_set_list(
-        self, expanded: bool = False, offset: int = 0, limit: int = 999
+        self,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
     ) -> list[VariableSetModel]:
         """
         :param expanded: Return additional details about the object
         :param offset: start on the nth record (useful for paging)
-        :param limit: the maximum number of objects to return (useful for paging)
+        :param limit: the number of objects to request per page. Every page is returned
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
         :return: list of FMCVariableSet objects (see models.py)
         :rtype: list
         """
-        return [
-            VariableSetModel(**var_set)
-            for var_set in self.get(
-                f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/variablesets",
-                params={"offset": offset, "limit": limit, "expanded": expanded},
-            )["items"]
-        ]
+        return self._get_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/variablesets",
+            VariableSetModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded},
+            max_workers=max_workers,
+            raw=raw,
+            trusted=trusted,
+        )
+
+    def iter_fmc_variable_sets(
+        self, expanded: bool = False, offset: int = 0, limit: int = 999, raw: bool = False, trusted: bool = False
+    ) -> Iterator[VariableSetModel]:
+        """
+        Stream the variable sets one page at a time rather than building the full list in memory
+        :param expanded: Return additional details about the object
+        :param offset: start on the nth record
+        :param limit: the number of objects to request per page
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: iterator of FMCVariableSet objects (see models.py)
+        :rtype: Iterator[VariableSetModel]
+        """
+        yield from self._iter_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/variablesets",
+            VariableSetModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded},
+            raw=raw,
+            trusted=trusted,
+        )
 
-    def get_fmc_variable_set(self, var_set_id: str) -> VariableSetModel:
+    def get_fmc_variable_set(self, var_set_id: str, raw: bool = False, trusted: bool = False) -> VariableSetModel:
         """
         :param var_set_id: The UUID of the variable set we wish to retrieve
+        :param raw: return the plain dictionary from the API rather than a model
+        :param trusted: build the model without validation (Model.construct) as the data comes from the CSFMC
         :return: FMCVariableSet object
         :rtype: FMCVariableSet (see models.py)
         """
-        return VariableSetModel(
-            **self.get(f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/variablesets/{var_set_id}")
+        return self._build_model(
+            VariableSetModel,
+            self.get(f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/variablesets/{var_set_id}"),
+            raw=raw,
+            trusted=trusted,
         )
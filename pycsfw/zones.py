@@ -1,4 +1,6 @@
 import logging
+from typing import Iterator
+from pycsfw.common import encode_object
 from pycsfw.models import FTDSecurityZoneModel
 
 log = logging.getLogger(__name__)
@@ -6,33 +8,72 @@ log = logging.getLogger(__name__)
 
 class SecurityZone:
     def get_security_zones_list(
-        self, expanded: bool = False, offset: int = 0, limit: int = 999
+        self,
+        expanded: bool = False,
+        offset: int = 0,
+        limit: int = 999,
+        max_workers: int = 1,
+        raw: bool = False,
+        trusted: bool = False,
     ) -> list[FTDSecurityZoneModel]:
         """
         :param expanded: Return additional details about the object
         :param offset: start on the nth record (useful for paging)
-        :param limit: the maximum number of objects to return (useful for paging)
+        :param limit: the number of objects to request per page. Every page is returned
+        :param max_workers: fetch the remaining pages concurrently using up to this many threads
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
         :return: list of FTDSecurityZone objects (see models.py)
         :rtype: list
         """
-        zone_list = self.get(
+        return self._get_list(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/securityzones",
+            FTDSecurityZoneModel,
             params={"offset": offset, "limit": limit, "expanded": expanded},
+            max_workers=max_workers,
+            raw=raw,
+            trusted=trusted,
         )
-        if "items" in zone_list:
-            return [FTDSecurityZoneModel(**zone) for zone in zone_list["items"]]
 
-    def get_security_zone(self, zone_id: str, group_by_device: bool = True) -> FTDSecurityZoneModel:
+    def iter_security_zones(
+        self, expanded: bool = False, offset: int = 0, limit: int = 999, raw: bool = False, trusted: bool = False
+    ) -> Iterator[FTDSecurityZoneModel]:
+        """
+        Stream the security zones one page at a time rather than building the full list in memory
+        :param expanded: Return additional details about the object
+        :param offset: start on the nth record
+        :param limit: the number of objects to request per page
+        :param raw: return the plain dictionaries from the API rather than models
+        :param trusted: build the models without validation (Model.construct) as the data comes from the CSFMC
+        :return: iterator of FTDSecurityZone objects (see models.py)
+        :rtype: Iterator[FTDSecurityZoneModel]
+        """
+        yield from self._iter_list(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/securityzones",
+            FTDSecurityZoneModel,
+            params={"offset": offset, "limit": limit, "expanded": expanded},
+            raw=raw,
+            trusted=trusted,
+        )
+
+    def get_security_zone(
+        self, zone_id: str, group_by_device: bool = True, raw: bool = False, trusted: bool = False
+    ) -> FTDSecurityZoneModel:
         """
         :param zone_id: The UUID of the zone to return
+        :param raw: return the plain dictionary from the API rather than a model
+        :param trusted: build the model without validation (Model.construct) as the data comes from the CSFMC
         :return: security zone object
         :rtype: FTDSecurityZoneModel
         """
-        return FTDSecurityZoneModel(
-            **self.get(
+        return self._build_model(
+            FTDSecurityZoneModel,
+            self.get(
                 f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/securityzones/{zone_id}",
                 params={"groupByDevice": group_by_device},
-            )
+            ),
+            raw=raw,
+            trusted=trusted,
         )
 
     def create_security_zone(self, security_zone: FTDSecurityZoneModel) -> FTDSecurityZoneModel:
@@ -43,11 +84,26 @@ class SecurityZone:
         """
         zone = self.post(
             f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/securityzones",
-            data=security_zone.dict(exclude_unset=True),
+            data=encode_object(security_zone),
         )
         if zone is not None:
             return FTDSecurityZoneModel(**zone)
 
+    def create_bulk_security_zones(self, security_zone_list: list, max_workers: int = 1) -> list[FTDSecurityZoneModel]:
+        """
+        The CSFMC has no bulk mode for security zones, so each zone is its own post. They can be sent concurrently.
+        :param security_zone_list: list of the FTDSecurityZoneModel objects that we wish to create
+        :param max_workers: send the posts concurrently using up to this many threads
+        :return: list of the FTDSecurityZoneModel objects created, in the order given
+        :rtype: list[FTDSecurityZoneModel]
+        """
+        return self._create_each(
+            f"{self.CONFIG_PREFIX}/domain/{self.domain_uuid}/object/securityzones",
+            security_zone_list,
+            FTDSecurityZoneModel,
+            max_workers=max_workers,
+        )
+
     def delete_security_zone(self, security_zone_id: str) -> FTDSecurityZoneModel:
         """
         :param security_zone_id: The UUID of the security zone object that we wish to delete
@@ -0,0 +1,49 @@
+import os
+import json
+import logging
+from pycsfw import CSFWClient
+
+log = logging.getLogger("CSFMC-Inventory")
+log.setLevel(logging.WARNING)
+log.addHandler(logging.StreamHandler())
+
+
+def main():
+    csfmc_ip = os.environ.get("CSFMCIP")
+    username = os.environ.get("CSFMCUSER")
+    password = os.environ.get("CSFMCPASS")
+    verify = os.environ.get("VERIFY")
+    domain = os.environ.get("DOMAIN")
+
+    with CSFWClient(csfmc_ip, username, password, verify=verify) as csfw_client:
+        csfw_client.get_domain_uuid(domain)
+
+        def device_inventory(device):
+            """Fetch the physical interfaces, sub-interfaces and static routes of a single device"""
+            return {
+                "physical_interfaces": csfw_client.get_ftd_physical_iface_list(device.id),
+                "sub_interfaces": csfw_client.get_ftd_subiface_list(device.id),
+                "ipv4_static_routes": csfw_client.get_ipv4_static_routes_list(device.id),
+            }
+
+        # Work on up to 8 devices at a time. Failures are reported per device rather than stopping the inventory.
+        for device_result in csfw_client.for_each_device(device_inventory, max_workers=8):
+            if not device_result.ok:
+                log.error(f"Unable to inventory {device_result.device.name}: {device_result.error}")
+                continue
+            print(
+                json.dumps(
+                    {
+                        "device": device_result.device.name,
+                        **{
+                            key: [obj.dict(exclude_unset=True) for obj in value]
+                            for key, value in device_result.result.items()
+                        },
+                    },
+                    indent=4,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,7 @@ import csv
 import json
 import logging
 import argparse
-import time
 from pycsfw import CSFWClient
-from pycsfw.base import DuplicateObject
 from pycsfw.models import HostObjectModel
 
 
@@ -50,20 +48,16 @@ def main(filename):
 
 def create_host_objects(csfw_client: CSFWClient, host_data: list, bulk_rate: int = 100):
     log.warning(f"Creating {len(host_data)} host objects using bulk import payloads of {bulk_rate} records")
-    for i in range(0, len(host_data), bulk_rate):
-        payload = []
-        bulk_hosts = host_data[i : i + bulk_rate]
-        for host in bulk_hosts:
-            payload.append(HostObjectModel(name=host[0], description=host[1], value=host[3]))
-
-        # Bulk create the hosts
-        try:  # create_bulk_host_objects
-            csfw_client.create_bulk_host_objects(payload)
-            log.warning(f"{len(payload)} hosts bulk imported...")
-            log.debug("Sleeping 1/2 second to avoid API throttling")
-            time.sleep(0.5)
-        except DuplicateObject as ex:
-            log.error("This bulk group of devices did not get created because one of them is a duplicate.")
+    payload = [HostObjectModel(name=host[0], description=host[1], value=host[3]) for host in host_data]
+
+    # Bulk create the hosts. A duplicate or invalid host no longer costs us the rest of its payload: the client
+    # isolates it and reports it back to us.
+    result = csfw_client.create_bulk_host_objects(payload, chunk_size=bulk_rate, isolate_failures=True)
+    log.warning(f"{len(result.created)} hosts bulk imported...")
+    for host in result.duplicates:
+        log.error(f"Host {host.name} already exists. Skipping...")
+    for failure in result.failed:
+        log.error(f"Host {failure.item.name} could not be created: {failure.error}")
 
 
 def get_existing_test_objects(csfw_client):
@@ -30,6 +30,7 @@ setuptools.setup(
     download_url="",
     keywords=["cisco", "sdk", "secure", "firewall", "manager", "management", "fmc", "firepower", "center"],
     install_requires=["requests >= 2.25.1", "setuptools >= 51.1.2", "pydantic >= 1.9.0"],
+    extras_require={"fast": ["orjson >= 3.6.0"], "async": ["httpx >= 0.23.0", "greenlet >= 1.0"]},
     classifiers=[
         "Development Status :: 4 - Beta",
         "Topic :: Utilities",
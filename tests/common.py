@@ -9,8 +9,14 @@ from pycsfw.models import (
     NetworkGroupModel,
 )
 from unittest import TestCase
+import re
+import json
 import logging
 from os import environ, getenv
+from urllib.parse import urlparse
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
 from pycsfw import CSFWClient
 
 """ These are constants and functions that are used throughout the various tests"""
@@ -54,6 +60,14 @@ NET_OBJ_2 = NetworkObjectModel(
         "description": "Test Network obj 2",
     }
 )
+NET_OBJ_V6_1 = NetworkObjectModel(
+    **{
+        "name": "unittest-network-v6-1",
+        "value": "2001:db8:1::/48",
+        "overridable": False,
+        "description": "Test IPv6 Network obj 1",
+    }
+)
 
 HOST_OBJ_1 = HostObjectModel(
     **{
@@ -151,3 +165,64 @@ class TestCommon(TestCase):
             device = [device for device in device_list if device.name == TEST_DEVICE_NAME]
         if device:
             return device[0]
+
+
+class StubFMC(BaseAdapter):
+    """
+    Answers the client's requests in process and records them, so the client can be tested without an FMC.
+    Handlers added with route() return (status, body) or (status, body, headers) for the requests they match.
+    """
+
+    TOKEN_HEADERS = {
+        "X-auth-access-token": "token",
+        "X-auth-refresh-token": "refresh",
+        "DOMAIN_UUID": "d1",
+        "DOMAINS": json.dumps([{"name": "Global", "uuid": "d1"}]),
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+        self.routes = []
+
+    def route(self, method: str, pattern: str, handler) -> None:
+        self.routes.append((method, re.compile(pattern), handler))
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        path = urlparse(request.url).path
+        if path.endswith("/auth/generatetoken"):
+            status, body, headers = 204, None, self.TOKEN_HEADERS
+        else:
+            reply = (404, {"error": {"messages": [{"description": f"No stub for {request.method} {path}"}]}})
+            for method, pattern, handler in self.routes:
+                if method == request.method and pattern.search(path):
+                    reply = handler(request)
+                    break
+            status, body, headers = (*reply, {})[:3]
+        response = Response()
+        response.request, response.url, response.encoding = request, request.url, "utf-8"
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = json.dumps(body).encode() if body is not None else b""
+        return response
+
+    def close(self):
+        pass
+
+    def sent(self, method: str) -> list:
+        """The requests made with method, leaving out the token requests"""
+        return [request for request in self.requests if request.method == method and "/auth/" not in request.url]
+
+
+class StubClient(CSFWClient):
+    """A CSFWClient whose requests are answered by a StubFMC"""
+
+    def __init__(self, stub: StubFMC, **kwargs):
+        self.stub = stub
+        super().__init__("192.0.2.1", "unittest", "unittest", **{"rate_limit": None, **kwargs})
+
+    def _create_session(self, *args, **kwargs):
+        session = super()._create_session(*args, **kwargs)
+        session.mount("https://", self.stub)
+        return session
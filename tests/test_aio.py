@@ -0,0 +1,150 @@
+import time
+import asyncio
+import common
+import logging
+import threading
+from os import environ
+from unittest import TestCase, skipIf
+from pycsfw import AsyncCSFWClient
+from pycsfw.aio import httpx
+from pycsfw.exceptions import DuplicateObject
+from pycsfw.models import FTDDeviceModel, HostObjectModel
+from pycsfw.ratelimit import get_rate_limiter
+
+log = logging.getLogger()
+log.setLevel(common.LOG_LEVEL)
+log.addHandler(logging.StreamHandler())
+
+
+class TestAsyncClient(common.TestCommon):
+    """See the common.py for common methods and constants"""
+
+    def setUp(self):
+        """Create the FMCClient instance and other common setup tasks"""
+        self.common_setup()
+
+    def run_async(self, coroutine):
+        async def run():
+            async with AsyncCSFWClient(
+                environ.get("FMCIP"), environ.get("FMCUSER"), environ.get("FMCPASS"), verify=self.verify
+            ) as client:
+                await client.get_domain_uuid(common.TEST_DOMAIN)
+                return await coroutine(client)
+
+        return asyncio.run(run())
+
+    def test_get_device_records_list(self):
+        async def get_devices(client):
+            return await client.get_device_records_list()
+
+        [self.assertIsInstance(device, FTDDeviceModel) for device in self.run_async(get_devices)]
+
+    def test_gather_device_interfaces(self):
+        async def get_ifaces(client):
+            devices = await client.get_device_records_list()
+            return await asyncio.gather(*[client.get_ftd_physical_iface_list(device.id) for device in devices])
+
+        self.assertTrue(self.run_async(get_ifaces))
+
+    def test_iter_host_objects(self):
+        async def iter_hosts(client):
+            return [host_obj async for host_obj in client.iter_host_objects(limit=25)]
+
+        [self.assertIsInstance(host_obj, HostObjectModel) for host_obj in self.run_async(iter_hosts)]
+
+
+class FakeFMC:
+    """Answers the async client's requests in process through an httpx.MockTransport, counting the calls in flight"""
+
+    def __init__(self):
+        self.in_flight = self.peak = self.refreshes = 0
+        self.token = "token-1"
+        self.requests = []
+
+    async def handle(self, request):
+        self.requests.append(request)
+        await asyncio.sleep(0.01)  # Every reply takes a moment, so other calls run meanwhile
+        path = request.url.path
+        if path.endswith("/auth/generatetoken") or path.endswith("/auth/refreshtoken"):
+            self.refreshes += path.endswith("/auth/refreshtoken")
+            self.token = f"token-{len(self.requests)}"
+            headers = {**common.StubFMC.TOKEN_HEADERS, "X-auth-access-token": self.token}
+            return httpx.Response(204, headers=headers)
+        if request.headers.get("X-auth-access-token") != self.token:
+            return httpx.Response(401, json={"error": {"messages": [{"description": "Token expired"}]}})
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+        if path.endswith("/object/hosts") and request.method == "POST":
+            return httpx.Response(400, json={"error": {"messages": [{"description": "Duplicate Name"}]}})
+        if path.endswith("/object/hosts"):
+            offset, limit = int(request.url.params.get("offset", 0)), int(request.url.params.get("limit", 2))
+            paging = {"offset": offset, "limit": limit}
+            if offset + limit < 5:
+                paging["next"] = [f"https://192.0.2.1{path}?offset={offset + limit}&limit={limit}"]
+            items = [{"id": str(i), "name": f"unittest-host-{i}", "type": "Host"} for i in range(offset, 5)][:limit]
+            return httpx.Response(200, json={"items": items, "paging": paging})
+        iface = {"id": path.split("/")[-2], "name": "GigabitEthernet0/0", "type": "PhysicalInterface"}
+        return httpx.Response(200, json={"items": [iface]})
+
+
+@skipIf(httpx is None, "the async extra (httpx and greenlet) is not installed")
+class TestAsyncTransport(TestCase):
+    """The async client is served by an in process httpx transport so these tests run locally"""
+
+    def run_async(self, coroutine, host="192.0.2.1", **kwargs):
+        async def run():
+            async with AsyncCSFWClient(
+                host, "unittest", "unittest", transport=httpx.MockTransport(self.fmc.handle), **kwargs
+            ) as client:
+                return await coroutine(client)
+
+        self.fmc = FakeFMC()
+        return asyncio.run(run())
+
+    def test_calls_run_concurrently_without_threads(self):
+        async def get_ifaces(client):
+            threads = threading.active_count()
+            ifaces = await asyncio.gather(*[client.get_ftd_physical_iface_list(f"device-{i}") for i in range(10)])
+            return ifaces, threading.active_count() - threads
+
+        ifaces, new_threads = self.run_async(get_ifaces, rate_limit=None)
+        self.assertEqual([iface[0].id for iface in ifaces], [f"device-{i}" for i in range(10)])
+        self.assertEqual(self.fmc.peak, 10)
+        self.assertEqual(new_threads, 0)
+
+    def test_iter_pages_with_async_requests(self):
+        async def iter_hosts(client):
+            return [host_obj async for host_obj in client.iter_host_objects(limit=2)]
+
+        host_objs = self.run_async(iter_hosts, rate_limit=None)
+        self.assertEqual([host_obj.id for host_obj in host_objs], ["0", "1", "2", "3", "4"])
+        self.assertIsInstance(host_objs[0], HostObjectModel)
+        self.assertEqual(len(self.fmc.requests), 4)  # The token and three pages
+
+    def test_rate_limiter_is_shared_and_reserved(self):
+        async def get_ifaces(client):
+            start = time.monotonic()
+            await asyncio.gather(*[client.get_ftd_physical_iface_list(f"device-{i}") for i in range(6)])
+            return client.rate_limiter, time.monotonic() - start
+
+        # A CSFMC of its own, as the buckets are shared by every client of a CSFMC across the test run
+        rate_limiter, elapsed = self.run_async(get_ifaces, host="192.0.2.30", rate_limit=3000, rate_limit_burst=1)
+        self.assertIs(rate_limiter, get_rate_limiter("https://192.0.2.30"))
+        self.assertGreaterEqual(elapsed, 0.09)  # One token every 0.02 seconds, each reserved by a single call
+
+    def test_errors_are_mapped(self):
+        async def create_host(client):
+            await client.create_host_object(HostObjectModel(name="unittest-host-1", value="192.0.2.1"))
+
+        with self.assertRaises(DuplicateObject):
+            self.run_async(create_host, rate_limit=None)
+
+    def test_expired_token_is_refreshed_once(self):
+        async def get_ifaces(client):
+            self.fmc.token = "token-expired-elsewhere"
+            return await asyncio.gather(*[client.get_ftd_physical_iface_list(f"device-{i}") for i in range(5)])
+
+        self.assertEqual(len(self.run_async(get_ifaces, rate_limit=None)), 5)
+        self.assertEqual(self.fmc.refreshes, 1)
@@ -64,6 +64,18 @@ class TestFMCAccessPolicies(common.TestCommon):
         rule_list = self.csfw_client.get_access_rule_list(ap_list.id, expanded=True)
         [self.assertIsInstance(rule, FTDAccessRuleModel) for rule in rule_list]
 
+    def test_get_access_rules_list_all_pages(self):
+        """Test that every page of FTDAccessRules is returned, not just the first"""
+        ap_list = self.csfw_client.get_access_policy_list(name=common.DEFAULT_ACCESS_CONTROL_POLICY)[0]
+        rule_list = self.csfw_client.get_access_rule_list(ap_list.id)
+        paged_rule_list = self.csfw_client.get_access_rule_list(ap_list.id, limit=1, max_workers=2)
+        self.assertEqual([rule.id for rule in rule_list], [rule.id for rule in paged_rule_list])
+
+    def test_iter_access_rules(self):
+        """Test streaming the FTDAccessRules of the FMC default policy container one page at a time"""
+        ap_list = self.csfw_client.get_access_policy_list(name=common.DEFAULT_ACCESS_CONTROL_POLICY)[0]
+        [self.assertIsInstance(rule, FTDAccessRuleModel) for rule in self.csfw_client.iter_access_rules(ap_list.id)]
+
     def test_get_access_rule(self):
         """Test the read operation for FTDAccessRule"""
         access_rule_obj = self.csfw_client.create_access_rule(
@@ -85,3 +97,16 @@ class TestFMCAccessPolicies(common.TestCommon):
             self.csfw_client.delete_access_rule(self.ftd_ap.id, access_rule_obj.id),
             FTDAccessRuleModel,
         )
+
+    def test_create_bulk_access_rules_in_position(self):
+        """Rules inserted in chunks keep their order and land after the given rule"""
+        self.csfw_client.create_bulk_access_rules(
+            self.ftd_ap.id, [FTDAccessRuleModel(name=f"Test-{i}", enabled=True, action=Action.ALLOW) for i in (1, 2)]
+        )
+        new_rules = [FTDAccessRuleModel(name=f"Test-Bulk-{i}", enabled=True, action=Action.ALLOW) for i in range(4)]
+        result = self.csfw_client.create_bulk_access_rules(
+            self.ftd_ap.id, new_rules, insert_after=1, chunk_size=2, isolate_failures=True
+        )
+        self.assertTrue(result.ok)
+        rule_names = [rule.name for rule in self.csfw_client.get_access_rule_list(self.ftd_ap.id)]
+        self.assertEqual(rule_names[:6], ["Test-1"] + [rule.name for rule in new_rules] + ["Test-2"])
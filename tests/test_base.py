@@ -1,6 +1,9 @@
 import common
 from pycsfw import CSFWClient
+from pycsfw.retry import RetryPolicy
+from pycsfw.cache import ResponseCache
 from os import environ, getenv
+from unittest.mock import patch
 
 import logging
 
@@ -28,3 +31,50 @@ class TestBaseClient(common.TestCommon):
         self.csfw_client.domain_uuid = None
         self.csfw_client.get_domain_uuid(common.TEST_DOMAIN)
         self.assertIsInstance(self.csfw_client.domain_uuid, str)
+
+    def test_client_context_manager(self):
+        with CSFWClient(
+            environ.get("FMCIP"),
+            environ.get("FMCUSER"),
+            environ.get("FMCPASS"),
+            verify=getenv("VERIFY", "True").lower() in ("false", "0", "f"),
+            pool_maxsize=2,
+        ) as csfw_client:
+            csfw_client.get_domain_uuid(common.TEST_DOMAIN)
+            self.assertTrue(csfw_client.get_csfmc_version_list())
+
+    def test_refresh_auth_token(self):
+        old_token = self.csfw_client.token.get("X-auth-access-token")
+        self.csfw_client.refresh_auth_token(stale_token=old_token)
+        self.assertNotEqual(old_token, self.csfw_client.token.get("X-auth-access-token"))
+        self.assertEqual(self.csfw_client.token_refresh_count, 1)
+        self.assertTrue(self.csfw_client.get_csfmc_version_list())
+
+    def test_client_retry_policy(self):
+        csfw_client = CSFWClient(
+            environ.get("FMCIP"),
+            environ.get("FMCUSER"),
+            environ.get("FMCPASS"),
+            verify=getenv("VERIFY", "True").lower() in ("false", "0", "f"),
+            retry_policy=RetryPolicy(retries=3),
+        )
+        self.assertTrue(csfw_client.get_csfmc_version_list())
+
+    def test_client_response_cache(self):
+        csfw_client = CSFWClient(
+            environ.get("FMCIP"),
+            environ.get("FMCUSER"),
+            environ.get("FMCPASS"),
+            verify=getenv("VERIFY", "True").lower() in ("false", "0", "f"),
+            response_cache=ResponseCache(ttl=60),
+        )
+        csfw_client.get_domain_uuid(common.TEST_DOMAIN)
+        first = csfw_client.get_csfmc_version_list()
+        cache = csfw_client.response_cache
+        key = cache.make_key(
+            f"{csfw_client.PLATFORM_PREFIX}/info/serverversion", {"offset": 0, "limit": 999, "expanded": True}
+        )
+        self.assertIsNotNone(cache.get(key))
+        with patch.object(csfw_client.session, "get", wraps=csfw_client.session.get) as session_get:
+            self.assertEqual(first, csfw_client.get_csfmc_version_list())
+        session_get.assert_not_called()
@@ -0,0 +1,46 @@
+import json
+import common
+import logging
+from urllib.parse import urlparse, parse_qsl
+from unittest import TestCase
+from pycsfw.models import Action, FTDAccessRuleModel
+
+log = logging.getLogger()
+log.setLevel(common.LOG_LEVEL)
+log.addHandler(logging.StreamHandler())
+
+
+class TestBulkAccessRules(TestCase):
+    """The access policy is simulated by an in process stub so these tests run locally"""
+
+    def setUp(self):
+        self.rules = ["existing-1", "existing-2", "existing-3"]  # rule names in policy order
+        self.stub = common.StubFMC()
+        self.stub.route("POST", "/accessrules$", self.post_rules)
+        self.csfw_client = common.StubClient(self.stub)
+
+    def post_rules(self, request) -> tuple:
+        """Insert the posted rules before the 1-based insertBefore index. A post holding an invalid rule is rejected"""
+        posted = json.loads(request.body)
+        if any(rule["name"].startswith("invalid") for rule in posted):
+            return 400, {"error": {"messages": [{"description": "Invalid access rule"}]}}
+        position = int(dict(parse_qsl(urlparse(request.url).query)).get("insertBefore", len(self.rules) + 1)) - 1
+        self.rules[position:position] = [rule["name"] for rule in posted]
+        return 201, {"items": [{**rule, "id": rule["name"]} for rule in posted]}
+
+    def test_insert_before_and_after_are_exclusive(self):
+        with self.assertRaises(ValueError):
+            self.csfw_client.create_bulk_access_rules("ap-1", [], insert_after=1, insert_before=2)
+        self.assertEqual(self.stub.sent("POST"), [])
+
+    def test_isolated_failures_keep_the_insert_before_position(self):
+        names = ["new-1", "new-2", "invalid-1", "new-3", "new-4", "new-5", "invalid-2", "new-6"]
+        rule_list = [FTDAccessRuleModel(name=name, action=Action.ALLOW) for name in names]
+        result = self.csfw_client.create_bulk_access_rules(
+            "ap-1", rule_list, insert_before=2, chunk_size=4, isolate_failures=True
+        )
+        self.assertEqual([rule.name for rule in result.created], [name for name in names if "invalid" not in name])
+        self.assertEqual([failure.item.name for failure in result.failed], ["invalid-1", "invalid-2"])
+        self.assertEqual(
+            self.rules, ["existing-1", "new-1", "new-2", "new-3", "new-4", "new-5", "new-6", "existing-2", "existing-3"]
+        )
@@ -0,0 +1,66 @@
+import common
+import logging
+from unittest import TestCase
+from pycsfw.cache import ResponseCache
+
+log = logging.getLogger()
+log.setLevel(common.LOG_LEVEL)
+log.addHandler(logging.StreamHandler())
+
+HOSTS = "/api/fmc_config/v1/domain/d1/object/hosts"
+HOST = {"id": "1", "name": "unittest-host-1", "type": "Host"}
+
+
+class TestResponseCache(TestCase):
+    """The cache is exercised against an in process stub so these tests run locally"""
+
+    def setUp(self):
+        self.etag = '"v1"'
+        self.stub = common.StubFMC()
+        self.stub.route("GET", "/object/hosts", self.get_host)
+        self.stub.route("PUT", "/object/hosts/1$", lambda request: (200, HOST))
+        self.stub.route("DELETE", "/object/hosts/1$", lambda request: (200, HOST))
+        self.cache = ResponseCache(ttl=60)
+        self.csfw_client = common.StubClient(self.stub, response_cache=self.cache)
+
+    def get_host(self, request) -> tuple:
+        """Answer 304 Not Modified when the client already holds the current ETag"""
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return 304, None
+        return 200, HOST, {"ETag": self.etag} if self.etag else {}
+
+    def test_fresh_entries_are_served_from_the_cache(self):
+        first = self.csfw_client.get(f"{HOSTS}/1")
+        self.assertIsNotNone(self.cache.get(self.cache.make_key(f"{HOSTS}/1")))
+        self.assertEqual(self.csfw_client.get(f"{HOSTS}/1"), first)
+        self.assertEqual(len(self.stub.sent("GET")), 1)
+
+    def test_expired_entries_are_revalidated(self):
+        first = self.csfw_client.get(f"{HOSTS}/1")
+        self.cache.ttl = 0
+        self.assertEqual(self.csfw_client.get(f"{HOSTS}/1"), first)  # Answered 304 Not Modified
+        self.assertEqual(len(self.stub.sent("GET")), 2)
+        self.assertEqual(self.stub.sent("GET")[-1].headers.get("If-None-Match"), '"v1"')
+        self.etag = '"v2"'  # The resource changed so the CSFMC sends it in full
+        self.assertEqual(self.csfw_client.get(f"{HOSTS}/1"), first)
+        self.assertEqual(len(self.stub.sent("GET")), 3)
+        self.assertEqual(self.cache.get(self.cache.make_key(f"{HOSTS}/1")).etag, '"v2"')
+
+    def test_expired_entries_without_validators_are_fetched_again(self):
+        self.etag = None
+        first = self.csfw_client.get(f"{HOSTS}/1")
+        self.cache.ttl = 0
+        self.assertEqual(self.csfw_client.get(f"{HOSTS}/1"), first)
+        self.assertEqual(len(self.stub.sent("GET")), 2)
+        self.assertIsNone(self.stub.sent("GET")[-1].headers.get("If-None-Match"))
+
+    def test_mutations_invalidate_the_resource_and_its_collection(self):
+        self.csfw_client.get(HOSTS)
+        self.csfw_client.get(f"{HOSTS}/1")
+        self.csfw_client.put(f"{HOSTS}/1", data={"id": "1", "name": "unittest-host-1"})
+        self.assertIsNone(self.cache.get(self.cache.make_key(HOSTS)))
+        self.assertIsNone(self.cache.get(self.cache.make_key(f"{HOSTS}/1")))
+        self.csfw_client.get(f"{HOSTS}/1")
+        self.csfw_client.delete(f"{HOSTS}/1")
+        self.csfw_client.get(f"{HOSTS}/1")
+        self.assertEqual(len(self.stub.sent("GET")), 4)
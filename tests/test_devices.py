@@ -1,4 +1,4 @@
-from pycsfw.models import FTDDeviceModel
+from pycsfw.models import FTDDeviceModel, DeviceResultModel
 import common
 
 import logging
@@ -19,6 +19,25 @@ class TestFMCDevices(common.TestCommon):
         """Test getting a list of devices managed by this FMC"""
         self.assertIsNotNone(self.csfw_client.get_device_records_list())
 
+    def test_for_each_device(self):
+        """Test running an operation against every device and collecting the per-device results"""
+        results = self.csfw_client.for_each_device(
+            lambda device: self.csfw_client.get_ftd_physical_iface_list(device.id), max_workers=4
+        )
+        for result in results:
+            self.assertIsInstance(result, DeviceResultModel)
+            self.assertTrue(result.ok)
+
+    def test_for_each_device_collects_errors(self):
+        """A failure on one device must not abort the batch"""
+
+        def fail(device):
+            raise ValueError(device.id)
+
+        results = self.csfw_client.for_each_device(fail)
+        self.assertEqual(len(results), len(self.csfw_client.get_device_records_list()))
+        [self.assertIsInstance(result.error, ValueError) for result in results]
+
     def test_get_fmc_device_record(self):
         """Given a device uuid, test getting the details of that device"""
         devices = self.csfw_client.get_device_records_list()
@@ -0,0 +1,129 @@
+import common
+import logging
+from unittest import TestCase
+from pycsfw.common import parse_network_value
+from pycsfw.index import IPPrefixIndex
+from pycsfw.inventory import NetworkObjectTable
+from pycsfw.models import HostObjectModel, NetworkObjectModel, NetworkGroupModel, INetworkAddress, RangeObjectModel
+
+log = logging.getLogger()
+log.setLevel(common.LOG_LEVEL)
+log.addHandler(logging.StreamHandler())
+
+
+class TestInventory(TestCase):
+    """The inventory table is built from raw records so these tests run locally"""
+
+    def setUp(self):
+        self.table = NetworkObjectTable(
+            [
+                {"id": "1", "name": "unittest-host-1", "type": "Host", "value": "192.0.2.1", "version": "a"},
+                {"id": "2", "name": "unittest-net-1", "type": "Network", "value": "192.0.2.0/24", "version": "b"},
+                {"id": "3", "name": "unittest-net-2", "type": "Network", "value": "10.0.0.0/8", "version": "c"},
+                {"id": "4", "name": "unittest-net-v6", "type": "Network", "value": "2001:db8::/32", "version": "d"},
+                {"id": "5", "name": "unittest-host-v6", "type": "Host", "value": "2001:db8::1", "version": "e"},
+            ]
+        )
+
+    def test_parse_network_value(self):
+        self.assertEqual([str(net) for net in parse_network_value("192.0.2.1")], ["192.0.2.1/32"])
+        self.assertEqual([str(net) for net in parse_network_value("192.0.2.10/24")], ["192.0.2.0/24"])
+        self.assertEqual(
+            [str(net) for net in parse_network_value("192.0.2.0-192.0.2.4")], ["192.0.2.0/30", "192.0.2.4/32"]
+        )
+        self.assertEqual(parse_network_value("www.example.com"), [])
+
+    def test_rows(self):
+        self.assertEqual(len(self.table), 5)
+        self.assertEqual(self.table[1]["name"], "unittest-net-1")
+        self.assertIsInstance(self.table.model(0), HostObjectModel)
+        self.assertEqual(str(self.table.network(3)), "2001:db8::/32")
+
+    def test_unknown_types(self):
+        self.assertFalse(self.table.append({"id": "9", "name": "unittest-dynamic-1", "type": "DynamicObject"}))
+        self.assertEqual(len(self.table), 5)
+        self.assertRaises(ValueError, self.table.where_type, "DynamicObject")
+
+    def test_filters(self):
+        self.assertEqual(self.table.where_type("Host"), [0, 4])
+        self.assertEqual(self.table.containing("192.0.2.1"), [0, 1])
+        self.assertEqual(self.table.containing("2001:db8::1"), [3, 4])
+        self.assertEqual(self.table.within("192.0.0.0/16"), [0, 1])
+        self.table.append({"id": "6", "name": "unittest-host-2", "type": "Host", "value": "192.0.2.9"})
+        self.assertEqual(self.table.containing("192.0.2.9"), [1, 5])  # The sorted keys are rebuilt after an append
+        v6_table = self.table.take(self.table.within("2001:db8::/16"))
+        self.assertEqual(v6_table.names, ["unittest-net-v6", "unittest-host-v6"])
+
+    def test_ranges(self):
+        """A range that is not a single prefix is matched against its first and last address"""
+        self.table.append({"id": "6", "name": "unittest-range-1", "type": "Range", "value": "192.0.2.5-192.0.2.20"})
+        self.table.append({"id": "7", "name": "unittest-range-2", "type": "Range", "value": "10.1.0.0-10.1.0.255"})
+        self.assertIsInstance(self.table.model(5), RangeObjectModel)
+        self.assertIsNone(self.table.network(5))
+        self.assertEqual(str(self.table.network(6)), "10.1.0.0/24")
+        self.assertEqual(self.table.containing("192.0.2.20"), [1, 5])
+        self.assertEqual(self.table.containing("192.0.2.21"), [1])
+        self.assertEqual(self.table.within("192.0.2.0/27"), [0, 5])
+        self.assertEqual(self.table.within("192.0.2.0/28"), [0])
+        self.assertEqual(self.table.within("10.1.0.0/16"), [6])
+
+
+class TestIPPrefixIndex(TestCase):
+    """The prefix index is built from models so these tests run locally"""
+
+    def setUp(self):
+        self.host = HostObjectModel(id="1", name="unittest-host-1", value="10.1.2.3")
+        self.net = NetworkObjectModel(id="2", name="unittest-net-1", value="10.1.0.0/16")
+        self.v6_net = NetworkObjectModel(id="3", name="unittest-net-v6", value="2001:db8::/32")
+        self.group = NetworkGroupModel(
+            id="4",
+            name="unittest-group-1",
+            objects=[INetworkAddress(id="1", type="Host")],
+            literals=[{"type": "Range", "value": "192.0.2.0-192.0.2.4"}],
+        )
+        self.parent = NetworkGroupModel(id="5", name="unittest-group-2", objects=[INetworkAddress(id="4")])
+        self.index = IPPrefixIndex([self.host, self.net, self.v6_net, self.group, self.parent])
+
+    def names(self, objs):
+        return [obj.name for obj in objs]
+
+    def test_containing(self):
+        self.assertEqual(
+            self.names(self.index.containing("10.1.2.3")),
+            ["unittest-host-1", "unittest-group-1", "unittest-group-2", "unittest-net-1"],
+        )
+        self.assertEqual(self.names(self.index.longest_prefix("10.1.9.9")), ["unittest-net-1"])
+        self.assertEqual(self.names(self.index.containing("192.0.2.4")), ["unittest-group-1", "unittest-group-2"])
+        self.assertEqual(self.names(self.index.containing("2001:db8::1")), ["unittest-net-v6"])
+        self.assertEqual(self.index.containing("172.16.0.1"), [])
+
+    def test_overlapping(self):
+        self.assertEqual(
+            self.names(self.index.overlapping("10.0.0.0/8")),
+            ["unittest-net-1", "unittest-host-1", "unittest-group-1", "unittest-group-2"],
+        )
+        self.assertEqual(
+            set(self.names(self.index.overlapping("10.1.2.0/24"))), set(self.names(self.index.containing("10.1.2.3")))
+        )
+
+    def test_remove(self):
+        self.index.overlapping("10.0.0.0/8")  # Build the sorted keys so removal has to maintain them
+        self.index.remove("1")  # The groups lose the host but keep their literal range
+        self.assertEqual(self.names(self.index.overlapping("10.0.0.0/8")), ["unittest-net-1"])
+        self.assertEqual(self.names(self.index.containing("192.0.2.1")), ["unittest-group-1", "unittest-group-2"])
+        self.index.remove("4")
+        self.index.remove("5")
+        self.assertEqual(self.index.containing("192.0.2.1"), [])
+
+    def test_member_update_reexpands_groups(self):
+        self.index.add(HostObjectModel(id="1", name="unittest-host-1", value="172.16.0.1"))
+        self.assertEqual(
+            self.names(self.index.containing("172.16.0.1")), ["unittest-host-1", "unittest-group-1", "unittest-group-2"]
+        )
+        self.assertEqual(self.names(self.index.containing("10.1.2.3")), ["unittest-net-1"])
+
+    def test_range_objects(self):
+        self.index.add(RangeObjectModel(id="6", name="unittest-range-1", value="10.9.0.0-10.9.1.255"))
+        self.index.add(NetworkGroupModel(id="7", name="unittest-group-3", objects=[INetworkAddress(id="6")]))
+        self.assertEqual(self.names(self.index.containing("10.9.1.7")), ["unittest-range-1", "unittest-group-3"])
+        self.assertEqual(self.names(self.index.overlapping("10.9.1.0/24")), ["unittest-range-1", "unittest-group-3"])
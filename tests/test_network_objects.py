@@ -2,7 +2,7 @@ import time
 import logging
 import common
 from pycsfw.base import DuplicateObject, ObjectDeletionRestricted
-from pycsfw.models import NetworkGroupModel, NetworkObjectModel, HostObjectModel
+from pycsfw.models import NetworkGroupModel, NetworkObjectModel, HostObjectModel, INetworkAddress, BulkResultModel
 
 log = logging.getLogger()
 log.setLevel(common.LOG_LEVEL)
@@ -34,7 +34,7 @@ class TestFMCNetworkObjects(common.TestCommon):
         try:
             obj_list = self.csfw_client.get_network_objects_list(filter="nameOrValue:unittest-network-")
             if obj_list:
-                [self.csfw_client.delete_network_object(obj.id) for obj in obj_list]
+                self.csfw_client.delete_bulk_network_objects([obj.id for obj in obj_list])
         except ObjectDeletionRestricted:
             log.error("We are trying to delete a network-object while it is still referenced in a network-group")
 
@@ -43,7 +43,7 @@ class TestFMCNetworkObjects(common.TestCommon):
         try:
             host_list = self.csfw_client.get_host_objects_list(filter="nameOrValue:unittest-host-")
             if host_list:
-                [self.csfw_client.delete_host_object(host.id) for host in host_list]
+                self.csfw_client.delete_bulk_host_objects([host.id for host in host_list])
         except ObjectDeletionRestricted:
             log.error("We are trying to delete a network-object while it is still referenced in a network-group")
 
@@ -122,6 +122,18 @@ class TestFMCNetworkObjects(common.TestCommon):
             log.error("There were no test objects found.")
             self.assertTrue(False)
 
+    def test_get_host_objects_list_concurrent_pages(self) -> None:
+        self.create_test_objects()
+        serial_objs = self.csfw_client.get_host_objects_list(limit=1)
+        concurrent_objs = self.csfw_client.get_host_objects_list(limit=1, max_workers=4)
+        self.assertEqual([obj.id for obj in serial_objs], [obj.id for obj in concurrent_objs])
+
+    def test_iter_host_objects(self) -> None:
+        self.create_test_objects()
+        host_objs = list(self.csfw_client.iter_host_objects(filter="nameOrValue:unittest-host-", limit=1))
+        self.assertEqual(len(host_objs), 2)
+        [self.assertIsInstance(host_obj, HostObjectModel) for host_obj in host_objs]
+
     def test_get_host_objects_list_filter(self) -> None:
         self.create_test_objects()
         host_objs = self.csfw_client.get_host_objects_list(filter="nameOrValue:unittest-host-")
@@ -199,3 +211,98 @@ class TestFMCNetworkObjects(common.TestCommon):
         )
         for network_grp in network_grps:
             self.assertIsInstance(self.csfw_client.delete_network_group(network_grp.id), NetworkGroupModel)
+
+    def test_build_network_object_index(self):
+        self.create_test_objects()
+        index = self.csfw_client.build_network_object_index(max_workers=4)
+        net_obj = index.get_by_name(common.NET_OBJ_1.name, "Network")
+        self.assertIsInstance(net_obj, NetworkObjectModel)
+        self.assertIn(net_obj, index.get_by_value(common.NET_OBJ_1.value))
+
+        # Members given only by name are resolved from the index rather than the API
+        network_grp = NetworkGroupModel(
+            name="test-network-group-indexed",
+            objects=[INetworkAddress(name=common.NET_OBJ_1.name, type="Network")],
+        )
+        new_network_grp = self.csfw_client.create_network_group(network_grp)
+        self.assertEqual(new_network_grp.objects[0].id, net_obj.id)
+        self.assertIs(index.get_by_id(new_network_grp.id), new_network_grp)
+
+        self.csfw_client.delete_network_group(new_network_grp.id)
+        self.assertNotIn(new_network_grp.id, index)
+
+    def test_create_bulk_network_groups(self):
+        net_objs = self.csfw_client.create_bulk_network_objects([common.NET_OBJ_1, common.NET_OBJ_2])
+        network_grps = self.csfw_client.create_bulk_network_groups(
+            [
+                NetworkGroupModel(name="test-network-group-bulk-1", objects=net_objs[:1]),
+                NetworkGroupModel(name="test-network-group-bulk-2", objects=net_objs[1:]),
+            ]
+        )
+        self.assertEqual([grp.name for grp in network_grps], ["test-network-group-bulk-1", "test-network-group-bulk-2"])
+        for network_grp in network_grps:
+            self.assertIsInstance(network_grp, NetworkGroupModel)
+
+    def test_create_bulk_host_objects_isolate_failures(self) -> None:
+        self.csfw_client.create_host_object(common.HOST_OBJ_1)
+        result = self.csfw_client.create_bulk_host_objects(
+            [common.HOST_OBJ_1, common.HOST_OBJ_2], chunk_size=2, isolate_failures=True
+        )
+        self.assertIsInstance(result, BulkResultModel)
+        self.assertEqual([host.name for host in result.created], [common.HOST_OBJ_2.name])
+        self.assertEqual([host.name for host in result.duplicates], [common.HOST_OBJ_1.name])
+        self.assertFalse(result.failed)
+
+    def test_update_bulk_host_objects(self) -> None:
+        host_objs = self.csfw_client.create_bulk_host_objects([common.HOST_OBJ_1, common.HOST_OBJ_2])
+        for host_obj in host_objs:
+            host_obj.description = "unittest bulk update"
+        updated_host_objs = self.csfw_client.update_bulk_host_objects(host_objs)
+        self.assertEqual([host.description for host in updated_host_objs], ["unittest bulk update"] * 2)
+
+    def test_delete_bulk_host_objects(self) -> None:
+        host_objs = self.csfw_client.create_bulk_host_objects([common.HOST_OBJ_1, common.HOST_OBJ_2])
+        deleted_host_objs = self.csfw_client.delete_bulk_host_objects([host.id for host in host_objs], chunk_size=1)
+        self.assertEqual(sorted(host.id for host in deleted_host_objs), sorted(host.id for host in host_objs))
+        self.assertFalse(self.csfw_client.get_host_objects_list(filter="nameOrValue:unittest-host-"))
+
+    def test_sync_network_objects(self) -> None:
+        desired = [
+            HostObjectModel(name=common.HOST_OBJ_1.name, value=common.HOST_OBJ_1.value),
+            NetworkObjectModel(name=common.NET_OBJ_1.name, value=common.NET_OBJ_1.value),
+            NetworkGroupModel(
+                name="test-network-group-sync", objects=[INetworkAddress(name=common.NET_OBJ_1.name, type="Network")]
+            ),
+        ]
+        result = self.csfw_client.sync_network_objects(desired)
+        self.assertEqual(len(result.created), 3)
+
+        # A second sync against the same desired state has nothing to do
+        desired = [obj.copy() for obj in desired]
+        result = self.csfw_client.sync_network_objects(desired)
+        self.assertFalse(result.created or result.updated or result.deleted)
+        self.assertEqual(len(result.unchanged), 3)
+
+    def test_create_and_delete_network_groups_nested(self) -> None:
+        net_objs = self.csfw_client.create_bulk_network_objects([common.NET_OBJ_1])
+        network_grps = self.csfw_client.create_network_groups(
+            [
+                NetworkGroupModel(
+                    name="test-network-group-outer",
+                    objects=[INetworkAddress(name="test-network-group-inner", type="NetworkGroup")],
+                ),
+                NetworkGroupModel(name="test-network-group-inner", objects=net_objs),
+            ]
+        )
+        self.assertEqual([grp.name for grp in network_grps], ["test-network-group-inner", "test-network-group-outer"])
+        deleted = self.csfw_client.delete_network_groups(network_grps, max_workers=2)
+        self.assertEqual([grp.id for grp in deleted], [network_grps[1].id, network_grps[0].id])
+
+    def test_get_host_objects_list_raw_and_trusted(self) -> None:
+        self.create_test_objects()
+        raw_hosts = self.csfw_client.get_host_objects_list(filter="nameOrValue:unittest-host-", raw=True)
+        self.assertIsInstance(raw_hosts[0], dict)
+        trusted_hosts = self.csfw_client.get_host_objects_list(filter="nameOrValue:unittest-host-", trusted=True)
+        self.assertIsInstance(trusted_hosts[0], HostObjectModel)
+        self.assertEqual([host["id"] for host in raw_hosts], [host.id for host in trusted_hosts])
+        self.assertIsInstance(self.csfw_client.get_host_object(raw_hosts[0]["id"], raw=True), dict)
@@ -0,0 +1,43 @@
+import common
+import logging
+from urllib.parse import urlparse, parse_qsl
+from unittest import TestCase
+
+log = logging.getLogger()
+log.setLevel(common.LOG_LEVEL)
+log.addHandler(logging.StreamHandler())
+
+HOSTS = "/api/fmc_config/v1/domain/d1/object/hosts"
+RECORDS = [{"id": str(i), "name": f"unittest-host-{i}", "type": "Host", "value": f"192.0.2.{i}"} for i in range(7)]
+
+
+class TestPaging(TestCase):
+    """The pages are served by an in process stub so these tests run locally"""
+
+    def setUp(self):
+        self.count = True
+        self.stub = common.StubFMC()
+        self.stub.route("GET", "/object/hosts$", self.get_page)
+        self.csfw_client = common.StubClient(self.stub)
+
+    def get_page(self, request) -> tuple:
+        """Serve RECORDS two at a time, linking each page to the next one only, as the CSFMC does"""
+        query = dict(parse_qsl(urlparse(request.url).query))
+        offset, limit = int(query.get("offset", 0)), int(query.get("limit", 2))
+        paging = {"offset": offset, "limit": limit}
+        if self.count:
+            paging["count"] = len(RECORDS)
+        if offset + limit < len(RECORDS):
+            paging["next"] = [f"https://192.0.2.1{HOSTS}?offset={offset + limit}&limit={limit}"]
+        return 200, {"items": RECORDS[offset : offset + limit], "paging": paging}
+
+    def test_pages_with_a_count(self):
+        hosts = self.csfw_client.get_host_objects_list(limit=2, max_workers=3, raw=True)
+        self.assertEqual(hosts, RECORDS)
+        self.assertEqual(len(self.stub.sent("GET")), 4)
+
+    def test_pages_without_a_count_follow_each_next_link(self):
+        self.count = False
+        self.assertEqual(self.csfw_client.get_host_objects_list(limit=2, max_workers=3, raw=True), RECORDS)
+        self.assertEqual([host.id for host in self.csfw_client.iter_host_objects(limit=2)], [r["id"] for r in RECORDS])
+        self.assertEqual(len(self.stub.sent("GET")), 8)
@@ -0,0 +1,57 @@
+import time
+import asyncio
+import common
+import logging
+from unittest import TestCase
+from pycsfw.ratelimit import TokenBucket, get_rate_limiter
+from pycsfw.retry import RetryPolicy
+
+log = logging.getLogger()
+log.setLevel(common.LOG_LEVEL)
+log.addHandler(logging.StreamHandler())
+
+
+class TestRateLimit(TestCase):
+    """The rate limiter does not need an FMC so these tests run locally"""
+
+    def test_burst_is_not_paced(self):
+        bucket = TokenBucket(requests_per_minute=120, burst=5)
+        self.assertEqual(sum(bucket.acquire() for _ in range(5)), 0)
+
+    def test_calls_are_paced_after_burst(self):
+        bucket = TokenBucket(requests_per_minute=6000, burst=1)
+        start = time.monotonic()
+        [bucket.acquire() for _ in range(11)]
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_async_callers_reserve_their_own_token(self):
+        async def acquire_all():
+            return await asyncio.gather(*[bucket.acquire_async() for _ in range(4)])
+
+        bucket = TokenBucket(requests_per_minute=6000, burst=1)  # A token every 0.01 seconds
+        bucket.acquire()
+        waits = asyncio.run(acquire_all())
+        self.assertGreater(waits[0], 0)
+        for earlier, later in zip(waits, waits[1:]):  # Each caller waits one token longer than the one before it
+            self.assertAlmostEqual(later - earlier, 0.01, places=3)
+
+    def test_limiter_shared_per_host(self):
+        self.assertIs(get_rate_limiter("https://192.0.2.1"), get_rate_limiter("https://192.0.2.1"))
+        self.assertIsNot(get_rate_limiter("https://192.0.2.1"), get_rate_limiter("https://192.0.2.2"))
+
+
+class TestRetryPolicy(TestCase):
+    """The retry policy does not need an FMC so these tests run locally"""
+
+    def test_allows(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.allows("get", 503))
+        self.assertTrue(policy.allows("post", 429))
+        self.assertFalse(policy.allows("post", 503))
+        self.assertTrue(policy.allows("post", 503, retry_safe=True))
+        self.assertFalse(policy.allows("get", 400))
+
+    def test_backoff_honors_retry_after(self):
+        policy = RetryPolicy(backoff_base=0.5)
+        self.assertGreaterEqual(policy.backoff(0, "5"), 5)
+        self.assertLessEqual(policy.backoff(10), policy.backoff_max)
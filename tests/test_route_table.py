@@ -0,0 +1,81 @@
+import json
+import common
+import logging
+from unittest import TestCase
+from pycsfw.index import IPPrefixIndex, RouteTable
+from pycsfw.models import INetworkAddress, IPv4StaticRouteModel, NetworkGroupModel, NetworkObjectModel
+
+log = logging.getLogger()
+log.setLevel(common.LOG_LEVEL)
+log.addHandler(logging.StreamHandler())
+
+
+class TestRouteTable(TestCase):
+    """The route table is built from route models so these tests run locally"""
+
+    def setUp(self):
+        self.net_1 = NetworkObjectModel(id="n1", name="unittest-network-1", value="10.0.0.0/8")
+        self.net_2 = NetworkObjectModel(id="n2", name="unittest-network-2", value="10.1.0.0/16")
+        self.route_1 = self.make_route("r1", self.net_1, "outside", 1)
+        self.route_2 = self.make_route("r2", self.net_2, "outside", 5)
+        self.route_table = RouteTable([self.route_1, self.route_2])
+
+    def make_route(self, route_id, network_obj, interface_name, metric, version="1"):
+        return IPv4StaticRouteModel(
+            id=route_id,
+            version=version,
+            interfaceName=interface_name,
+            metricValue=metric,
+            gateway={"literal": {"type": "Host", "value": "192.0.2.1"}},
+            selectedNetworks=[INetworkAddress(id=network_obj.id, name=network_obj.name, type="Network")],
+        )
+
+    def test_lookups(self):
+        self.assertEqual(self.route_table.by_network("unittest-network-2"), [self.route_2])
+        self.assertEqual(self.route_table.by_network("n1"), [self.route_1])
+        self.assertEqual(len(self.route_table.by_gateway("192.0.2.1")), 2)
+        self.assertEqual(len(self.route_table.by_interface("outside")), 2)
+
+    def test_longest_prefix(self):
+        self.assertEqual(self.route_table.longest_prefix("10.1.2.3"), [])
+        self.route_table.resolve(IPPrefixIndex([self.net_1, self.net_2]))
+        self.assertEqual(self.route_table.longest_prefix("10.1.2.3"), [self.route_2])
+        self.assertEqual(self.route_table.longest_prefix("10.2.2.3"), [self.route_1])
+
+    def test_refresh(self):
+        route_2 = self.make_route("r2", self.net_2, "inside", 5, version="2")
+        self.assertEqual(self.route_table.refresh([route_2]), ["r1", "r2"])
+        self.assertEqual(self.route_table.by_interface("outside"), [])
+        self.assertEqual(self.route_table.by_interface("inside"), [route_2])
+        self.assertEqual(self.route_table.refresh([route_2]), [])
+
+    def test_refresh_resolves_unchanged_routes(self):
+        prefix_index = IPPrefixIndex([self.net_1, self.net_2])
+        self.route_table.resolve(prefix_index)
+        prefix_index.add(self.net_2.copy(update={"value": "10.2.0.0/16"}))
+        self.assertEqual(self.route_table.refresh([self.route_1, self.route_2]), [])
+        self.assertEqual(self.route_table.longest_prefix("10.2.2.3"), [self.route_2])
+        self.assertEqual(self.route_table.longest_prefix("10.1.2.3"), [self.route_1])
+
+    def test_client_resolves_routes_through_changed_groups(self):
+        """Updating a member of a group re-resolves the routes that select the group"""
+        group = NetworkGroupModel(id="g1", name="unittest-group-1", objects=[INetworkAddress(id="n2", type="Network")])
+        group_route = self.make_route("r3", group, "inside", 1)
+        stub = common.StubFMC()
+        stub.route("PUT", "/object/networks/n2$", lambda request: (200, json.loads(request.body)))
+        csfw_client = common.StubClient(stub)
+        csfw_client.ip_prefix_index = IPPrefixIndex([self.net_1, self.net_2, group])
+        route_table = RouteTable([self.route_1, group_route], prefix_index=csfw_client.ip_prefix_index)
+        csfw_client.route_tables = {"device-1": route_table}
+        self.assertEqual(route_table.longest_prefix("10.1.2.3"), [group_route])
+        csfw_client.update_network_object(self.net_2.copy(update={"value": "10.2.0.0/16"}))
+        self.assertEqual(route_table.longest_prefix("10.1.2.3"), [self.route_1])
+        self.assertEqual(route_table.longest_prefix("10.2.2.3"), [group_route])
+
+    def test_route_versions_must_match_the_method(self):
+        stub = common.StubFMC()
+        csfw_client = common.StubClient(stub)
+        self.assertRaises(TypeError, csfw_client.create_ipv6_static_route, "device-1", self.route_1)
+        self.assertRaises(TypeError, csfw_client.update_ipv6_static_route, "device-1", self.route_1)
+        self.assertRaises(TypeError, csfw_client.create_bulk_ipv6_static_routes, "device-1", [self.route_1])
+        self.assertEqual(stub.sent("POST") + stub.sent("PUT"), [])
@@ -0,0 +1,40 @@
+import common
+import logging
+from unittest import TestCase
+from pycsfw.exceptions import DependencyCycle
+from pycsfw.models import NetworkGroupModel, INetworkAddress
+from pycsfw.network_objs import NetworkObjects
+from pycsfw.scheduler import dependency_levels
+
+log = logging.getLogger()
+log.setLevel(common.LOG_LEVEL)
+log.addHandler(logging.StreamHandler())
+
+# name -> the names of the groups it contains
+GROUPS = {"top": ["mid-1", "mid-2"], "mid-1": ["leaf"], "mid-2": ["leaf", "existing"], "leaf": []}
+
+
+class TestScheduler(TestCase):
+    """The dependency scheduler does not need an FMC so these tests run locally"""
+
+    def levels(self, groups: dict) -> list:
+        return dependency_levels(list(groups), lambda name: [name], lambda name: groups[name])
+
+    def test_dependency_levels(self):
+        self.assertEqual(self.levels(GROUPS), [["leaf"], ["mid-1", "mid-2"], ["top"]])
+
+    def test_dependency_cycle(self):
+        with self.assertRaises(DependencyCycle) as ctx:
+            self.levels({**GROUPS, "leaf": ["top"]})
+        self.assertEqual(sorted(ctx.exception.nodes), ["leaf", "mid-1", "mid-2", "top"])
+
+    def test_duplicate_identifier(self):
+        with self.assertRaises(ValueError):
+            dependency_levels(["leaf", "top", "leaf"], lambda name: [name], lambda name: GROUPS[name])
+
+    def test_created_members_match_any_type_case(self):
+        """A member typed "networkgroup" is scheduled as a dependency, so it must also receive the created group's id"""
+        leaf = NetworkGroupModel(id="1", name="leaf")
+        top = NetworkGroupModel(name="top", objects=[INetworkAddress(name="leaf", type="networkgroup")])
+        self.assertEqual(NetworkObjects()._group_levels([top, leaf]), [[leaf], [top]])
+        self.assertEqual(NetworkObjects._with_created_members(top, {"leaf": leaf}).objects[0].id, "1")
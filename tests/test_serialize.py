@@ -0,0 +1,59 @@
+import json
+import common
+import logging
+from unittest import TestCase
+from pycsfw import jsonlib
+from pycsfw.common import encode_object, encode_array, encode_objects, serialize_object
+from pycsfw.models import (
+    Action,
+    FTDAccessRuleModel,
+    HostObjectModel,
+    NetworkGroupModel,
+    NetworkObjectModel,
+    INetworkAddress,
+)
+
+log = logging.getLogger()
+log.setLevel(common.LOG_LEVEL)
+log.addHandler(logging.StreamHandler())
+
+
+class TestSerialize(TestCase):
+    """The serializer does not need an FMC so these tests run locally"""
+
+    def test_ephemeral_fields_are_dropped_without_mutating(self):
+        host_obj = HostObjectModel(name="unittest-host-1", value="192.0.2.1", metadata={"readOnly": False}, links={})
+        self.assertEqual(serialize_object(host_obj), {"name": "unittest-host-1", "value": "192.0.2.1"})
+        self.assertEqual(host_obj.metadata, {"readOnly": False})
+
+    def test_nested_models(self):
+        network_grp = NetworkGroupModel(name="test-network-group-1", objects=[INetworkAddress(id="1", type="Host")])
+        self.assertEqual(
+            json.loads(encode_object(network_grp)),
+            {"name": "test-network-group-1", "objects": [{"id": "1", "type": "Host"}]},
+        )
+
+    def test_models_in_untyped_fields(self):
+        network_obj = NetworkObjectModel(id="1", name="unittest-network-1", links={"self": "https://fmc"})
+        rule = FTDAccessRuleModel(
+            name="Test-1",
+            action=Action.ALLOW,
+            sourceNetworks={"objects": [network_obj]},
+            timeRangeObjects=[network_obj],
+        )
+        encoded = json.loads(encode_object(rule))
+        self.assertEqual(encoded["sourceNetworks"]["objects"][0]["name"], "unittest-network-1")
+        self.assertEqual(encoded["timeRangeObjects"][0]["id"], "1")
+        self.assertEqual(encoded, json.loads(json.dumps(rule.dict(exclude_unset=True), default=str)))
+
+    def test_encode_array(self):
+        host_objs = [HostObjectModel(name=f"unittest-host-{i}", value=f"192.0.2.{i}") for i in range(3)]
+        self.assertEqual(
+            json.loads(encode_array(encode_objects(host_objs))), [serialize_object(obj) for obj in host_objs]
+        )
+
+    def test_json_backend_round_trip(self):
+        data = {"name": "unittest-host-1", "value": "192.0.2.1", "links": {"self": "https://fmc/api/fmc_config/v1"}}
+        encoded = jsonlib.dumps(data)
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(jsonlib.loads(encoded), data)
@@ -3,7 +3,14 @@ from pydantic.types import NoneStr
 import common
 import logging
 from pycsfw.base import DuplicateObject, DuplicateStaticRoute
-from pycsfw.models import DomainModel, HostObjectModel, IPv4StaticRouteModel, NetworkObjectModel, INetworkAddress
+from pycsfw.models import (
+    DomainModel,
+    HostObjectModel,
+    IPv4StaticRouteModel,
+    IPv6StaticRouteModel,
+    NetworkObjectModel,
+    INetworkAddress,
+)
 
 log = logging.getLogger()
 log.setLevel(common.LOG_LEVEL)
@@ -20,6 +27,7 @@ class TestFMCStaticRoutes(common.TestCommon):
     def tearDown(self) -> None:
         """Clean up any objects that may have been created in the testing"""
         self.delete_test_static_routes()
+        self.delete_test_ipv6_static_routes()
         self.delete_test_network_objs()
         self.delete_test_host_objects()
 
@@ -47,6 +55,12 @@ class TestFMCStaticRoutes(common.TestCommon):
         for route_id in routes_to_delete:
             self.csfw_client.delete_ipv4_static_route(self.device.id, route_id)
 
+    def delete_test_ipv6_static_routes(self):
+        """Delete the ipv6 static routes to the test ipv6 network"""
+        for route in self.csfw_client.get_ipv6_static_routes_list(self.device.id, expanded=True):
+            if common.NET_OBJ_V6_1.name in [network.name for network in route.selectedNetworks or []]:
+                self.csfw_client.delete_ipv6_static_route(self.device.id, route.id)
+
     def delete_test_network_objs(self) -> None:
         """Delete the network objects that may have been created for testing purposes"""
         obj_list = self.csfw_client.get_network_objects_list(filter="nameOrValue:unittest-network-")
@@ -90,6 +104,23 @@ class TestFMCStaticRoutes(common.TestCommon):
             ),
         )
 
+    def create_test_ipv6_static_route(self) -> IPv6StaticRouteModel:
+        try:
+            network_obj = self.csfw_client.create_network_object(common.NET_OBJ_V6_1)
+        except DuplicateObject:
+            network_obj = self.csfw_client.get_network_objects_list(
+                filter=f"nameOrValue:{common.NET_OBJ_V6_1.name}", expanded=True
+            )[0]
+        return self.csfw_client.create_ipv6_static_route(
+            self.device.id,
+            IPv6StaticRouteModel(
+                description="Test ipv6 static route object",
+                interfaceName="outside",
+                gateway={"literal": {"type": "Host", "value": "2001:db8::1"}},
+                selectedNetworks=[INetworkAddress(id=network_obj.id, type=network_obj.type, name=network_obj.name)],
+            ),
+        )
+
     def test_get_ipv4_static_routes_list(self) -> None:
         self.create_test_static_route()
         static_routes = self.csfw_client.get_ipv4_static_routes_list(self.device.id, expanded=True)
@@ -145,6 +176,38 @@ class TestFMCStaticRoutes(common.TestCommon):
         else:
             self.assertTrue(False)
 
+    def test_search_ipv4_static_routes(self):
+        """Look up the routes of several objects against one fetch of the device's routes"""
+        static_route = self.create_test_static_route()
+        network_objs = self.csfw_client.get_network_objects_list(filter="nameOrValue:unittest-network-", expanded=True)
+        matched_routes = self.csfw_client.search_ipv4_static_routes(self.device.id, network_objs, refresh=True)
+        self.assertEqual(set(matched_routes), {network_obj.id for network_obj in network_objs})
+        for routes in matched_routes.values():
+            self.assertIn(static_route.id, [route.id for route in routes])
+
+    def test_ipv6_static_routes(self) -> None:
+        static_route = self.create_test_ipv6_static_route()
+        self.assertIsInstance(static_route, IPv6StaticRouteModel)
+        self.assertIn(static_route.id, [route.id for route in self.csfw_client.iter_ipv6_static_routes(self.device.id)])
+        static_route.metricValue = 2
+        updated_route = self.csfw_client.update_ipv6_static_route(self.device.id, static_route)
+        self.assertEqual(self.csfw_client.get_ipv6_static_route(self.device.id, updated_route.id).metricValue, 2)
+        deleted_route = self.csfw_client.delete_ipv6_static_route(self.device.id, static_route.id)
+        self.assertIsInstance(deleted_route, IPv6StaticRouteModel)
+
+    def test_get_route_table(self):
+        """The route table is fetched once and kept current by our own creates and deletes"""
+        static_route = self.create_test_static_route()
+        route_table = self.csfw_client.get_route_table(self.device.id, refresh=True)
+        self.assertIn(static_route.id, route_table)
+        self.assertEqual(
+            [route.id for route in self.csfw_client.search_static_routes("unittest-network-1", route_table)],
+            [static_route.id],
+        )
+        self.assertIn(static_route.id, [route.id for route in route_table.by_interface("outside")])
+        self.csfw_client.delete_ipv4_static_route(self.device.id, static_route.id)
+        self.assertNotIn(static_route.id, self.csfw_client.get_route_table(self.device.id))
+
     def test_raise_duplicate_static_route(self):
         passed = False
         try:
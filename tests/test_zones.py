@@ -59,3 +59,13 @@ class TestFMCVariableSets(common.TestCommon):
         self.test_zone = None
 
     # TODO: Update Security Zones
+
+    def test_create_bulk_security_zones(self):
+        zones = self.csfw_client.create_bulk_security_zones(
+            [FTDSecurityZoneModel(name=f"unittest-zone-{i}", interfaceMode="ROUTED") for i in range(3)],
+            max_workers=3,
+        )
+        try:
+            self.assertEqual([zone.name for zone in zones], [f"unittest-zone-{i}" for i in range(3)])
+        finally:
+            [self.csfw_client.delete_security_zone(zone.id) for zone in zones]